@@ -42,6 +42,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'rest_framework.authtoken',
 ]
@@ -53,11 +54,27 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.BasicAuthentication',
         'rest_framework.authentication.SessionAuthentication',
-        'rest_framework.authentication.TokenAuthentication',
+        'biobaseapp.authentication.CachedTokenAuthentication',
     ]
 }
 
+API_PAGE_SIZE = int(getenv('API_PAGE_SIZE', '100'))
+API_MAX_PAGE_SIZE = int(getenv('API_MAX_PAGE_SIZE', '1000'))
+API_BULK_MAX_ITEMS = int(getenv('API_BULK_MAX_ITEMS', '10000'))
+API_BULK_BATCH_SIZE = int(getenv('API_BULK_BATCH_SIZE', '1000'))
+EXPORT_CHUNK_SIZE = int(getenv('EXPORT_CHUNK_SIZE', '2000'))
+DASHBOARD_RECENT_ITEMS = int(getenv('DASHBOARD_RECENT_ITEMS', '10'))
+DASHBOARD_CACHE_TIMEOUT = int(getenv('DASHBOARD_CACHE_TIMEOUT', '300'))
+AUTOCOMPLETE_PAGE_SIZE = int(getenv('AUTOCOMPLETE_PAGE_SIZE', '20'))
+AUTH_TOKEN_CACHE_SIZE = int(getenv('AUTH_TOKEN_CACHE_SIZE', '1024'))
+AUTH_TOKEN_CACHE_TIMEOUT = int(getenv('AUTH_TOKEN_CACHE_TIMEOUT', '60'))
+QUERY_WARN_COUNT = int(getenv('QUERY_WARN_COUNT', '50'))
+QUERY_WARN_MS = int(getenv('QUERY_WARN_MS', '500'))
+COUNT_ESTIMATE_THRESHOLD = int(getenv('COUNT_ESTIMATE_THRESHOLD', '10000'))
+
 MIDDLEWARE = [
+    'biobaseapp.middleware.QueryInstrumentationMiddleware',
+    'biobaseapp.middleware.ReplicaRoutingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -100,12 +117,49 @@ DATABASES = {
         'HOST': getenv('PG_HOST'),
         'PORT': getenv('PG_PORT'),
         'OPTIONS': {'options': '-c search_path=public,library'},
+        'CONN_MAX_AGE': int(getenv('PG_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': getenv('PG_CONN_HEALTH_CHECKS', 'true').lower() == 'true',
         'TEST': {
             'NAME': 'test_db',
         },
     }
 }
 
+# psycopg 3 connection pool (Django 5.1+, needs psycopg[pool]). Pooled connections
+# are returned to the pool after each request, so they must not also be persistent.
+if getenv('PG_POOL', 'false').lower() == 'true':
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': int(getenv('PG_POOL_MIN_SIZE', '2')),
+        'max_size': int(getenv('PG_POOL_MAX_SIZE', '10')),
+        'timeout': int(getenv('PG_POOL_TIMEOUT', '10')),
+    }
+
+# Read replicas: comma-separated hosts, same credentials as the primary.
+PG_REPLICA_HOSTS = [
+    host.strip() for host in getenv('PG_REPLICA_HOSTS', '').split(',') if host.strip()
+]
+DATABASE_REPLICAS = [f'replica{number}' for number in range(1, len(PG_REPLICA_HOSTS) + 1)]
+for replica_alias, replica_host in zip(DATABASE_REPLICAS, PG_REPLICA_HOSTS):
+    DATABASES[replica_alias] = {
+        **DATABASES['default'],
+        'HOST': replica_host,
+        'OPTIONS': dict(DATABASES['default']['OPTIONS']),
+        'TEST': {'MIRROR': 'default'},
+    }
+DATABASE_ROUTERS = ['biobaseapp.dbrouters.ReplicaRouter']
+REPLICA_STICKY_SECONDS = int(getenv('REPLICA_STICKY_SECONDS', '5'))
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': getenv('CACHE_LOCATION', ''),
+    },
+}
 
 
 # Password validation
@@ -149,6 +203,26 @@ STATICFILES_DIRS = [
     BASE_DIR / "static",
 ]
 
+# Logging
+# https://docs.djangoproject.com/en/4.2/topics/logging/
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'biobaseapp.queries': {
+            'handlers': ['console'],
+            'level': getenv('QUERY_LOG_LEVEL', 'WARNING'),
+            'propagate': False,
+        },
+    },
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -16,18 +16,39 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
-from biobaseapp.views import login_view, logout_view, main_menu, create_all, edit_model, choose_model, choose_object, StrainViewSet, StrainProcessingViewSet, SubstanceViewSet, ExperimentsViewSet, CultivationViewSet, ProjectsViewSet, CulturesViewSet, StrainsListView, CultivationPlanningListView, ExperimentsListView
+from biobaseapp.asyncviews import AsyncAPIDetailView, AsyncAPIListView
+from biobaseapp.listviews import StrainsListView, CultivationPlanningListView, ExperimentsListView, AsyncStrainsListView, AsyncCultivationPlanningListView, AsyncExperimentsListView
+from biobaseapp.views import login_view, logout_view, main_menu, create_all, edit_model, choose_model, choose_object, autocomplete, db_status
+from biobaseapp.strainviewset import StrainViewSet
+from biobaseapp.viewsets import StrainProcessingViewSet, SubstanceViewSet, ExperimentsViewSet, CultivationViewSet, ProjectsViewSet, CulturesViewSet
 
 from rest_framework.routers import DefaultRouter
 
+# URL prefix: viewset of the API, used by the router and the async API.
+API_VIEWSETS = {
+    'strains': StrainViewSet,
+    'strain_processing': StrainProcessingViewSet,
+    'substance_identification': SubstanceViewSet,
+    'experiments': ExperimentsViewSet,
+    'cultivation_planning': CultivationViewSet,
+    'projects': ProjectsViewSet,
+    'cultures': CulturesViewSet,
+}
+
 router = DefaultRouter()
-router.register(r'strains', StrainViewSet)
-router.register(r'strain_processing', StrainProcessingViewSet)
-router.register(r'substance_identification', SubstanceViewSet)
-router.register(r'experiments', ExperimentsViewSet)
-router.register(r'cultivation_planning', CultivationViewSet)
-router.register(r'projects', ProjectsViewSet)
-router.register(r'cultures', CulturesViewSet)
+for prefix, viewset in API_VIEWSETS.items():
+    router.register(prefix, viewset)
+
+# Read-only async API, named like the sync endpoints with an ``async-`` prefix.
+async_api = []
+for prefix, viewset in API_VIEWSETS.items():
+    basename = viewset.queryset.model._meta.model_name
+    async_api += [
+        path(f'async/api/{prefix}/', AsyncAPIListView.as_view(viewset=viewset),
+             name=f'async-{basename}-list'),
+        path(f'async/api/{prefix}/<uuid:pk>/', AsyncAPIDetailView.as_view(viewset=viewset),
+             name=f'async-{basename}-detail'),
+    ]
 
 urlpatterns = [
     path('', login_view, name='login'),
@@ -38,9 +59,15 @@ urlpatterns = [
     path('strains/', StrainsListView.as_view(), name='strains_list'),
     path('planning/', CultivationPlanningListView.as_view(), name='planning_list'),
     path('experiments/', ExperimentsListView.as_view(), name='experiments_list'),
+    path('async/strains/', AsyncStrainsListView.as_view(), name='async_strains_list'),
+    path('async/planning/', AsyncCultivationPlanningListView.as_view(), name='async_planning_list'),
+    path('async/experiments/', AsyncExperimentsListView.as_view(), name='async_experiments_list'),
     path('choose_model/', choose_model, name='choose_model'),
     path('choose_object/<str:model_name>/', choose_object, name='choose_object'),
+    path('autocomplete/<str:model_name>/', autocomplete, name='autocomplete'),
+    path('status/db/', db_status, name='db_status'),
     path('edit_model/<str:model_name>/<uuid:object_id>/', edit_model, name='edit_model'),
      path('logout/', logout_view, name='logout'),
+    *async_api,
 ]
 
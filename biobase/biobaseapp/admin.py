@@ -36,12 +36,14 @@ class StrainsAdmin(admin.ModelAdmin):
     This class sets the list display to show the id, UIN, name, pedigree,
     creation date, and created by fields. It also sets the list filter
     to show the creation date and created by fields, and the search
-    fields to show the UIN and name fields.
+    fields to show the UIN and name fields. The parent strain is chosen by
+    searching, not from a list of every strain.
     """
 
     list_display = ('id', 'UIN', 'name', 'pedigree', 'creation_date', 'created_by')
     list_filter = ('creation_date', 'created_by')
     search_fields = ('UIN', 'name')
+    autocomplete_fields = ('parent',)
 
 
 @admin.register(StrainProcessing)
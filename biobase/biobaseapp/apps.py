@@ -1,4 +1,6 @@
 """Biobaseapp Django application configuration."""
+from importlib import import_module
+
 from django.apps import AppConfig
 
 
@@ -12,3 +14,7 @@ class BiobaseappConfig(AppConfig):
 
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'biobaseapp'
+
+    def ready(self):
+        """Connect the signal handlers of the app."""
+        import_module(f'{self.name}.signals')
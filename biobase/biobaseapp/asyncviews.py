@@ -0,0 +1,299 @@
+"""
+Async read paths of the list pages and the REST API for ASGI servers.
+
+The async ORM methods such as ``aget``, ``acount`` and ``aiterator`` run
+the sync ORM in ``sync_to_async(thread_sensitive=True)``. The queries of
+a request therefore still run one at a time on its sync thread, and
+requests overlap their database I/O no more than on a threaded WSGI
+server: these views free the event loop, they do not make reads faster.
+``loadtest_biobase --mix api=1`` with and without ``--async-reads``
+against one uvicorn worker measured the same throughput within noise.
+"""
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user
+from django.core.paginator import InvalidPage
+from django.http import Http404, HttpResponse
+from django.views import View
+from rest_framework.exceptions import AuthenticationFailed, NotFound
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from .authentication import CachedTokenAuthentication
+from .conditional import (acollection_validators, instance_validators,
+                          not_modified, set_validators)
+from .pagination import TOTAL_COUNT, TOTAL_COUNT_ESTIMATED
+
+LAST = 'last'
+COUNT_HEADERS = (TOTAL_COUNT, TOTAL_COUNT_ESTIMATED)
+UNAUTHORIZED = 401
+NOT_FOUND = 404
+
+
+async def aload_user(request):
+    """
+    Load the user of a session request outside of the event loop.
+
+    ``AuthenticationMiddleware`` sets a lazy user that would query the
+    database on first use, which async code may not do directly.
+
+    Args:
+        request (HttpRequest): The request.
+
+    Returns:
+        CustomUser: The user, or ``AnonymousUser``.
+    """
+    request.user = await sync_to_async(get_user)(request)
+    return request.user
+
+
+def json_response(data, status=200):
+    """
+    Render data like the sync API does.
+
+    Args:
+        data: Serialized data.
+        status (int): The status code.
+
+    Returns:
+        HttpResponse: The JSON response.
+    """
+    return HttpResponse(
+        JSONRenderer().render(data), status=status, content_type=JSONRenderer.media_type,
+    )
+
+
+class AsyncListMixin:
+    """
+    Serve a ``ListView`` with ``ConditionalListMixin`` on the async ORM.
+
+    The queryset, context and template of the sync view are reused; only
+    the queries change: the validators use ``aaggregate``, the paginator
+    gets the size they found and the page is read with ``aiterator``.
+    Under WSGI Django runs the view in an event loop of its own, so the
+    view keeps working there.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        """
+        Render the list unless the client has the current version.
+
+        Args:
+            request (HttpRequest): The request.
+            args: positional arguments.
+            kwargs: keyword arguments.
+
+        Returns:
+            HttpResponse: The rendered page, or 304.
+        """
+        await aload_user(request)
+        self.object_list = self.get_queryset()
+        etag, last_modified, self.collection_size = await acollection_validators(
+            self.object_list, request, self.conditional_related,
+        )
+        response = not_modified(request, etag, last_modified)
+        if response is None:
+            page_size = self.get_paginate_by(self.object_list)
+            if page_size:
+                self.loaded_page = await self.apaginate_queryset(self.object_list, page_size)
+            response = set_validators(
+                self.render_to_response(self.get_context_data()), etag, last_modified,
+            )
+        return response
+
+    async def apaginate_queryset(self, queryset, page_size):
+        """
+        Load the requested page, see ``MultipleObjectMixin.paginate_queryset``.
+
+        Args:
+            queryset (QuerySet): The records.
+            page_size (int): The number of records per page.
+
+        Returns:
+            tuple: The paginator, the page, its records and whether there are
+            other pages.
+
+        Raises:
+            Http404: If the page does not exist.
+        """
+        paginator = self.get_paginator(
+            queryset, page_size, orphans=self.get_paginate_orphans(),
+            allow_empty_first_page=self.get_allow_empty(),
+        )
+        page_number = self.kwargs.get(self.page_kwarg) or self.request.GET.get(self.page_kwarg)
+        try:
+            if page_number == LAST:
+                page_number = paginator.num_pages
+            page = await paginator.apage(int(page_number or 1))
+        except (ValueError, InvalidPage) as error:
+            raise Http404(f'Invalid page ({page_number}): {error}') from error
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def paginate_queryset(self, queryset, page_size):
+        """
+        Return the page loaded by ``apaginate_queryset``.
+
+        Args:
+            queryset (QuerySet): The records.
+            page_size (int): The number of records per page.
+
+        Returns:
+            tuple: The loaded page, see ``apaginate_queryset``.
+        """
+        return self.loaded_page
+
+
+class AsyncAPIView(View):
+    """
+    Base of the read-only async API endpoints of a model.
+
+    The queryset and the serializer come from the sync viewset, so
+    ``?fields=``, ``?expand=``, the declared relations and the conditional
+    GET validators behave the same; the queries run on the async ORM.
+    Clients authenticate with a token, as on the sync API.
+
+    Attributes:
+        viewset (type): The sync viewset of the model.
+    """
+
+    http_method_names = ['get']
+    viewset = None
+    action = None
+
+    async def authenticate(self, request):
+        """
+        Authenticate a request with its token.
+
+        Args:
+            request (HttpRequest): The request.
+
+        Returns:
+            tuple: The DRF request, or None, and an error response, or None.
+        """
+        api_request = Request(request)
+        try:
+            credentials = await sync_to_async(CachedTokenAuthentication().authenticate)(
+                api_request,
+            )
+        except AuthenticationFailed as error:
+            return None, self.unauthorized(error.detail)
+        if credentials is None:
+            return None, self.unauthorized('Authentication credentials were not provided.')
+        request.user = credentials[0]
+        api_request.user = credentials[0]
+        return api_request, None
+
+    def unauthorized(self, detail):
+        """
+        Build a 401 response asking for a token.
+
+        Args:
+            detail (str): The reason.
+
+        Returns:
+            HttpResponse: The response.
+        """
+        response = json_response({'detail': detail}, status=UNAUTHORIZED)
+        response['WWW-Authenticate'] = CachedTokenAuthentication.keyword
+        return response
+
+    def get_viewset(self, api_request):
+        """
+        Create the sync viewset for building the queryset and serializer.
+
+        Args:
+            api_request (Request): The authenticated DRF request.
+
+        Returns:
+            ViewSet: The viewset instance.
+        """
+        return self.viewset(
+            request=api_request, args=self.args, kwargs=self.kwargs,
+            format_kwarg=None, action=self.action,
+        )
+
+
+class AsyncAPIListView(AsyncAPIView):
+    """
+    List records with the keyset pages of the sync API.
+
+    Pages come from ``IdCursorPagination``, so the ``cursor``, ``next`` and
+    ``previous`` links, ``?page_size=``, ``?order=`` and ``?count=true``
+    follow the sync API; only the validators and the page read run off the
+    event loop.
+    """
+
+    action = 'list'
+
+    async def get(self, request, *args, **kwargs):
+        """
+        List one page of records unless the client has the current version.
+
+        Args:
+            request (HttpRequest): The request.
+            args: positional arguments.
+            kwargs: keyword arguments.
+
+        Returns:
+            HttpResponse: The page as on the sync API, 304, 401 or 404.
+        """
+        api_request, error = await self.authenticate(request)
+        if error is not None:
+            return error
+        viewset = self.get_viewset(api_request)
+        queryset = viewset.filter_queryset(viewset.get_queryset())
+        etag, last_modified, viewset.collection_size = await acollection_validators(
+            queryset, request, viewset.versioned_relations(),
+        )
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+        paginator = viewset.paginator
+        try:
+            page = await sync_to_async(paginator.paginate_queryset)(
+                queryset, api_request, view=viewset,
+            )
+        except NotFound as invalid:
+            return json_response({'detail': invalid.detail}, status=NOT_FOUND)
+        api_response = paginator.get_paginated_response(
+            viewset.get_serializer(page, many=True).data,
+        )
+        response = json_response(api_response.data)
+        for header in COUNT_HEADERS:
+            if header in api_response:
+                response[header] = api_response[header]
+        return set_validators(response, etag, last_modified)
+
+
+class AsyncAPIDetailView(AsyncAPIView):
+    """Return one record on the async ORM."""
+
+    action = 'retrieve'
+
+    async def get(self, request, *args, **kwargs):
+        """
+        Return a record unless the client has the current version.
+
+        Args:
+            request (HttpRequest): The request.
+            args: positional arguments.
+            kwargs: keyword arguments with the ``pk`` of the record.
+
+        Returns:
+            HttpResponse: The record, 304, 401 or 404.
+        """
+        api_request, error = await self.authenticate(request)
+        if error is not None:
+            return error
+        viewset = self.get_viewset(api_request)
+        queryset = viewset.filter_queryset(viewset.get_queryset())
+        try:
+            instance = await queryset.aget(pk=kwargs['pk'])
+        except queryset.model.DoesNotExist:
+            return json_response({'detail': 'Not found.'}, status=NOT_FOUND)
+        etag, last_modified = instance_validators(instance, viewset.versioned_relations())
+        response = not_modified(request, etag, last_modified)
+        if response is None:
+            response = set_validators(
+                json_response(viewset.get_serializer(instance).data), etag, last_modified,
+            )
+        return response
@@ -0,0 +1,155 @@
+"""Cached token authentication for the REST API."""
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from rest_framework.authentication import TokenAuthentication
+
+
+class TokenCache:
+    """
+    Bounded in-process LRU cache of authenticated tokens with a time to live.
+
+    The cache is per process: changes made by other processes are only seen
+    once the entries expire, so the time to live bounds how long a deleted
+    token keeps working there.
+
+    Attributes:
+        max_size (int): The maximum number of cached tokens.
+        timeout (float): Seconds an entry stays valid.
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that had to query the database.
+    """
+
+    def __init__(self, max_size, timeout):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_size (int): The maximum number of cached tokens.
+            timeout (float): Seconds an entry stays valid.
+        """
+        self.max_size = max_size
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Get the user and token of a key.
+
+        Args:
+            key (str): The token key.
+
+        Returns:
+            tuple: ``(user, token)``, or None if the key is not cached or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, user, token):
+        """
+        Cache the user and token of a key, evicting the least recently used entry.
+
+        Args:
+            key (str): The token key.
+            user (CustomUser): The authenticated user.
+            token (Token): The token.
+        """
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.timeout, (user, token))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        """
+        Drop a key from the cache.
+
+        Args:
+            key (str): The token key.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_user(self, user_id):
+        """
+        Drop all keys of a user from the cache.
+
+        Args:
+            user_id (int): The primary key of the user.
+        """
+        with self._lock:
+            for key in [
+                key for key, (_, (user, _)) in self._entries.items() if user.pk == user_id
+            ]:
+                del self._entries[key]
+
+    def clear(self):
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        Get the cache counters.
+
+        Returns:
+            dict: ``hits``, ``misses``, ``size`` and ``max_size``.
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'size': len(self._entries),
+                'max_size': self.max_size,
+            }
+
+
+token_cache = TokenCache(settings.AUTH_TOKEN_CACHE_SIZE, settings.AUTH_TOKEN_CACHE_TIMEOUT)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication that remembers valid tokens in ``token_cache``.
+
+    Entries are dropped when a token is saved or deleted and when its user
+    changes, see ``signals.py``.
+    """
+
+    def authenticate_credentials(self, key):
+        """
+        Authenticate a token key, querying the database only on a cache miss.
+
+        Args:
+            key (str): The token key.
+
+        Returns:
+            tuple: ``(user, token)``.
+
+        Raises:
+            AuthenticationFailed: If the token is invalid or the user is inactive.
+        """
+        cached = token_cache.get(key)
+        if cached is None:
+            user, token = super().authenticate_credentials(key)
+            token_cache.set(key, user, token)
+        else:
+            user, token = cached
+        # Requests must not share one mutable user instance.
+        return copy.copy(user), token
@@ -0,0 +1,71 @@
+"""Paginated label lookups for the object pickers."""
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import TextField
+from django.db.models.functions import Cast, Left
+
+from .models import (CultivationPlanning, Cultures, CustomUser, Experiments,
+                     Projects, StrainProcessing, Strains,
+                     SubstanceIdentification)
+
+ID = 'id'
+LABEL_LENGTH = 100
+
+# Model name: (model, field used as the label of an object).
+AUTOCOMPLETE_MODELS = {
+    'Strains': (Strains, 'UIN'),
+    'StrainProcessing': (StrainProcessing, 'description'),
+    'SubstanceIdentification': (SubstanceIdentification, 'results'),
+    'Experiments': (Experiments, 'results'),
+    'CultivationPlanning': (CultivationPlanning, 'status'),
+    'Projects': (Projects, 'project_name'),
+    'Cultures': (Cultures, ID),
+    'CustomUser': (CustomUser, 'username'),
+}
+
+
+def lookup(model_name, query='', after=None, limit=None):
+    """
+    Find one page of objects whose label contains the query.
+
+    Pages are ordered by primary key and continued with ``after`` (the last
+    id of the previous page), so every page costs the same. Label search is
+    served by the trigram indexes of migrations 0005 and 0007 on PostgreSQL.
+    Objects labelled by their id can only be found by the exact id.
+
+    Args:
+        model_name (str): A key of ``AUTOCOMPLETE_MODELS``.
+        query (str): Text to look for in the labels.
+        after (str): The id after which the page starts.
+        limit (int): The page size, ``AUTOCOMPLETE_PAGE_SIZE`` by default.
+
+    Returns:
+        dict: ``results`` with ``id`` and ``text`` of each object and the
+        ``next`` value of ``after``, or None on the last page.
+
+    Raises:
+        KeyError: If the model name is unknown.
+    """
+    model_class, label_field = AUTOCOMPLETE_MODELS[model_name]
+    limit = limit or settings.AUTOCOMPLETE_PAGE_SIZE
+    pk_field = model_class._meta.pk
+    queryset = model_class.objects.order_by(ID)
+    try:
+        if query and label_field == ID:
+            queryset = queryset.filter(pk=pk_field.to_python(query))
+        elif query:
+            queryset = queryset.filter(**{f'{label_field}__icontains': query})
+        if after:
+            queryset = queryset.filter(pk__gt=pk_field.to_python(after))
+    except ValidationError:
+        queryset = queryset.none()
+
+    rows = list(queryset.values_list(
+        ID, Left(Cast(label_field, output_field=TextField()), LABEL_LENGTH),
+    )[:limit + 1])
+    has_next = len(rows) > limit
+    rows = rows[:limit]
+    return {
+        'results': [{ID: str(pk), 'text': label} for pk, label in rows],
+        'next': str(rows[-1][0]) if has_next else None,
+    }
@@ -0,0 +1,224 @@
+"""Microbenchmarks of the biobase hot paths at several data sizes."""
+import statistics
+import time
+
+from django.db import connections, transaction
+from django.forms.models import model_to_dict
+from django.test import Client, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+from .idbench import environment
+from .middleware import QueryStats
+from .models import CustomUser, Strains
+from .seeding import SEARCH_MODES, seed
+from .views import MODEL_CLASSES
+
+BENCH_USERNAME = 'bench'
+TEST_HOST = 'testserver'
+JSON = 'application/json'
+GET = 'get'
+POST = 'post'
+BROWSER = 'browser'
+API = 'api'
+ERROR_LENGTH = 500
+CLIENT_ERROR = 400
+
+
+def cases(using='default'):
+    """
+    List the requests to time against the seeded data.
+
+    Args:
+        using (str): The database alias holding the data.
+
+    Returns:
+        list: Tuples of the case name, the client (``BROWSER`` or ``API``)
+        and the request, see ``request``.
+    """
+    requests = [
+        (f'strains_list:{mode}', BROWSER, (GET, reverse('strains_list'), query))
+        for mode, query in SEARCH_MODES.items()
+    ]
+    requests += [
+        ('main_menu', BROWSER, (GET, reverse('index'), {})),
+        ('choose_object', BROWSER, (GET, reverse('choose_object', args=['Strains']), {})),
+    ]
+    for model in MODEL_CLASSES.values():
+        instance = model.objects.using(using).order_by('id').first()
+        if instance is not None:
+            requests += api_cases(instance)
+    return requests
+
+
+def api_cases(instance):
+    """
+    List the API requests to time on the collection of a record.
+
+    Args:
+        instance (Model): The first record of the collection.
+
+    Returns:
+        list: The list, detail and create cases, see ``cases``.
+    """
+    basename = type(instance).__name__.lower()
+    collection = reverse(f'{basename}-list')
+    detail = reverse(f'{basename}-detail', args=[instance.pk])
+    return [
+        (f'{basename}:list', API, (GET, collection, {})),
+        (f'{basename}:detail', API, (GET, detail, {})),
+        (f'{basename}:create', API, (POST, collection, model_to_dict(instance))),
+    ]
+
+
+def request(client, method, url, payload):
+    """
+    Send one request and read the whole response.
+
+    Args:
+        client (Client): The test client.
+        method (str): ``get`` or ``post``.
+        url (str): The URL.
+        payload (dict): GET parameters or the body, sent as JSON.
+
+    Returns:
+        HttpResponse: The response.
+
+    Raises:
+        RuntimeError: If the request fails, which would time an error page.
+    """
+    if method == POST:
+        response = client.post(url, payload, content_type=JSON)
+    else:
+        response = client.get(url, payload)
+    if response.status_code >= CLIENT_ERROR:
+        excerpt = response.content[:ERROR_LENGTH].decode(errors='replace')
+        raise RuntimeError(f'{method.upper()} {url} answered {response.status_code}: {excerpt}')
+    if response.streaming:
+        b''.join(response.streaming_content)
+    return response
+
+
+def measure(client, case, repeat, using='default'):
+    """
+    Time a request.
+
+    The first request warms the caches and counts the queries; the following
+    ``repeat`` requests are timed.
+
+    Args:
+        client (Client): The test client.
+        case (tuple): The method, URL and payload of ``request``.
+        repeat (int): Number of timed requests.
+        using (str): The database alias to count queries on.
+
+    Returns:
+        dict: Timings in milliseconds and the query count.
+    """
+    stats = QueryStats()
+    started = time.perf_counter()
+    with connections[using].execute_wrapper(stats):
+        request(client, *case)
+    cold = time.perf_counter() - started
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        request(client, *case)
+        timings.append(time.perf_counter() - started)
+    return {
+        'queries': stats.count,
+        'cold_ms': round(cold * 1000, 3),
+        'min_ms': round(min(timings) * 1000, 3),
+        'median_ms': round(statistics.median(timings) * 1000, 3),
+        'mean_ms': round(statistics.fmean(timings) * 1000, 3),
+        'max_ms': round(max(timings) * 1000, 3),
+    }
+
+
+def bench_size(size, repeat, seed_value=0, using='default'):
+    """
+    Seed one data size and time every case, then roll everything back.
+
+    Args:
+        size (int): Number of strains to seed.
+        repeat (int): Number of timed requests per case.
+        seed_value (int): Seed of the data generator.
+        using (str): The database alias.
+
+    Returns:
+        dict: Measurements per case name.
+    """
+    with transaction.atomic(using=using):
+        seed(size, seed_value=seed_value, using=using)
+        user = CustomUser.objects.db_manager(using).create_superuser(
+            username=f'{BENCH_USERNAME}-{size}', password=None,
+        )
+        token = Token.objects.using(using).create(user=user)
+        clients = {
+            BROWSER: Client(),
+            API: Client(HTTP_AUTHORIZATION=f'Token {token.key}'),
+        }
+        clients[BROWSER].force_login(user)
+        measurements = {
+            name: measure(clients[client], case, repeat, using=using)
+            for name, client, case in cases(using)
+        }
+        transaction.set_rollback(rollback=True, using=using)
+    return measurements
+
+
+def run(sizes, repeat=5, seed_value=0, using='default'):
+    """
+    Benchmark the hot paths at several data sizes.
+
+    Each size is seeded inside a transaction that is rolled back, so the
+    database is left unchanged. Rows already in the database add to every
+    size; run on an empty database for comparable reports.
+
+    Args:
+        sizes (Iterable): Numbers of strains to seed.
+        repeat (int): Number of timed requests per case.
+        seed_value (int): Seed of the data generator.
+        using (str): The database alias.
+
+    Returns:
+        dict: The report, with the environment and measurements per size.
+    """
+    report = {
+        'environment': environment(
+            connections[using],
+            existing_strains=Strains.objects.using(using).count(),
+            repeat=repeat,
+            seed=seed_value,
+        ),
+        'sizes': {},
+    }
+    # Only the test client sends requests while the benchmark runs.
+    with override_settings(ALLOWED_HOSTS=[TEST_HOST]):
+        for size in sizes:
+            report['sizes'][str(size)] = bench_size(size, repeat, seed_value, using)
+    return report
+
+
+def compare(report, baseline):
+    """
+    Compare the median timings of two reports.
+
+    Args:
+        report (dict): The new report.
+        baseline (dict): The report to compare with.
+
+    Returns:
+        list: Tuples of the size, case name, baseline and new medians in
+        milliseconds and their ratio, for the cases present in both.
+    """
+    rows = []
+    for size, measurements in report['sizes'].items():
+        previous = baseline.get('sizes', {}).get(size, {})
+        for name, measurement in measurements.items():
+            before = previous.get(name, {}).get('median_ms')
+            if before is not None:
+                after = measurement['median_ms']
+                rows.append((size, name, before, after, after / before if before else 0))
+    return rows
@@ -0,0 +1,162 @@
+"""Bulk creation action of the REST API viewsets."""
+from contextlib import suppress
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.relations import PrimaryKeyRelatedField
+from rest_framework.response import Response
+
+from .dashboard import invalidate_dashboard
+
+NON_FIELD_ERRORS = 'non_field_errors'
+
+
+class PrefetchedQuerySet:
+    """
+    Stand-in for a related field queryset that answers ``get(pk=...)`` from memory.
+
+    Used during bulk validation so that every foreign key value in a batch is
+    resolved by a single ``IN`` query instead of one query per item.
+    """
+
+    def __init__(self, queryset, raw_pks):
+        """
+        Load all referenced records at once.
+
+        Args:
+            queryset (QuerySet): The queryset of the related field.
+            raw_pks (Iterable): Raw primary key values from the request data.
+        """
+        self.model = queryset.model
+        self.pk_field = queryset.query.get_meta().pk
+        self.records = queryset.in_bulk(self._to_pks(raw_pks))
+
+    def get(self, pk):
+        """
+        Return a prefetched record by primary key.
+
+        Args:
+            pk: Raw primary key value.
+
+        Returns:
+            Model: The related record.
+
+        Raises:
+            DoesNotExist: If the record does not exist.
+            ValueError: If the value is not a valid primary key.
+        """
+        try:
+            key = self.pk_field.to_python(pk)
+        except DjangoValidationError as error:
+            raise ValueError(pk) from error
+        if key not in self.records:
+            raise self.model.DoesNotExist
+        return self.records[key]
+
+    def _to_pks(self, raw_pks):
+        pks = set()
+        for raw_pk in raw_pks:
+            with suppress(DjangoValidationError, TypeError):
+                pks.add(self.pk_field.to_python(raw_pk))
+        pks.discard(None)
+        return pks
+
+
+class BulkCreateMixin:
+    """
+    Add a ``POST <collection>/bulk/`` action that creates many objects at once.
+
+    The whole batch is validated first; if any item is invalid nothing is
+    written and the errors are reported per item index. Valid batches are
+    inserted with ``bulk_create`` in chunks of ``API_BULK_BATCH_SIZE`` inside
+    one transaction.
+    """
+
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        Create a batch of objects.
+
+        Args:
+            request: request object with a JSON array of objects
+
+        Returns:
+            Response: The number and ids of the created objects, or per-item errors.
+
+        Raises:
+            ValidationError: If the body is not a list or has too many items.
+        """
+        batch = request.data
+        if not isinstance(batch, list):
+            raise ValidationError({NON_FIELD_ERRORS: ['Expected a list of items.']})
+        if len(batch) > settings.API_BULK_MAX_ITEMS:
+            raise ValidationError({
+                NON_FIELD_ERRORS: [f'Too many items, at most {settings.API_BULK_MAX_ITEMS}.'],
+            })
+
+        serializer = self.get_serializer(data=batch, many=True)
+        self.prefetch_related_fields(serializer.child, batch)
+        if not serializer.is_valid():
+            # Depending on the DRF version errors are either a list aligned
+            # with the input or a dict keyed by item index.
+            item_errors = serializer.errors
+            if not isinstance(item_errors, dict):
+                item_errors = dict(enumerate(item_errors))
+            errors = [
+                {'index': index, 'errors': detail}
+                for index, detail in sorted(item_errors.items())
+                if detail
+            ]
+            return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+
+        instances = self.perform_bulk_create(serializer.validated_data)
+        return Response(
+            {'created': len(instances), 'ids': [instance.pk for instance in instances]},
+            status=status.HTTP_201_CREATED,
+        )
+
+    def perform_bulk_create(self, validated_batch):
+        """
+        Insert validated items into the database.
+
+        Args:
+            validated_batch (list): Validated data for each item.
+
+        Returns:
+            list: The created model instances.
+        """
+        model_class = self.get_queryset().model
+        instances = [model_class(**validated) for validated in validated_batch]
+        with transaction.atomic():
+            model_class.objects.bulk_create(instances, batch_size=settings.API_BULK_BATCH_SIZE)
+            self.after_bulk_create(instances)
+            invalidate_dashboard(*{instance.created_by_id for instance in instances})
+        return instances
+
+    def after_bulk_create(self, instances):
+        """
+        Write what ``save`` signals would have written for the created objects.
+
+        ``bulk_create`` sends no signals; runs in the transaction of the insert.
+
+        Args:
+            instances (list): The created model instances.
+        """
+
+    def prefetch_related_fields(self, serializer, batch):
+        """
+        Resolve the foreign keys of all items with one query per relation.
+
+        Args:
+            serializer (Serializer): The child serializer of the batch.
+            batch (list): Raw request items.
+        """
+        for name, field in serializer.fields.items():
+            if not isinstance(field, PrimaryKeyRelatedField) or field.read_only:
+                continue
+            raw_pks = [row.get(name) for row in batch if isinstance(row, dict)]
+            field.queryset = PrefetchedQuerySet(field.get_queryset(), raw_pks)
@@ -0,0 +1,234 @@
+"""Validators for conditional GET requests on records and collections."""
+import hashlib
+import time
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from .pagination import large_estimate
+
+UPDATED = 'updated_at'
+ID = 'id'
+TOTAL = 'total'
+DELETED = 'deleted'
+DELETION_KEY = 'biobase:deletion:{0}'
+OK = 200
+NOT_MODIFIED = 304
+
+
+def instance_validators(instance, related=()):
+    """
+    Build the validators of one record.
+
+    Args:
+        instance (Model): A record with an ``updated_at`` field.
+        related (Iterable): Foreign keys whose records are shown with it.
+
+    Returns:
+        tuple: The ETag and the last modification time.
+    """
+    changes = [instance.updated_at, *(getattr(instance, name).updated_at for name in related)]
+    version = '-'.join(str(change.timestamp()) for change in changes)
+    return quote_etag(f'{instance.pk}-{version}'), max(changes)
+
+
+def collection_validators(queryset, request, related=()):
+    """
+    Build the validators of a filtered collection with one aggregate query.
+
+    The version changes when a record is created, changed or deleted: any
+    change moves the latest ``updated_at`` and deletions change the count.
+    The query string and the user are part of the ETag, because they select
+    the page and may change the rendered content.
+
+    Collections too large to count, see ``pagination.large_estimate``, are
+    versioned by the planner estimate instead of ``COUNT`` and by the
+    ``deletion_stamp`` of their model, which changes on every deletion.
+
+    Args:
+        queryset (QuerySet): The filtered records.
+        request (HttpRequest): The request.
+        related (Iterable): Foreign keys whose records are shown with the
+            collection, so that their changes count too.
+
+    Returns:
+        tuple: The ETag, the last modification time, or None for an empty
+        collection, and the size of the collection, see
+        ``pagination.estimated_count``.
+    """
+    fields = version_fields(related)
+    estimate = large_estimate(queryset)
+    version = queryset.order_by().aggregate(**version_aggregates(fields, estimate))
+    if estimate is not None:
+        version[DELETED] = deletion_stamp(queryset.model)
+    return collection_etag(version, fields, request, estimate)
+
+
+async def acollection_validators(queryset, request, related=()):
+    """
+    Build the validators of a filtered collection on the async ORM.
+
+    The user of the request must already be loaded, see
+    ``asyncviews.aload_user``.
+
+    Args:
+        queryset (QuerySet): The filtered records.
+        request (HttpRequest): The request.
+        related (Iterable): Foreign keys whose records are shown with the collection.
+
+    Returns:
+        tuple: The ETag, the last modification time and the size of the
+        collection, see ``collection_validators``.
+    """
+    fields = version_fields(related)
+    estimate = await sync_to_async(large_estimate)(queryset)
+    version = await queryset.order_by().aaggregate(**version_aggregates(fields, estimate))
+    if estimate is not None:
+        version[DELETED] = await sync_to_async(deletion_stamp)(queryset.model)
+    return collection_etag(version, fields, request, estimate)
+
+
+def deletion_stamp(model):
+    """
+    Get the stamp of the last deletion from a model's table.
+
+    A missing stamp, e.g. one evicted from the cache, is replaced by a new
+    one, which changes the ETags of the model's collections rather than
+    letting them match a version from before a deletion. Processes only see
+    each other's stamps through a shared cache backend.
+
+    Args:
+        model (type): The model class.
+
+    Returns:
+        int: The stamp.
+    """
+    return cache.get_or_set(deletion_key(model), time.time_ns, None)
+
+
+def stamp_deletion(model):
+    """
+    Renew the deletion stamp of a model once the current transaction commits.
+
+    Args:
+        model (type): The model class of the deleted record.
+    """
+    key = deletion_key(model)
+    transaction.on_commit(lambda: cache.set(key, time.time_ns(), None))
+
+
+def deletion_key(model):
+    """
+    Build the cache key of a model's deletion stamp.
+
+    Models of other apps with the same name share the key, which only costs
+    them a few extra full responses.
+
+    Args:
+        model (type): The model class.
+
+    Returns:
+        str: The key.
+    """
+    return DELETION_KEY.format(model.__qualname__)
+
+
+def version_fields(related):
+    """
+    List the modification times a collection version depends on.
+
+    Args:
+        related (Iterable): Foreign keys shown with the collection.
+
+    Returns:
+        tuple: Lookups of the ``updated_at`` fields.
+    """
+    return (UPDATED, *(f'{name}__{UPDATED}' for name in related))
+
+
+def version_aggregates(fields, estimate=None):
+    """
+    Build the aggregates of a collection version.
+
+    Args:
+        fields (tuple): Lookups of ``version_fields``.
+        estimate (int): The planner estimate of a large collection, which
+            is not counted then.
+
+    Returns:
+        dict: The latest modification time per lookup and the record count.
+    """
+    aggregates = {field: Max(field) for field in fields}
+    if estimate is None:
+        aggregates[TOTAL] = Count(ID)
+    return aggregates
+
+
+def collection_etag(version, fields, request, estimate=None):
+    """
+    Turn an aggregated collection version into validators.
+
+    Args:
+        version (dict): The ``version_aggregates`` and a ``deletion_stamp``.
+        fields (tuple): Lookups of ``version_fields``.
+        request (HttpRequest): The request.
+        estimate (int): The planner estimate the version was built with.
+
+    Returns:
+        tuple: The ETag, the last modification time, or None for an empty
+        collection, and the size of the collection.
+    """
+    total = version[TOTAL] if estimate is None else estimate
+    changes = [version[field] for field in fields if version[field] is not None]
+    digest = hashlib.md5(
+        '|'.join((
+            *(change.isoformat() for change in changes),
+            str(total),
+            str(version.get(DELETED, '')),
+            request.META.get('QUERY_STRING', ''),
+            str(request.user.pk),
+        )).encode(),
+        usedforsecurity=False,
+    ).hexdigest()
+    return quote_etag(digest), max(changes, default=None), (total, estimate is not None)
+
+
+def not_modified(request, etag, last_modified):
+    """
+    Answer a conditional request without building the response if possible.
+
+    Args:
+        request (HttpRequest): The request.
+        etag (str): The current ETag.
+        last_modified (datetime): The current modification time, or None.
+
+    Returns:
+        HttpResponse: A 304 response, or None if the client must get the content.
+    """
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    return None if response is None else set_validators(response, etag, last_modified)
+
+
+def set_validators(response, etag, last_modified):
+    """
+    Add the validators to a successful or 304 response.
+
+    Args:
+        response (HttpResponse): The response.
+        etag (str): The ETag.
+        last_modified (datetime): The modification time, or None.
+
+    Returns:
+        HttpResponse: The response.
+    """
+    if response.status_code in {OK, NOT_MODIFIED}:
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+        patch_vary_headers(response, ('Cookie', 'Authorization'))
+    return response
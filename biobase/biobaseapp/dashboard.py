@@ -0,0 +1,102 @@
+"""Cached per-user data for the main menu."""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import (CultivationPlanning, CustomUser, Experiments, Projects,
+                     Strains, SubstanceIdentification)
+
+ID = 'id'
+CREATED = 'created_by'
+CACHE_KEY = 'biobase:dashboard:{0}'
+TOTAL_SUFFIX = '_total'
+
+# Context name: (model, field shown in the menu, ordering of the most recent items).
+DASHBOARD_SECTIONS = {
+    'strains': (Strains, 'name', '-creation_date'),
+    'plans': (CultivationPlanning, 'status', '-planning_date'),
+    'identifications': (SubstanceIdentification, 'results', '-identification_date'),
+    'experiments': (Experiments, 'results', '-start_date'),
+    'projects': (Projects, 'project_name', '-start_date'),
+}
+DASHBOARD_MODELS = tuple(section[0] for section in DASHBOARD_SECTIONS.values())
+
+
+def count_for_user(model_class):
+    """
+    Build a subquery counting the objects created by the outer user.
+
+    Args:
+        model_class (type): The model to count.
+
+    Returns:
+        Coalesce: The count expression.
+    """
+    return Coalesce(
+        Subquery(
+            model_class.objects.filter(
+                created_by=OuterRef('pk'),
+            ).order_by().values(CREATED).annotate(total=Count(ID)).values('total'),
+        ),
+        0,
+    )
+
+
+def build_dashboard(user):
+    """
+    Load per-type counts and the most recent items of a user.
+
+    All counts come from one query; each section then needs one bounded query.
+
+    Args:
+        user (CustomUser): The user.
+
+    Returns:
+        dict: Counts under ``'counts'`` and a list of recent items per section.
+    """
+    totals = CustomUser.objects.filter(pk=user.pk).values(**{
+        f'{name}{TOTAL_SUFFIX}': count_for_user(model_class)
+        for name, (model_class, _, _) in DASHBOARD_SECTIONS.items()
+    }).get()
+    dashboard = {
+        'counts': {name: totals[f'{name}{TOTAL_SUFFIX}'] for name in DASHBOARD_SECTIONS},
+    }
+    for name, (model_class, field, ordering) in DASHBOARD_SECTIONS.items():
+        dashboard[name] = list(
+            model_class.objects.filter(
+                created_by=user,
+            ).order_by(ordering, ID).values(ID, field)[:settings.DASHBOARD_RECENT_ITEMS],
+        )
+    return dashboard
+
+
+def get_dashboard(user):
+    """
+    Get the dashboard data of a user from the cache, building it on a miss.
+
+    Args:
+        user (CustomUser): The user.
+
+    Returns:
+        dict: The dashboard data.
+    """
+    key = CACHE_KEY.format(user.pk)
+    dashboard = cache.get(key)
+    if dashboard is None:
+        dashboard = build_dashboard(user)
+        cache.set(key, dashboard, settings.DASHBOARD_CACHE_TIMEOUT)
+    return dashboard
+
+
+def invalidate_dashboard(*user_ids):
+    """
+    Drop the cached dashboards of users once the current transaction commits.
+
+    Args:
+        user_ids: Primary keys of the users whose records changed.
+    """
+    keys = [CACHE_KEY.format(user_id) for user_id in set(user_ids)]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
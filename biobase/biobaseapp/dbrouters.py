@@ -0,0 +1,170 @@
+"""Database router sending the reads of safe requests to read replicas."""
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.utils.functional import SimpleLazyObject, empty
+
+PRIMARY = 'default'
+STICKY_KEY = 'biobase:db:sticky:{0}'
+STICKY_COOKIE = 'biobase_primary'
+
+request_routing = ContextVar('biobase_request_routing', default=None)
+
+
+class RoutingState:
+    """
+    Replica routing state of the current request.
+
+    Attributes:
+        request (HttpRequest): The request.
+        use_replica (bool): Whether reads may still go to a replica.
+        wrote (bool): Whether the request wrote to the primary.
+        user_checked (bool): Whether the stickiness of the user was checked.
+    """
+
+    def __init__(self, request, use_replica):
+        """
+        Initialize the state of a request.
+
+        Args:
+            request (HttpRequest): The request.
+            use_replica (bool): Whether reads may go to a replica.
+        """
+        self.request = request
+        self.use_replica = use_replica
+        self.wrote = False
+        self.user_checked = False
+
+
+def resolved_user(request):
+    """
+    Get the authenticated user of a request without loading it.
+
+    Loading the user would itself read the database through the router, so
+    only a user that the request has already resolved is returned.
+
+    Args:
+        request (HttpRequest): The request.
+
+    Returns:
+        CustomUser: The user, or None if unknown yet or anonymous.
+    """
+    user = request.__dict__.get('user')
+    if isinstance(user, SimpleLazyObject):
+        user = None if user._wrapped is empty else user._wrapped
+    if user is None or not user.is_authenticated:
+        return None
+    return user
+
+
+def mark_sticky(user_id):
+    """
+    Send the reads of a user to the primary for ``REPLICA_STICKY_SECONDS``.
+
+    Other processes see the mark only if the cache backend is shared.
+
+    Args:
+        user_id (int): The primary key of the user who wrote.
+    """
+    cache.set(STICKY_KEY.format(user_id), True, settings.REPLICA_STICKY_SECONDS)
+
+
+def is_sticky(user_id):
+    """
+    Check whether a user wrote recently.
+
+    Args:
+        user_id (int): The primary key of the user.
+
+    Returns:
+        bool: True if the reads of the user must go to the primary.
+    """
+    return bool(cache.get(STICKY_KEY.format(user_id)))
+
+
+class ReplicaRouter:
+    """
+    Route reads of safe requests to ``DATABASE_REPLICAS`` and the rest to the primary.
+
+    Reads go to a replica only inside a request marked by
+    ``ReplicaRoutingMiddleware`` as safe. They stay on the primary once the
+    request writes, inside transactions, and for a short time after the
+    user's last write, so users always see their own changes.
+    """
+
+    def db_for_read(self, model, **hints):
+        """
+        Choose the database for reading a model.
+
+        Args:
+            model (type): The model class.
+            hints: Router hints.
+
+        Returns:
+            str: A replica alias, or None for the primary.
+        """
+        replicas = settings.DATABASE_REPLICAS
+        state = request_routing.get()
+        if not replicas or state is None or not state.use_replica:
+            return None
+        if connections[PRIMARY].in_atomic_block:
+            return None
+        if not state.user_checked:
+            user = resolved_user(state.request)
+            if user is not None:
+                # Set first: the cache lookup may read the database itself.
+                state.user_checked = True
+                state.use_replica = not is_sticky(user.pk)
+                if not state.use_replica:
+                    return None
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        """
+        Choose the database for writing a model, always the primary.
+
+        Args:
+            model (type): The model class.
+            hints: Router hints.
+
+        Returns:
+            str: The primary alias.
+        """
+        state = request_routing.get()
+        if state is not None:
+            state.use_replica = False
+            state.wrote = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """
+        Allow relations between objects of the primary and its replicas.
+
+        Args:
+            obj1 (Model): The first object.
+            obj2 (Model): The second object.
+            hints: Router hints.
+
+        Returns:
+            bool: True if both objects come from the same data.
+        """
+        aliases = {PRIMARY, *settings.DATABASE_REPLICAS}
+        return obj1._state.db in aliases and obj2._state.db in aliases
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        """
+        Forbid migrations on replicas, which follow the primary.
+
+        Args:
+            db (str): The database alias.
+            app_label (str): The app label.
+            model_name (str): The model name.
+            hints: Router hints.
+
+        Returns:
+            bool: False for replicas, None otherwise.
+        """
+        return False if db in settings.DATABASE_REPLICAS else None
@@ -5,12 +5,16 @@ from django.contrib.auth.forms import UserChangeForm, UserCreationForm
 from django.forms import modelformset_factory
 from rest_framework.authtoken.models import Token
 
+from .autocomplete import AUTOCOMPLETE_MODELS
 from .models import (CultivationPlanning, Cultures, CustomUser, Experiments,
                      Projects, StrainProcessing, Strains,
                      SubstanceIdentification)
+from .widgets import RemoteSelect
 
 ALL = '__all__'
 CREATED = 'created_by'
+KEY_FIELD = 'token'
+KEY_RELATION = 'auth_token'
 
 MODEL_CHOICES = [
     ('CustomUser', 'CustomUser'),
@@ -94,6 +98,17 @@ class LoginForm(forms.Form):
     username = forms.CharField(label='Логин')
     password = forms.CharField(label='Пароль', widget=forms.PasswordInput)
 
+    def __init__(self, *args, **kwargs):
+        """
+        Initialize the form with the given arguments.
+
+        Args:
+            args: positional argument list.
+            kwargs: keyword arguments.
+        """
+        super().__init__(*args, **kwargs)
+        self.user_cache = None
+
     def clean(self):
         """
         Validate the username and password.
@@ -133,27 +148,44 @@ class LoginForm(forms.Form):
         Validate the user.
 
         This method validates the user entered by the user. It checks that the
-        user exists in the database and that the password is correct. If the
-        user and password are valid, it sets the user's token and saves the user.
+        user exists in the database and that the password is correct. The user
+        is loaded together with their API token, and the password is hashed
+        only once. If the user and password are valid, it stores the token key
+        on the user, writing only the token column and only if the key changed.
 
         Args:
             username (str): The username of the user.
             password (str): The password of the user.
 
         Raises:
-            ValidationError: If the user does not exist or the password is incorrect.
+            ValidationError: If the user does not exist, is inactive or the password
+                is incorrect.
         """
         try:
-            user = CustomUser.objects.get(username=username)
+            user = CustomUser.objects.select_related(KEY_RELATION).get(username=username)
         except CustomUser.DoesNotExist:
             raise forms.ValidationError('Пользователь с таким логином не найден.')
 
-        if not user.check_password(password):
+        if not user.check_password(password) or not user.is_active:
             raise forms.ValidationError('Неверный логин или пароль.')
 
-        token, _ = Token.objects.get_or_create(user=user)
-        user.token = token.key
-        user.save()
+        try:
+            token = user.auth_token
+        except Token.DoesNotExist:
+            token = Token.objects.create(user=user)
+        if user.token != token.key:
+            user.token = token.key
+            user.save(update_fields=[KEY_FIELD])
+        self.user_cache = user
+
+    def get_user(self):
+        """
+        Get the user validated by the form.
+
+        Returns:
+            CustomUser: The user, or None if the form has not been validated.
+        """
+        return self.user_cache
 
 
 class BaseModelForm(forms.ModelForm):
@@ -161,7 +193,8 @@ class BaseModelForm(forms.ModelForm):
     Base model form for forms that save data to the database.
 
     This class provides a way to save data to the database while
-    setting the user who created the entry.
+    setting the user who created the entry. Foreign keys are rendered with
+    ``RemoteSelect``, which loads the related objects on demand.
 
     Attributes:
         user (CustomUser): The user who is creating the entry.
@@ -180,6 +213,13 @@ class BaseModelForm(forms.ModelForm):
         """
         self.user = kwargs.pop('user', None)
         super().__init__(*args, **kwargs)
+        for field in self.fields.values():
+            if not isinstance(field, forms.ModelChoiceField):
+                continue
+            model_name = field.queryset.model.__name__
+            if model_name in AUTOCOMPLETE_MODELS:
+                field.widget = RemoteSelect(model_name)
+                field.widget.is_required = field.required
         field_name = CREATED
         if field_name in self.fields:
             self.fields[field_name].widget = forms.HiddenInput()
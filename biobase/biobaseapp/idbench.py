@@ -0,0 +1,205 @@
+"""Benchmark of the primary key generators on the insert path."""
+import platform
+import time
+import uuid
+
+import django
+from django.apps.registry import Apps
+from django.db import DatabaseError, connections, models, transaction
+
+from .ids import uuid7
+from .postgres import indexes_size, is_postgres
+
+SCRATCH_TABLE = 'biobaseapp_bench_ids'
+SQLITE = 'sqlite'
+NANOSECONDS = 1e9
+
+# Primary key generators compared by bench_ids.
+ID_GENERATORS = (
+    ('uuid4', uuid.uuid4),
+    ('uuid7', uuid7),
+)
+
+# SQLite's own placeholder: Django passes it through and binds the parameters.
+SQLITE_INDEX_SIZE = """
+    SELECT COALESCE(SUM(pgsize), 0) FROM dbstat
+    WHERE name IN (SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ?)
+"""
+
+
+class ScratchId(models.Model):
+    """
+    Row of the scratch table of ``bench_id_generator``.
+
+    The model is registered in its own app registry, so that migrations do
+    not see it.
+
+    Attributes:
+        id (UUIDField): The generated primary key.
+        position (IntegerField): The insert order.
+    """
+
+    id = models.UUIDField(primary_key=True)
+    position = models.IntegerField()
+
+    class Meta:
+        apps = Apps()
+        app_label = 'biobaseapp'
+        db_table = SCRATCH_TABLE
+
+
+def environment(connection, **details):
+    """
+    Describe where a benchmark ran.
+
+    Args:
+        connection: The database connection.
+        details: Other settings of the run.
+
+    Returns:
+        dict: The Python, Django and database versions and the details.
+    """
+    return {
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        **details,
+    }
+
+
+def index_size(connection, table):
+    """
+    Measure the size of the indexes of a table.
+
+    Args:
+        connection: The database connection.
+        table (str): The table name.
+
+    Returns:
+        int | None: The size in bytes, or ``None`` where the database does
+        not report it (SQLite built without the ``dbstat`` table).
+    """
+    if is_postgres(connection):
+        return indexes_size(connection, table)
+    if connection.vendor != SQLITE:
+        return None
+    with connection.cursor() as cursor:
+        try:
+            cursor.execute(SQLITE_INDEX_SIZE, [table])
+        except DatabaseError:
+            return None
+        return cursor.fetchone()[0]
+
+
+def insert_ids(ids, batch_size, using):
+    """
+    Insert ids into the scratch table, one transaction per batch.
+
+    Args:
+        ids (list): The ids in insert order.
+        batch_size (int): Rows per insert statement and transaction.
+        using (str): The database alias.
+
+    Returns:
+        float: The time of the inserts, in seconds.
+    """
+    rows = [ScratchId(id=pk, position=position) for position, pk in enumerate(ids)]
+    scratch = ScratchId.objects.using(using)
+    started = time.perf_counter()
+    for start in range(0, len(rows), batch_size):
+        with transaction.atomic(using=using):
+            scratch.bulk_create(rows[start:start + batch_size])
+    return time.perf_counter() - started
+
+
+def create_scratch_table(connection):
+    """
+    Create the scratch table with the statement of the schema editor.
+
+    The editor is not entered as a context manager, which SQLite refuses
+    inside a transaction; the table has no foreign keys or indexes that
+    the editor would defer until then.
+
+    Args:
+        connection: The database connection.
+    """
+    statement, arguments = connection.schema_editor().table_sql(ScratchId)
+    with connection.cursor() as cursor:
+        cursor.execute(statement, arguments or None)
+
+
+def drop_scratch_table(connection):
+    """
+    Drop the scratch table.
+
+    Args:
+        connection: The database connection.
+    """
+    editor = connection.schema_editor()
+    with connection.cursor() as cursor:
+        cursor.execute(editor.sql_delete_table % {'table': editor.quote_name(SCRATCH_TABLE)})
+
+
+def bench_id_generator(generator, rows, batch_size=1000, using='default'):
+    """
+    Insert ids into a scratch table and measure the time and index size.
+
+    The table has only the primary key and a counter, so the measurements
+    show the cost of the id order: random ids split pages all over the
+    index, time-ordered ids fill the last page. The table is dropped
+    afterwards.
+
+    Args:
+        generator (Callable): Function returning a new ``uuid.UUID``.
+        rows (int): Number of rows to insert.
+        batch_size (int): Rows per insert statement and transaction.
+        using (str): The database alias.
+
+    Returns:
+        dict: The generation and insert timings and the index size.
+
+    Raises:
+        DatabaseError: If an insert fails, once the table is dropped.
+    """
+    connection = connections[using]
+    started = time.perf_counter()
+    ids = [generator() for _ in range(rows)]
+    generated = time.perf_counter() - started
+
+    create_scratch_table(connection)
+    try:
+        inserted = insert_ids(ids, batch_size, using)
+    except DatabaseError:
+        drop_scratch_table(connection)
+        raise
+    size = index_size(connection, SCRATCH_TABLE)
+    drop_scratch_table(connection)
+    return {
+        'rows': rows,
+        'generate_ns_per_id': round(generated * NANOSECONDS / rows, 1),
+        'insert_s': round(inserted, 3),
+        'rows_per_s': round(rows / inserted, 1) if inserted else 0,
+        'index_bytes': size,
+        'index_bytes_per_row': round(size / rows, 2) if size is not None else None,
+    }
+
+
+def bench_ids(rows, batch_size=1000, using='default'):
+    """
+    Compare the primary key generators of ``ID_GENERATORS``.
+
+    Args:
+        rows (int): Number of rows inserted per generator.
+        batch_size (int): Rows per insert statement and transaction.
+        using (str): The database alias.
+
+    Returns:
+        dict: The report, with the environment and measurements per generator.
+    """
+    return {
+        'environment': environment(connections[using], batch_size=batch_size),
+        'generators': {
+            name: bench_id_generator(generator, rows, batch_size, using)
+            for name, generator in ID_GENERATORS
+        },
+    }
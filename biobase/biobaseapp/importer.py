@@ -0,0 +1,376 @@
+"""Bulk import of model rows from CSV or NDJSON files."""
+import csv
+import json
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db import connections, transaction
+from django.utils import timezone
+
+from .dashboard import invalidate_dashboard
+from .export import CSV, export_fields
+from .lineage import link_unlinked
+from .models import CustomUser, Projects, Strains
+from .mutations import sync_mutations
+from .postgres import StagingTable, is_postgres
+
+CREATED = 'created_by'
+STAGING_TABLE = 'biobase_import_staging'
+
+# Fields used to resolve a foreign key given by a human-readable value instead of an id.
+NATURAL_KEYS = (
+    (CustomUser, 'username'),
+    (Strains, 'UIN'),
+    (Projects, 'project_name'),
+)
+
+
+def read_rows(stream, file_format):
+    """
+    Read rows from a CSV file with a header or from an NDJSON file.
+
+    Args:
+        stream (TextIO): The opened file.
+        file_format (str): ``'csv'`` or ``'ndjson'``.
+
+    Yields:
+        dict: One row per record, keyed by column name.
+    """
+    if file_format == CSV:
+        yield from csv.DictReader(stream)
+        return
+    for line in stream:
+        if line.strip():
+            yield json.loads(line)
+
+
+def empty_value(field):
+    """
+    Get the value of a field left empty in the file.
+
+    Args:
+        field (Field): The model field.
+
+    Returns:
+        The value: NULL, the default or an empty string.
+
+    Raises:
+        ValidationError: If the field is required.
+    """
+    if field.null:
+        return None
+    if field.has_default():
+        return field.get_default()
+    if not field.is_relation and field.empty_strings_allowed:
+        return ''
+    raise ValidationError(f'{field.name} is required.')
+
+
+def split_keys(pk_field, raw_values):
+    """
+    Separate the primary keys of a relation from its natural keys.
+
+    Args:
+        pk_field (Field): The primary key of the related model.
+        raw_values (list): Raw values of the relation field.
+
+    Returns:
+        tuple: Primary keys keyed by the raw value as a string, and the set
+        of raw values that are no primary keys.
+    """
+    resolved = {}
+    natural = set()
+    for raw_value in raw_values:
+        if raw_value is None or raw_value == '':
+            continue
+        try:
+            resolved[str(raw_value)] = pk_field.to_python(raw_value)
+        except ValidationError:
+            natural.add(str(raw_value))
+    return resolved, natural
+
+
+class RowConverter:
+    """
+    Convert raw rows of one model to tuples of field values.
+
+    Foreign keys may be given either as ids or as natural keys (username for
+    users, UIN for strains, project name for projects); each batch resolves
+    them with one query per relation.
+    """
+
+    def __init__(self, fields, using, timestamp):
+        """
+        Prepare the conversion of rows.
+
+        Args:
+            fields (list): The imported model fields, in row order.
+            using (str): The database alias of the related records.
+            timestamp (datetime): The value of ``auto_now`` fields.
+        """
+        self.fields = fields
+        self.using = using
+        self.timestamp = timestamp
+
+    def prepare(self, batch, first_line):
+        """
+        Convert a batch of raw rows to tuples of Python values.
+
+        Args:
+            batch (list): Raw rows.
+            first_line (int): Number of the first row, for error messages.
+
+        Returns:
+            list: One tuple of field values per row.
+
+        Raises:
+            ValueError: If a value is invalid.
+        """
+        references = {
+            field.name: self.resolve_references(field, [row.get(field.name) for row in batch])
+            for field in self.fields
+            if field.is_relation
+        }
+        prepared = []
+        for line, row in enumerate(batch, start=first_line):
+            try:
+                prepared.append(tuple(
+                    self.convert(field, row.get(field.name), references.get(field.name))
+                    for field in self.fields
+                ))
+            except ValidationError as error:
+                messages = '; '.join(error.messages)
+                raise ValueError(f'Row {line}: {messages}') from error
+        return prepared
+
+    def convert(self, field, raw_value, references=None):
+        """
+        Convert one raw value to the Python value of a field.
+
+        Args:
+            field (Field): The model field.
+            raw_value: The value from the file.
+            references (dict): Resolved natural keys for relation fields.
+
+        Returns:
+            The converted value.
+        """
+        if getattr(field, 'auto_now', False):
+            # bulk_create sets auto_now fields itself; COPY bypasses it.
+            return self.timestamp
+        if raw_value is None or raw_value == '':
+            return empty_value(field)
+        if references is not None:
+            return references[str(raw_value)]
+        return field.to_python(raw_value)
+
+    def resolve_references(self, field, raw_values):
+        """
+        Map the raw values of a relation field to related primary keys.
+
+        Args:
+            field (ForeignKey): The relation field.
+            raw_values (list): Raw values of the field in the batch.
+
+        Returns:
+            dict: Primary keys keyed by the raw value as a string.
+        """
+        resolved, natural = split_keys(field.target_field, raw_values)
+        if natural:
+            resolved.update(self.resolve_natural(field, natural))
+        return resolved
+
+    def resolve_natural(self, field, natural):
+        """
+        Look up the primary keys of natural keys with one query.
+
+        Args:
+            field (ForeignKey): The relation field.
+            natural (set): Raw values that are no primary keys.
+
+        Returns:
+            dict: Primary keys keyed by the natural key.
+
+        Raises:
+            ValueError: If a natural key is unknown or ambiguous.
+        """
+        related_model = field.related_model
+        key = dict(NATURAL_KEYS).get(related_model)
+        if key is None:
+            model_name = related_model.__name__
+            raise ValueError(f'{field.name}: expected {model_name} ids.')
+        matches = related_model.objects.using(self.using).filter(
+            **{f'{key}__in': natural},
+        ).values_list(key, 'pk')
+        found = {}
+        for natural_key, pk in matches:
+            if natural_key in found:
+                raise ValueError(f'{field.name}: {key} {natural_key!r} is ambiguous.')
+            found[natural_key] = pk
+        missing = sorted(natural - found.keys())
+        if missing:
+            raise ValueError(f'{field.name}: unknown {key} {missing}.')
+        return found
+
+
+class Importer:
+    """
+    Insert rows of one model in batches.
+
+    Rows are converted by ``RowConverter``. On PostgreSQL all batches are
+    loaded with ``COPY FROM STDIN`` into a ``StagingTable`` and moved into
+    the model table by a single ``INSERT ... SELECT``, skipping ids that
+    already exist. Other databases fall back to ``bulk_create``. Imported
+    strains get their pedigree closure rows and mutation links once all
+    batches are in.
+    """
+
+    def __init__(self, model_class, using='default', batch_size=5000):
+        """
+        Prepare an import into a model.
+
+        Args:
+            model_class (type): The model to import into.
+            using (str): The database alias.
+            batch_size (int): Number of rows resolved and written at once.
+        """
+        self.model_class = model_class
+        self.connection = connections[using]
+        self.using = using
+        self.batch_size = batch_size
+        self.fields = export_fields(model_class)
+        self.records = model_class.objects.using(using)
+
+    def run(self, rows):
+        """
+        Import rows into the model table in a single transaction.
+
+        A row that cannot be converted, an unresolved reference or a cycle
+        of strain parents raises ``ValueError`` and rolls the import back.
+
+        Args:
+            rows (Iterable): Rows as dicts keyed by field name.
+
+        Returns:
+            tuple: Number of rows read and number of rows inserted.
+        """
+        converter = RowConverter(self.fields, self.using, timezone.now())
+        with transaction.atomic(using=self.using):
+            read, inserted, user_ids = self.load(iter(rows), converter)
+            if self.model_class is Strains:
+                strains = Strains.objects.using(self.using)
+                if is_postgres(self.connection):
+                    # COPY keeps the shared auto_now time that marks this import.
+                    strains = strains.filter(updated_at=converter.timestamp)
+                self.link_lineage(strains)
+                self.link_mutations(strains)
+            invalidate_dashboard(*user_ids)
+        return read, inserted
+
+    def load(self, rows, converter):
+        """
+        Convert and write the rows batch by batch.
+
+        Args:
+            rows (Iterator): Rows as dicts keyed by field name.
+            converter (RowConverter): The converter of the rows.
+
+        Returns:
+            tuple: Number of rows read, number of rows inserted and the ids
+            of the users who created them.
+        """
+        staging = None
+        if is_postgres(self.connection):
+            staging = StagingTable(
+                self.connection, STAGING_TABLE, self.records.query.get_meta().db_table,
+                [field.column for field in self.fields],
+            )
+            staging.create()
+        read = inserted = 0
+        user_ids = set()
+        creator = self.field_index(CREATED)
+        batch = list(islice(rows, self.batch_size))
+        while batch:
+            prepared = converter.prepare(batch, first_line=read + 1)
+            read += len(prepared)
+            if creator is not None:
+                user_ids.update(row[creator] for row in prepared)
+            if staging is None:
+                inserted += self.bulk_create(prepared)
+            else:
+                staging.copy(prepared)
+            batch = list(islice(rows, self.batch_size))
+        if staging is not None:
+            inserted = staging.insert()
+            staging.drop()
+        return read, inserted, user_ids
+
+    def link_lineage(self, strains):
+        """
+        Add the closure rows of the imported strains.
+
+        Args:
+            strains (QuerySet): The strains of the import on PostgreSQL,
+                elsewhere every strain, of which those without closure rows
+                are linked.
+
+        Raises:
+            ValueError: If the parents of the imported strains form a cycle.
+        """
+        try:
+            link_unlinked(strains)
+        except ValidationError as error:
+            raise ValueError('; '.join(error.messages)) from error
+
+    def link_mutations(self, strains):
+        """
+        Add the mutation links of the imported strains.
+
+        On PostgreSQL the strains of the import are read with a server-side
+        cursor. Elsewhere they are every strain without links, so strains
+        without mutations are parsed again.
+
+        Args:
+            strains (QuerySet): The strains of the import on PostgreSQL,
+                elsewhere every strain.
+        """
+        strains = strains.only('pk', 'mutations')
+        if is_postgres(self.connection):
+            strains = strains.iterator(chunk_size=self.batch_size)
+        else:
+            strains = list(strains.filter(mutation_links__isnull=True))
+        sync_mutations(strains, self.using, replace=False)
+
+    def field_index(self, name):
+        """
+        Get the position of a field in the prepared rows.
+
+        Args:
+            name (str): The field name.
+
+        Returns:
+            int: The position, or None if the model has no such field.
+        """
+        names = [field.name for field in self.fields]
+        return names.index(name) if name in names else None
+
+    def bulk_create(self, prepared):
+        """
+        Insert a batch with ``bulk_create``, skipping ids that already exist.
+
+        Args:
+            prepared (list): Tuples of field values.
+
+        Returns:
+            int: Number of inserted rows.
+        """
+        attnames = [field.attname for field in self.fields]
+        instances = [self.model_class(**dict(zip(attnames, row))) for row in prepared]
+        existing = set(
+            self.records.filter(
+                pk__in=[instance.pk for instance in instances],
+            ).values_list('pk', flat=True),
+        )
+        instances = [instance for instance in instances if instance.pk not in existing]
+        self.records.bulk_create(instances)
+        return len(instances)
@@ -0,0 +1,292 @@
+"""Strain pedigree graph kept as a closure table in ``StrainLineage``."""
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+
+from .models import StrainLineage, Strains
+
+DEPTH = 'depth'
+LINKS = 'descendant_links'
+MAX_DEPTH = 10000
+BATCH_SIZE = 1000
+
+
+def closure(pk, parents, known):
+    """
+    Compute the ancestors of a new strain from the parents of a batch.
+
+    Args:
+        pk (uuid.UUID): The strain.
+        parents (dict): Parent id, or None, by id of the new strains.
+        known (dict): Ancestor ids and depths by strain id, extended in place.
+
+    Returns:
+        list: Tuples of the ancestor id and depth, the strain itself first.
+
+    Raises:
+        ValidationError: If the parents of the batch form a cycle.
+    """
+    path = []
+    seen = set()
+    while pk in parents and pk not in known:
+        if pk in seen:
+            raise ValidationError(f'Strain {pk} is its own ancestor.')
+        path.append(pk)
+        seen.add(pk)
+        pk = parents[pk]
+    above = known.get(pk, [(pk, 0)]) if pk is not None else []
+    for node in reversed(path):
+        above = [(node, 0), *((ancestor, depth + 1) for ancestor, depth in above)]
+        known[node] = above
+    return known[path[0]] if path else above
+
+
+def link_new(strains, using='default'):
+    """
+    Add the closure rows of newly inserted strains.
+
+    Used after ``bulk_create``, which does not call ``save``. Parents may be
+    older strains or strains of the same batch. The ancestors of the older
+    parents are read with one query and all rows are inserted at once.
+
+    Args:
+        strains (Iterable): The new strains, without closure rows yet.
+        using (str): The database alias.
+
+    Returns:
+        int: Number of inserted rows.
+    """
+    parents = {strain.pk: strain.parent_id for strain in strains}
+    older = {parent for parent in parents.values() if parent and parent not in parents}
+    known = {}
+    if older:
+        rows = StrainLineage.objects.using(using).filter(descendant__in=older).values_list(
+            'descendant', 'ancestor', DEPTH,
+        )
+        for descendant, ancestor_id, distance in rows:
+            known.setdefault(descendant, []).append((ancestor_id, distance))
+    return insert_links(
+        (
+            (ancestor, pk, depth)
+            for pk in parents
+            for ancestor, depth in closure(pk, parents, known)
+        ),
+        using,
+    )
+
+
+def insert_links(links, using):
+    """
+    Insert closure rows in batches of ``BATCH_SIZE``.
+
+    Args:
+        links (Iterable): Tuples of the ancestor id, descendant id and depth.
+        using (str): The database alias.
+
+    Returns:
+        int: Number of inserted rows.
+    """
+    manager = StrainLineage.objects.using(using)
+    inserted = 0
+    batch = []
+    for ancestor, descendant, depth in links:
+        batch.append(StrainLineage(ancestor_id=ancestor, descendant_id=descendant, depth=depth))
+        if len(batch) == BATCH_SIZE:
+            inserted += len(manager.bulk_create(batch))
+            batch = []
+    return inserted + len(manager.bulk_create(batch))
+
+
+def link_unlinked(queryset):
+    """
+    Add the closure rows of the strains of a queryset that have none.
+
+    Args:
+        queryset (QuerySet): Strains, some of which may already be linked.
+
+    Returns:
+        int: Number of inserted rows.
+    """
+    strains = queryset.exclude(ancestor_links__depth=0).only('pk', 'parent')
+    return link_new(list(strains), using=queryset.db)
+
+
+def creates_cycle(pk, parent_pk, using='default'):
+    """
+    Check whether a parent is the strain itself or one of its descendants.
+
+    Args:
+        pk (uuid.UUID): The strain.
+        parent_pk (uuid.UUID): The proposed parent.
+        using (str): The database alias.
+
+    Returns:
+        bool: Whether the link would make the strain its own ancestor.
+    """
+    return pk == parent_pk or StrainLineage.objects.using(using).filter(
+        ancestor_id=pk, descendant_id=parent_pk,
+    ).exists()
+
+
+def detach(pk, using='default'):
+    """
+    Remove the links from a strain and its descendants to its ancestors.
+
+    One ``DELETE`` whose subquery selects the subtree of the strain.
+
+    Args:
+        pk (uuid.UUID): The strain.
+        using (str): The database alias.
+    """
+    links = StrainLineage.objects.using(using)
+    subtree = links.filter(ancestor_id=pk).values('descendant_id')
+    links.filter(descendant_id__in=subtree).exclude(ancestor_id__in=subtree).delete()
+
+
+def attach(pk, parent_pk, using='default'):
+    """
+    Link a strain and its descendants to a parent and its ancestors.
+
+    The ancestors of the parent and the subtree of the strain are read with
+    one query each, and every pair of them is inserted.
+
+    Args:
+        pk (uuid.UUID): The detached strain.
+        parent_pk (uuid.UUID): The new parent.
+        using (str): The database alias.
+    """
+    links = StrainLineage.objects.using(using)
+    above = list(links.filter(descendant_id=parent_pk).values_list('ancestor_id', DEPTH))
+    below = list(links.filter(ancestor_id=pk).values_list('descendant_id', DEPTH))
+    insert_links(
+        (
+            (ancestor, descendant, up + down + 1)
+            for ancestor, up in above
+            for descendant, down in below
+        ),
+        using,
+    )
+
+
+def sync_lineage(strain, created, using='default'):
+    """
+    Update the closure rows after a strain was saved.
+
+    New strains get their rows; a changed parent moves the strain with all
+    its descendants.
+
+    Args:
+        strain (Strains): The saved strain.
+        created (bool): Whether the strain was inserted.
+        using (str): The database alias.
+    """
+    if created:
+        link_new([strain], using)
+        return
+    current = StrainLineage.objects.using(using).filter(
+        descendant_id=strain.pk, depth=1,
+    ).values_list('ancestor_id', flat=True).first()
+    if current == strain.parent_id:
+        return
+    with transaction.atomic(using=using):
+        detach(strain.pk, using)
+        if strain.parent_id is not None:
+            attach(strain.pk, strain.parent_id, using)
+
+
+def rebuild(using='default'):
+    """
+    Rebuild the closure table from ``Strains.parent``.
+
+    Inserts the strains themselves, then one generation at a time: the
+    links of depth ``n`` are read with the children of their descendants,
+    which gives the links of depth ``n + 1``.
+
+    Args:
+        using (str): The database alias.
+
+    Returns:
+        int: Number of rows.
+
+    Raises:
+        ValidationError: If the parents form a cycle.
+    """
+    links = StrainLineage.objects.using(using)
+    strains = Strains.objects.using(using).values_list('pk', flat=True)
+    total = 0
+    with transaction.atomic(using=using):
+        links.all().delete()
+        inserted = insert_links(((pk, pk, 0) for pk in strains.iterator()), using)
+        depth = 0
+        while inserted > 0:
+            total += inserted
+            if depth > MAX_DEPTH:
+                raise ValidationError('The strain parents form a cycle.')
+            generation = links.filter(depth=depth, descendant__children__isnull=False)
+            inserted = insert_links(
+                (
+                    (ancestor, child, depth + 1)
+                    for ancestor, child in generation.values_list(
+                        'ancestor_id', 'descendant__children',
+                    ).iterator()
+                ),
+                using,
+            )
+            depth += 1
+    return total
+
+
+def ancestors(queryset, pk):
+    """
+    Filter strains to the ancestors of a strain, nearest first.
+
+    Args:
+        queryset (QuerySet): Strains to filter.
+        pk (uuid.UUID): The strain.
+
+    Returns:
+        QuerySet: The ancestors annotated with their ``depth``.
+    """
+    return queryset.filter(
+        descendant_links__descendant_id=pk, descendant_links__depth__gt=0,
+    ).annotate(depth=models.F(f'{LINKS}__depth')).order_by(DEPTH, 'id')
+
+
+def descendants(queryset, pk, max_depth=None):
+    """
+    Filter strains to the descendants of a strain.
+
+    Args:
+        queryset (QuerySet): Strains to filter.
+        pk (uuid.UUID): The strain.
+        max_depth (int): Only descendants up to this many generations, if given.
+
+    Returns:
+        QuerySet: The descendants annotated with their ``depth``.
+    """
+    lookups = {'ancestor_links__ancestor_id': pk, 'ancestor_links__depth__gt': 0}
+    if max_depth is not None:
+        lookups['ancestor_links__depth__lte'] = max_depth
+    return queryset.filter(**lookups).annotate(depth=models.F('ancestor_links__depth'))
+
+
+def common_ancestor(queryset, pks):
+    """
+    Filter strains to the nearest ancestor shared by several strains.
+
+    A strain counts as its own ancestor, so the common ancestor of a strain
+    and one of its descendants is the strain itself.
+
+    Args:
+        queryset (QuerySet): Strains to filter.
+        pks (Collection): The strains.
+
+    Returns:
+        QuerySet: At most one strain, annotated with its ``depth``: the
+        largest number of generations to one of the strains.
+    """
+    return queryset.filter(
+        descendant_links__descendant_id__in=pks,
+    ).annotate(
+        shared=models.Count(f'{LINKS}__descendant_id', distinct=True),
+        depth=models.Max(f'{LINKS}__depth'),
+    ).filter(shared=len(set(pks))).order_by(DEPTH, 'id')[:1]
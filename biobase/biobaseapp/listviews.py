@@ -0,0 +1,110 @@
+"""List pages of the strains, plannings and experiments."""
+from django.views.generic import ListView
+
+from .asyncviews import AsyncListMixin
+from .ids import ORDER, id_ordering
+from .mixins import ListPageMixin
+from .models import CultivationPlanning, Experiments, Strains
+from .search import (CREATED, DATE, DATE_FROM, DATE_TO, GENOTYPE, NAME, QUERY,
+                     SEARCH_TYPE, SIMILAR, list_search)
+
+
+class StrainsListView(ListPageMixin, ListView):
+    """A view that displays a list of strains with pagination and search functionality."""
+
+    model = Strains
+    list_select_related = (CREATED,)
+    template_name = 'strains_list.html'
+    context_object_name = 'strains'
+    paginate_by = 10
+
+    def get_queryset(self):
+        """
+        Get the queryset for the view.
+
+        Returns:
+            QuerySet: The queryset for the view.
+        """
+        queryset = super().get_queryset().order_by(id_ordering(self.request.GET.get(ORDER)))
+        return list_search(
+            queryset, self.request.GET, (NAME, SIMILAR, GENOTYPE, DATE, CREATED),
+            date_field='creation_date',
+        )
+
+
+class CultivationPlanningListView(ListPageMixin, ListView):
+    """A view display a list of plannings with pagination and search functionality."""
+
+    model = CultivationPlanning
+    conditional_related = ('strain_ID',)
+    list_select_related = ('strain_ID', CREATED)
+    template_name = 'planning_list.html'
+    context_object_name = 'plannings'
+    paginate_by = 10
+
+    def get_queryset(self):
+        """
+        Get the queryset for the view.
+
+        Returns:
+            QuerySet: The queryset for the view.
+        """
+        queryset = super().get_queryset().order_by(id_ordering(self.request.GET.get(ORDER)))
+        return list_search(
+            queryset, self.request.GET, (NAME, SIMILAR, DATE, CREATED),
+            prefix='strain_ID__', date_field='planning_date',
+        )
+
+
+class ExperimentsListView(ListPageMixin, ListView):
+    """A view that displays a list of experiments with pagination and search functionality."""
+
+    model = Experiments
+    conditional_related = ('strain_UIN',)
+    list_select_related = ('strain_UIN', CREATED)
+    template_name = 'experiments_list.html'
+    context_object_name = 'experiments'
+    paginate_by = 10
+
+    def get_queryset(self):
+        """
+        Get the queryset for the view.
+
+        Returns:
+            QuerySet: The queryset for the view.
+        """
+        queryset = super().get_queryset().order_by(id_ordering(self.request.GET.get(ORDER)))
+        return list_search(
+            queryset, self.request.GET, (NAME, SIMILAR, DATE, CREATED),
+            prefix='strain_UIN__', date_field='start_date',
+        )
+
+    def get_context_data(self, **kwargs):
+        """
+        Get the context data for the view.
+
+        Args:
+            kwargs: The keyword arguments.
+
+        Returns:
+            dict: The context data for the view.
+        """
+        context = super().get_context_data(**kwargs)
+        context['search_type'] = self.request.GET.get(SEARCH_TYPE, '')
+        context['q'] = self.request.GET.get(QUERY, '')
+        context['date_from'] = self.request.GET.get(DATE_FROM, '')
+        context['date_to'] = self.request.GET.get(DATE_TO, '')
+        context['responsible'] = self.request.GET.get(CREATED, '')
+        return context
+
+
+class AsyncStrainsListView(AsyncListMixin, StrainsListView):
+    """The strains list on the async ORM, for ASGI servers."""
+
+
+class AsyncCultivationPlanningListView(AsyncListMixin, CultivationPlanningListView):
+    """The plannings list on the async ORM, for ASGI servers."""
+
+
+class AsyncExperimentsListView(AsyncListMixin, ExperimentsListView):
+    """The experiments list on the async ORM, for ASGI servers."""
@@ -0,0 +1,233 @@
+"""Virtual users of the load generator and their HTTP client."""
+import http.cookiejar
+import json
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+from django.urls import reverse
+from django.utils import timezone
+
+from .seeding import GENES, NO_PLASMIDS, SEARCH_MODES, WILD_TYPE
+from .views import MODEL_CLASSES
+
+CSRF_COOKIE = 'csrftoken'
+JSON = 'application/json'
+LOGIN = 'login'
+SEARCH = 'search'
+API = 'api'
+BULK = 'bulk'
+BULK_URL = 'strains-bulk'
+LIST_PAGES = ('strains_list', 'planning_list', 'experiments_list')
+ASYNC_PAGE_PREFIX = 'async_'
+ASYNC_API_PREFIX = 'async-'
+UNREACHABLE = 0
+FOUND = 302
+
+
+class NoRedirect(urllib.request.HTTPRedirectHandler):
+    """Return redirects to the caller, so that each request is timed alone."""
+
+    def redirect_request(self, *args):
+        """
+        Refuse to follow a redirect, which urllib then raises as ``HTTPError``.
+
+        Args:
+            args: The request, the response and the redirect details.
+        """
+
+
+class HttpClient:
+    """
+    Send requests with a cookie jar of their own and record their latencies.
+
+    Attributes:
+        base_url (str): The server root, e.g. ``http://127.0.0.1:8000``.
+        recorder (Recorder): Where requests are recorded.
+        timeout (float): Timeout of each request, in seconds.
+    """
+
+    def __init__(self, base_url, recorder, timeout=30):
+        """
+        Initialize the client.
+
+        Args:
+            base_url (str): The server root.
+            recorder (Recorder): Where requests are recorded.
+            timeout (float): Timeout of each request, in seconds.
+        """
+        self.base_url = base_url.rstrip('/')
+        self.recorder = recorder
+        self.timeout = timeout
+        self.cookies = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(self.cookies), NoRedirect,
+        )
+
+    def cookie(self, name):
+        """
+        Get the value of a cookie.
+
+        Args:
+            name (str): The cookie name.
+
+        Returns:
+            str: The value, or an empty string without the cookie.
+        """
+        return next((cookie.value for cookie in self.cookies if cookie.name == name), '')
+
+    def open(self, path, body=None, headers=None):
+        """
+        Send a request and read the whole response.
+
+        Args:
+            path (str): The path with its query string.
+            body (bytes): The body of a POST request.
+            headers (dict): Extra request headers.
+
+        Returns:
+            int: The status code, or ``UNREACHABLE`` if the server could not
+            be reached.
+        """
+        request = urllib.request.Request(
+            f'{self.base_url}{path}', data=body, headers=headers or {},
+        )
+        try:
+            with self.opener.open(request, timeout=self.timeout) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as error:
+            error.read()
+            return error.code
+        except (urllib.error.URLError, OSError):
+            return UNREACHABLE
+
+    def send(self, url_name, path, body=None, headers=None):
+        """
+        Send a request like ``open`` and record its latency.
+
+        Args:
+            url_name (str): The URL name to report the request under.
+            path (str): The path with its query string.
+            body (bytes): The body of a POST request.
+            headers (dict): Extra request headers.
+
+        Returns:
+            int: The status code, see ``open``.
+        """
+        started = time.perf_counter()
+        status = self.open(path, body, headers)
+        self.recorder.record(url_name, status, time.perf_counter() - started)
+        return status
+
+
+class VirtualUser:
+    """
+    One simulated client with its own cookies, account and random choices.
+
+    Browser pages use the session cookie of a form login, API requests use
+    the account's token. With ``async_reads`` the list pages and API reads
+    go to the async views, to compare both paths on an ASGI server.
+    """
+
+    def __init__(self, client, account, rng, settings):
+        """
+        Initialize the user.
+
+        Args:
+            client (HttpClient): The client of the user.
+            account (dict): An account of ``prepare_users``.
+            rng (random.Random): Source of the random choices.
+            settings (dict): The ``iterations``, ``bulk_size`` and ``async_reads`` of the run.
+        """
+        self.client = client
+        self.account = account
+        self.rng = rng
+        self.settings = settings
+        self.logged_in = False
+        self.written = 0
+
+    def play(self, mix, deadline):
+        """
+        Pick actions from the weighted mix until the run is over.
+
+        Args:
+            mix (dict): Weight per kind of traffic, which names the action.
+            deadline (float): ``time.monotonic()`` to stop at, unless ``iterations`` is set.
+        """
+        kinds = [kind for kind, weight in mix.items() if weight]
+        weights = [mix[kind] for kind in kinds]
+        iterations = self.settings['iterations']
+        done = 0
+        while done != iterations and (iterations or time.monotonic() < deadline):
+            getattr(self, self.rng.choices(kinds, weights)[0])()
+            done += 1
+
+    def api_headers(self):
+        """
+        Build the headers of an API request.
+
+        Returns:
+            dict: The headers with the token.
+        """
+        return {'Authorization': f'Token {self.account["token"]}'}
+
+    def login(self):
+        """Log in with the form, fetching the CSRF cookie first."""
+        path = reverse(LOGIN)
+        self.client.open(path)
+        body = urllib.parse.urlencode({
+            'username': self.account['username'],
+            'password': self.account['password'],
+            'csrfmiddlewaretoken': self.client.cookie(CSRF_COOKIE),
+        }).encode()
+        base_url = self.client.base_url
+        referer = f'{base_url}{path}'
+        status = self.client.send(LOGIN, path, body, {'Referer': referer})
+        self.logged_in = status == FOUND
+
+    def search(self):
+        """Open a list page, the strain list with a random search mode."""
+        if not self.logged_in:
+            self.login()
+        url_name = self.rng.choice(LIST_PAGES)
+        query = self.rng.choice(list(SEARCH_MODES.values())) if url_name == LIST_PAGES[0] else {}
+        if self.settings['async_reads']:
+            url_name = f'{ASYNC_PAGE_PREFIX}{url_name}'
+        path = reverse(url_name)
+        query_string = urllib.parse.urlencode(query)
+        self.client.send(url_name, f'{path}?{query_string}')
+
+    def api(self):
+        """
+        Read the first page of a random collection.
+
+        Both modes read the same collections, so a run with ``async_reads``
+        differs from one without only in the views that answer.
+        """
+        model = self.rng.choice(list(MODEL_CLASSES.values()))
+        model_name = model.__name__.lower()
+        url_name = f'{model_name}-list'
+        if self.settings['async_reads']:
+            url_name = f'{ASYNC_API_PREFIX}{url_name}'
+        self.client.send(url_name, reverse(url_name), headers=self.api_headers())
+
+    def bulk(self):
+        """Create a batch of strains through the bulk endpoint."""
+        today = timezone.now().date().isoformat()
+        strains = []
+        for _ in range(self.settings['bulk_size']):
+            self.written += 1
+            strains.append({
+                'UIN': f'LOAD-{self.account["username"]}-{self.written}',
+                'name': f'Load strain {self.written}',
+                'pedigree': WILD_TYPE,
+                'mutations': self.rng.choice(GENES),
+                'transformations': NO_PLASMIDS,
+                'creation_date': today,
+                'created_by': str(self.account['id']),
+            })
+        headers = self.api_headers()
+        headers['Content-Type'] = JSON
+        self.client.send(BULK_URL, reverse(BULK_URL), json.dumps(strains).encode(), headers)
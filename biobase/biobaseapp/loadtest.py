@@ -0,0 +1,221 @@
+"""Concurrent mixed-traffic load generator for a running biobase server."""
+import random
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+
+from django.db import transaction
+from rest_framework.authtoken.models import Token
+
+from .loadclient import (API, BULK, LOGIN, SEARCH, UNREACHABLE, HttpClient,
+                         VirtualUser)
+from .models import CustomUser
+
+USERNAME_PREFIX = 'load'
+CLIENT_ERROR = 400
+DEFAULT_MIX = MappingProxyType({LOGIN: 1, SEARCH: 4, API: 4, BULK: 1})
+PERCENTILES = (50, 95, 99)
+
+# Settings of ``run`` and their defaults.
+RUN_DEFAULTS = MappingProxyType({
+    'concurrency': 8,
+    'duration': 30.0,
+    'seed': 0,
+    'iterations': None,
+    'timeout': 30,
+    'bulk_size': 10,
+    'async_reads': False,
+})
+
+
+def parse_mix(text):
+    """
+    Parse a traffic mix such as ``login=1,search=4,api=4,bulk=1``.
+
+    Args:
+        text (str): Comma-separated ``kind=weight`` pairs.
+
+    Returns:
+        dict: Weight per kind of traffic; kinds left out get no traffic.
+
+    Raises:
+        ValueError: If a kind is unknown or a weight is not a non-negative integer.
+    """
+    mix = dict.fromkeys(DEFAULT_MIX, 0)
+    for pair in filter(None, (part.strip() for part in text.split(','))):
+        kind, _, weight = pair.partition('=')
+        if kind not in mix or not weight.isdigit():
+            kinds = sorted(mix)
+            raise ValueError(f'Invalid mix entry {pair!r}, expected one of {kinds}=N.')
+        mix[kind] = int(weight)
+    if not any(mix.values()):
+        raise ValueError('The mix must give some traffic a positive weight.')
+    return mix
+
+
+def prepare_users(count, password, using='default'):
+    """
+    Create or reset the pool of load test users with their API tokens.
+
+    The users are superusers so that they may use the bulk endpoints; create
+    them only on databases of test servers.
+
+    Args:
+        count (int): Number of users.
+        password (str): Password of every user.
+        using (str): The database alias.
+
+    Returns:
+        list: Dicts with the ``id``, ``username``, ``password`` and ``token``.
+    """
+    accounts = []
+    with transaction.atomic(using=using):
+        for number in range(count):
+            user, _ = CustomUser.objects.db_manager(using).get_or_create(
+                username=f'{USERNAME_PREFIX}{number:04d}',
+                defaults={'is_staff': True, 'is_superuser': True},
+            )
+            user.set_password(password)
+            user.save(using=using)
+            token, _ = Token.objects.using(using).get_or_create(user=user)
+            accounts.append({
+                'id': user.pk,
+                'username': user.username,
+                'password': password,
+                'token': token.key,
+            })
+    return accounts
+
+
+def percentile(ordered, rank):
+    """
+    Get a percentile of sorted numbers with the nearest-rank method.
+
+    Args:
+        ordered (list): Sorted numbers.
+        rank (int): The percentile, from 1 to 100.
+
+    Returns:
+        float: The number, or 0 without numbers.
+    """
+    if not ordered:
+        return 0
+    return ordered[max(0, -(-rank * len(ordered) // 100) - 1)]
+
+
+def is_error(status):
+    """
+    Check whether a request failed.
+
+    Args:
+        status (int): The status code, ``UNREACHABLE`` for connection errors.
+
+    Returns:
+        bool: True for connection errors and 4xx or 5xx responses.
+    """
+    return status == UNREACHABLE or status >= CLIENT_ERROR
+
+
+class Recorder:
+    """
+    Collect the latencies of all workers.
+
+    Attributes:
+        latencies (dict): Latencies in seconds per URL name.
+        statuses (dict): Counter of status codes per URL name, see ``is_error``.
+    """
+
+    def __init__(self):
+        """Initialize an empty recorder."""
+        self.lock = threading.Lock()
+        self.latencies = {}
+        self.statuses = {}
+
+    def record(self, url_name, status, latency):
+        """
+        Record one request.
+
+        Args:
+            url_name (str): The URL name of the request.
+            status (int): The status code.
+            latency (float): The time until the whole body was read, in seconds.
+        """
+        with self.lock:
+            self.latencies.setdefault(url_name, []).append(latency)
+            self.statuses.setdefault(url_name, Counter())[status] += 1
+
+    def report(self, elapsed):
+        """
+        Summarize the recorded requests.
+
+        Args:
+            elapsed (float): Wall time of the run, in seconds.
+
+        Returns:
+            dict: Totals and per URL name the request count, errors,
+            throughput and latency percentiles in milliseconds.
+        """
+        urls = {}
+        for url_name in sorted(self.latencies):
+            latencies = sorted(self.latencies[url_name])
+            statuses = sorted(self.statuses[url_name].items())
+            urls[url_name] = {
+                'requests': len(latencies),
+                'errors': sum(count for status, count in statuses if is_error(status)),
+                'statuses': {str(status): count for status, count in statuses},
+                'throughput_rps': round(len(latencies) / elapsed, 2),
+                **{
+                    f'p{rank}_ms': round(percentile(latencies, rank) * 1000, 2)
+                    for rank in PERCENTILES
+                },
+                'mean_ms': round(sum(latencies) / len(latencies) * 1000, 2),
+                'max_ms': round(latencies[-1] * 1000, 2),
+            }
+        total = sum(url['requests'] for url in urls.values())
+        return {
+            'elapsed_s': round(elapsed, 2),
+            'requests': total,
+            'errors': sum(url['errors'] for url in urls.values()),
+            'throughput_rps': round(total / elapsed, 2) if elapsed else 0,
+            'urls': urls,
+        }
+
+
+def run(base_url, accounts, mix=None, **options):
+    """
+    Send mixed traffic from concurrent virtual users for a while.
+
+    Every worker thread plays one virtual user, cycling through the accounts,
+    and picks each next action from the weighted mix.
+
+    Args:
+        base_url (str): The server root.
+        accounts (list): Accounts of ``prepare_users``.
+        mix (dict): Weight per kind of traffic, ``DEFAULT_MIX`` by default.
+        options: Settings of ``RUN_DEFAULTS`` to change.
+
+    Returns:
+        dict: The report of ``Recorder.report`` with the run settings.
+    """
+    settings = {**RUN_DEFAULTS, **options}
+    mix = dict(mix or DEFAULT_MIX)
+    recorder = Recorder()
+    users = [
+        VirtualUser(
+            HttpClient(base_url, recorder, settings['timeout']),
+            accounts[number % len(accounts)],
+            random.Random(settings['seed'] + number),
+            settings,
+        )
+        for number in range(settings['concurrency'])
+    ]
+    deadline = time.monotonic() + settings['duration']
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(users)) as executor:
+        plays = [executor.submit(user.play, mix, deadline) for user in users]
+    report = recorder.report(time.perf_counter() - started)
+    for play in plays:
+        play.result()
+    return {'target': base_url, 'concurrency': settings['concurrency'], 'mix': mix, **report}
@@ -0,0 +1,54 @@
+"""Management command for linking strains to their parents from the pedigree text."""
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from biobaseapp.pedigree import AMBIGUOUS, BATCH_SIZE, LINKED, UNRESOLVED, backfill
+
+
+class Command(BaseCommand):
+    """
+    Set ``Strains.parent`` from the free-text pedigree and rebuild the closure.
+
+    Before the pedigree became a structured link, the parent of a strain was
+    only named in ``pedigree``. This command links each strain without a
+    parent to the first other strain whose UIN appears in its pedigree, and
+    reports the pedigrees that name no known UIN or only UINs shared by
+    several strains, for fixing by hand. Run it once after the migration;
+    it can be run again after fixing pedigrees.
+    """
+
+    help = 'Link strains to their parents from the pedigree text.'
+
+    def add_arguments(self, parser):
+        """
+        Add command arguments.
+
+        Args:
+            parser: The argument parser.
+        """
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only count the strains that would be linked.')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        """
+        Link the strains and print the counts.
+
+        Args:
+            args: positional arguments.
+            options: parsed command options.
+
+        Raises:
+            CommandError: If the batch size is not positive or the pedigrees form a cycle.
+        """
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive.')
+        try:
+            counts = backfill(options['database'], options['batch_size'], options['dry_run'])
+        except ValidationError as error:
+            raise CommandError('; '.join(error.messages)) from error
+        verb = 'Would link' if options['dry_run'] else 'Linked'
+        self.stdout.write(f'{"ambiguous":<28}{counts[AMBIGUOUS]:>10}')
+        self.stdout.write(f'{"unresolved":<28}{counts[UNRESOLVED]:>10}')
+        self.stdout.write(self.style.SUCCESS(f'{verb} {counts[LINKED]} strains.'))
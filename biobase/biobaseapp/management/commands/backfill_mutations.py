@@ -0,0 +1,60 @@
+"""Management command for parsing the mutations of existing strains."""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from biobaseapp.models import Mutation, Strains
+from biobaseapp.mutations import BATCH_SIZE, sync_mutations
+
+
+class Command(BaseCommand):
+    """
+    Fill the mutation catalogue from the genotype text of every strain.
+
+    New and changed strains are linked to their mutations when they are
+    saved, bulk created or imported; run this once after the migration for
+    the strains that existed before, or after changing the parser. Links
+    that no longer match the text are removed.
+    """
+
+    help = 'Parse Strains.mutations into the mutation catalogue.'
+
+    def add_arguments(self, parser):
+        """
+        Add command arguments.
+
+        Args:
+            parser: The argument parser.
+        """
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        """
+        Link the strains and print the counts.
+
+        Args:
+            args: positional arguments.
+            options: parsed command options.
+
+        Raises:
+            CommandError: If the batch size is not positive.
+        """
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive.')
+        using = options['database']
+        strains = Strains.objects.using(using).only('pk', 'mutations').order_by('pk')
+        inserted = 0
+        last = None
+        while True:
+            # Keyset batches, each in its own transaction.
+            batch = strains.filter(pk__gt=last) if last is not None else strains
+            batch = list(batch[:options['batch_size']])
+            if not batch:
+                break
+            with transaction.atomic(using=using):
+                inserted += sync_mutations(batch, using)
+            last = batch[-1].pk
+        catalogue = Mutation.objects.using(using).count()
+        self.stdout.write(self.style.SUCCESS(
+            f'Added {inserted} links; the catalogue has {catalogue} mutations.',
+        ))
@@ -0,0 +1,79 @@
+"""Management command for benchmarking the biobase hot paths."""
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from biobaseapp.benchmark import compare, run
+
+
+class Command(BaseCommand):
+    """
+    Time the list views, the menu, the object picker and the API endpoints.
+
+    Every size is seeded with ``seed_biobase`` data inside a transaction that
+    is rolled back afterwards. The JSON report can be given back with
+    ``--baseline`` to compare two runs.
+    """
+
+    help = 'Benchmark the biobase views and API at several data sizes.'
+
+    def add_arguments(self, parser):
+        """
+        Add command arguments.
+
+        Args:
+            parser: The argument parser.
+        """
+        parser.add_argument(
+            '--sizes', type=int, nargs='+', default=[100, 1000],
+            help='Numbers of strains to seed, one run per size.',
+        )
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', type=Path, help='Write the JSON report to this file.')
+        parser.add_argument('--baseline', type=Path, help='A previous report to compare with.')
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        """
+        Run the benchmark and write the report.
+
+        Args:
+            args: positional arguments.
+            options: parsed command options.
+
+        Raises:
+            CommandError: If the arguments are invalid or the baseline cannot be read.
+        """
+        if options['repeat'] < 1 or min(options['sizes']) < 1:
+            raise CommandError('--sizes and --repeat must be positive.')
+        baseline = None
+        if options['baseline']:
+            try:
+                baseline = json.loads(options['baseline'].read_text(encoding='utf-8'))
+            except (OSError, ValueError) as error:
+                raise CommandError(f'Cannot read the baseline: {error}') from error
+
+        try:
+            report = run(
+                options['sizes'],
+                repeat=options['repeat'],
+                seed_value=options['seed'],
+                using=options['database'],
+            )
+        except RuntimeError as error:
+            raise CommandError(str(error)) from error
+
+        text = json.dumps(report, indent=2)
+        if options['output']:
+            options['output'].write_text(text, encoding='utf-8')
+            self.stdout.write(self.style.SUCCESS(f'Report written to {options["output"]}.'))
+        else:
+            self.stdout.write(text)
+
+        if baseline is not None:
+            for size, name, before, after, ratio in compare(report, baseline):
+                self.stdout.write(
+                    f'{size:>8} {name:<40} {before:>10.2f} ms -> {after:>10.2f} ms  x{ratio:.2f}',
+                )
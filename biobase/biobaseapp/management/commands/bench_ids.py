@@ -0,0 +1,62 @@
+"""Management command for comparing random and time-ordered primary keys."""
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from biobaseapp.idbench import bench_ids
+
+
+class Command(BaseCommand):
+    """
+    Time inserts of ``uuid4`` and ``uuid7`` primary keys and compare index sizes.
+
+    Each generator fills its own scratch table, which is dropped afterwards.
+    The difference grows with the table: random ids start to cost once the
+    primary key index no longer fits in memory, so use at least a few
+    hundred thousand rows on PostgreSQL.
+    """
+
+    help = 'Benchmark insert throughput and index size of uuid4 and uuid7 primary keys.'
+
+    def add_arguments(self, parser):
+        """
+        Add command arguments.
+
+        Args:
+            parser: The argument parser.
+        """
+        parser.add_argument('--rows', type=int, default=100000)
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--output', type=Path, help='Write the JSON report to this file.')
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        """
+        Run the benchmark and print the results.
+
+        Args:
+            args: positional arguments.
+            options: parsed command options.
+
+        Raises:
+            CommandError: If the arguments are invalid.
+        """
+        if min(options['rows'], options['batch_size']) < 1:
+            raise CommandError('--rows and --batch-size must be positive.')
+
+        report = bench_ids(options['rows'], options['batch_size'], options['database'])
+        self.stdout.write(
+            f'{"generator":<12}{"ns/id":>10}{"insert s":>12}{"rows/s":>14}'
+            f'{"index bytes":>16}{"bytes/row":>12}',
+        )
+        for name, result in report['generators'].items():
+            size = result['index_bytes']
+            self.stdout.write(
+                f'{name:<12}{result["generate_ns_per_id"]:>10}{result["insert_s"]:>12}'
+                f'{result["rows_per_s"]:>14}{"n/a" if size is None else size:>16}'
+                f'{"n/a" if size is None else result["index_bytes_per_row"]:>12}',
+            )
+        if options['output']:
+            options['output'].write_text(json.dumps(report, indent=2), encoding='utf-8')
+            self.stdout.write(self.style.SUCCESS(f'Report written to {options["output"]}.'))
@@ -0,0 +1,72 @@
+"""Management command for bulk loading biobase records from CSV or NDJSON files."""
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from biobaseapp.export import CSV, NDJSON
+from biobaseapp.importer import Importer, read_rows
+from biobaseapp.views import MODEL_CLASSES
+
+
+class Command(BaseCommand):
+    """
+    Import records of one model from a file.
+
+    The file uses the column layout of the export endpoints. Foreign keys can
+    be given as ids or as natural keys: usernames for ``created_by``, UINs for
+    strains and project names for projects.
+    """
+
+    help = 'Bulk import records of a biobase model from a CSV or NDJSON file.'
+
+    def add_arguments(self, parser):
+        """
+        Add command arguments.
+
+        Args:
+            parser: The argument parser.
+        """
+        parser.add_argument('model', choices=sorted(MODEL_CLASSES))
+        parser.add_argument('path', type=Path)
+        parser.add_argument(
+            '--format', choices=(CSV, NDJSON), dest='file_format',
+            help='File format; guessed from the file extension by default.',
+        )
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        """
+        Run the import and report the throughput.
+
+        Args:
+            args: positional arguments.
+            options: parsed command options.
+
+        Raises:
+            CommandError: If the file cannot be read or contains invalid rows.
+        """
+        path = options['path']
+        file_format = options['file_format'] or path.suffix.lstrip('.').lower()
+        if file_format not in (CSV, NDJSON):
+            raise CommandError(f'Cannot guess the format of {path}, use --format.')
+
+        importer = Importer(
+            MODEL_CLASSES[options['model']],
+            using=options['database'],
+            batch_size=options['batch_size'],
+        )
+        started = time.perf_counter()
+        try:
+            with path.open(encoding='utf-8', newline='') as stream:
+                read, inserted = importer.run(read_rows(stream, file_format))
+        except (OSError, ValueError) as error:
+            raise CommandError(str(error)) from error
+        elapsed = time.perf_counter() - started
+
+        rate = read / elapsed if elapsed else 0
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {inserted} of {read} {options["model"]} rows '
+            f'in {elapsed:.2f}s ({rate:.0f} rows/sec).',
+        ))
@@ -0,0 +1,73 @@
+"""Management command for reporting how often the indexes are used."""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from biobaseapp.postgres import index_usage, is_postgres
+
+TABLE_PREFIX = 'biobaseapp_'
+KIB = 1024
+
+
+class Command(BaseCommand):
+    """
+    Report index scans and sizes from ``pg_stat_user_indexes``.
+
+    Indexes that are never scanned only slow down writes; check the report
+    on the primary and on every replica before dropping one, because each
+    server counts its own scans.
+    """
+
+    help = 'Report the usage of the biobase indexes on PostgreSQL.'
+
+    def add_arguments(self, parser):
+        """
+        Add command arguments.
+
+        Args:
+            parser: The argument parser.
+        """
+        parser.add_argument(
+            '--unused', action='store_true',
+            help='Only list indexes never scanned that do not enforce uniqueness.',
+        )
+        parser.add_argument(
+            '--all-tables', action='store_true',
+            help='Include the tables of other apps, such as auth and sessions.',
+        )
+        parser.add_argument('--json', action='store_true', help='Print the rows as JSON.')
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        """
+        Print the index usage.
+
+        Args:
+            args: positional arguments.
+            options: parsed command options.
+
+        Raises:
+            CommandError: If the database is not PostgreSQL.
+        """
+        connection = connections[options['database']]
+        if not is_postgres(connection):
+            raise CommandError('Index usage statistics are only available on PostgreSQL.')
+
+        rows = index_usage(connection, '' if options['all_tables'] else TABLE_PREFIX)
+        if options['unused']:
+            rows = [row for row in rows if not row['scans'] and not row['unique']]
+
+        if options['json']:
+            self.stdout.write(json.dumps(rows, indent=2))
+            return
+        self.stdout.write(f'{"table":<36}{"index":<44}{"scans":>12}{"read":>14}{"size KiB":>12}')
+        for row in rows:
+            self.stdout.write(
+                f'{row["table"]:<36}{row["index"]:<44}{row["scans"]:>12}'
+                f'{row["tuples_read"]:>14}{row["size"] // KIB:>12}',
+            )
+        unused = sum(row['size'] for row in rows if not row['scans'] and not row['unique'])
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(rows)} indexes, {unused // KIB} KiB in indexes never scanned.',
+        ))
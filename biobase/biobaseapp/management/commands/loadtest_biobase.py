@@ -0,0 +1,101 @@
+"""Management command for load testing a running biobase server."""
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from biobaseapp.loadtest import DEFAULT_MIX, PERCENTILES, parse_mix, prepare_users, run
+
+
+class Command(BaseCommand):
+    """
+    Send concurrent mixed traffic to a server and report latency per URL name.
+
+    Start the server on a copy of the data first, for example with
+    ``gunicorn biobase.wsgi`` or ``uvicorn biobase.asgi:application``, and
+    fill it with ``seed_biobase``. The command creates a pool of superusers
+    with the given password and API tokens in the database of the current
+    settings, which must be the database of the server; bulk writes of the
+    run stay in that database. ``--async-reads`` reads through the async
+    views, so two runs against an ASGI server compare both read paths.
+    """
+
+    help = 'Load test a running biobase server with logins, searches, API reads and bulk writes.'
+
+    def add_arguments(self, parser):
+        """
+        Add command arguments.
+
+        Args:
+            parser: The argument parser.
+        """
+        parser.add_argument('--url', default='http://127.0.0.1:8000')
+        parser.add_argument('--password', required=True, help='Password of the pool users.')
+        parser.add_argument('--users', type=int, default=10, help='Size of the user pool.')
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--duration', type=float, default=30, help='Seconds of traffic.')
+        parser.add_argument(
+            '--iterations', type=int,
+            help='Actions per virtual user; replaces --duration for repeatable runs.',
+        )
+        parser.add_argument(
+            '--mix', default=','.join(f'{kind}={weight}' for kind, weight in DEFAULT_MIX.items()),
+            help='Weights of the kinds of traffic.',
+        )
+        parser.add_argument('--bulk-size', type=int, default=10)
+        parser.add_argument(
+            '--async-reads', action='store_true',
+            help='Send list page and API reads to the async views.',
+        )
+        parser.add_argument('--timeout', type=float, default=30)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--output', type=Path, help='Write the JSON report to this file.')
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        """
+        Prepare the users, run the load and print the results.
+
+        Args:
+            args: positional arguments.
+            options: parsed command options.
+
+        Raises:
+            CommandError: If the arguments are invalid.
+        """
+        try:
+            mix = parse_mix(options['mix'])
+        except ValueError as error:
+            raise CommandError(str(error)) from error
+        if min(options['users'], options['concurrency'], options['bulk_size']) < 1:
+            raise CommandError('--users, --concurrency and --bulk-size must be positive.')
+        if options['iterations'] is not None and options['iterations'] < 1:
+            raise CommandError('--iterations must be positive.')
+
+        accounts = prepare_users(options['users'], options['password'], options['database'])
+        report = run(
+            options['url'], accounts,
+            concurrency=options['concurrency'],
+            duration=options['duration'],
+            mix=mix,
+            seed=options['seed'],
+            iterations=options['iterations'],
+            timeout=options['timeout'],
+            bulk_size=options['bulk_size'],
+            async_reads=options['async_reads'],
+        )
+
+        columns = ''.join(f'{f"p{rank}":>10}' for rank in PERCENTILES)
+        self.stdout.write(f'{"URL name":<36}{"requests":>10}{"errors":>8}{"req/s":>10}{columns}')
+        for url_name, result in report['urls'].items():
+            timings = ''.join(f'{result[f"p{rank}_ms"]:>10.1f}' for rank in PERCENTILES)
+            self.stdout.write(
+                f'{url_name:<36}{result["requests"]:>10}{result["errors"]:>8}'
+                f'{result["throughput_rps"]:>10.1f}{timings}',
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f'{report["requests"]} requests, {report["errors"]} errors, '
+            f'{report["throughput_rps"]} req/s over {report["elapsed_s"]}s.',
+        ))
+        if options['output']:
+            options['output'].write_text(json.dumps(report, indent=2), encoding='utf-8')
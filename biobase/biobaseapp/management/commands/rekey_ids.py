@@ -0,0 +1,50 @@
+"""Management command for giving older records time-ordered ids."""
+from django.core.management.base import BaseCommand, CommandError
+
+from biobaseapp.rekey import BATCH_SIZE, rekey
+
+
+class Command(BaseCommand):
+    """
+    Replace the random ids of records created before ids were time-ordered.
+
+    New records get ``uuid7`` ids, so ``?order=newest`` and the API pages
+    follow creation order; older records keep their random ``uuid4`` ids
+    until this command is run, and sort among the new ones by chance. The
+    new ids follow the date of each record. Every link to a changed record
+    by its old id stops working, so run it once, in a maintenance window,
+    and check the counts with ``--dry-run`` first.
+    """
+
+    help = 'Replace random record ids with time-ordered ids in date order.'
+
+    def add_arguments(self, parser):
+        """
+        Add command arguments.
+
+        Args:
+            parser: The argument parser.
+        """
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only count the records that would change.')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        """
+        Replace the ids and print the number of changed records.
+
+        Args:
+            args: positional arguments.
+            options: parsed command options.
+
+        Raises:
+            CommandError: If the batch size is not positive.
+        """
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive.')
+        counts = rekey(options['database'], options['batch_size'], options['dry_run'])
+        verb = 'Would change' if options['dry_run'] else 'Changed'
+        for name, count in counts.items():
+            self.stdout.write(f'{name:<28}{count:>10}')
+        self.stdout.write(self.style.SUCCESS(f'{verb} {sum(counts.values())} ids.'))
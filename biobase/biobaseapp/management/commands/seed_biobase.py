@@ -0,0 +1,64 @@
+"""Management command for filling a database with generated biobase records."""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from biobaseapp.seeding import seed
+
+
+class Command(BaseCommand):
+    """
+    Generate linked records of all models at a chosen scale.
+
+    Every strain gets processing, identification, experiment and planning
+    records, and one project with its cultures is created per ten strains.
+    The same ``--seed`` produces the same data.
+    """
+
+    help = 'Fill the database with realistic generated strains and related records.'
+
+    def add_arguments(self, parser):
+        """
+        Add command arguments.
+
+        Args:
+            parser: The argument parser.
+        """
+        parser.add_argument('--strains', type=int, required=True)
+        parser.add_argument(
+            '--users', type=int,
+            help='Number of users; one per hundred strains by default.',
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        """
+        Generate the records and report how many were created.
+
+        Args:
+            args: positional arguments.
+            options: parsed command options.
+
+        Raises:
+            CommandError: If the requested numbers are not positive.
+        """
+        if options['strains'] < 1 or options['batch_size'] < 1:
+            raise CommandError('--strains and --batch-size must be positive.')
+
+        started = time.perf_counter()
+        counts = seed(
+            options['strains'],
+            users=options['users'],
+            seed_value=options['seed'],
+            using=options['database'],
+            batch_size=options['batch_size'],
+        )
+        elapsed = time.perf_counter() - started
+
+        for model_name, count in counts.items():
+            self.stdout.write(f'{model_name}: {count}')
+        self.stdout.write(self.style.SUCCESS(
+            f'Created {sum(counts.values())} records in {elapsed:.2f}s.',
+        ))
@@ -0,0 +1,310 @@
+"""Middleware of the biobaseapp app."""
+import logging
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import (iscoroutinefunction, markcoroutinefunction,
+                          sync_to_async)
+from django.conf import settings
+from django.db import connections
+
+from .dbrouters import (STICKY_COOKIE, RoutingState, mark_sticky,
+                        request_routing, resolved_user)
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+SQL_HEADER_LENGTH = 200
+
+logger = logging.getLogger('biobaseapp.queries')
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Tell ``ReplicaRouter`` which requests may read from replicas.
+
+    Safe requests may, unless the client wrote recently: a write sets a
+    cookie and marks the user as sticky, and both keep the following
+    requests on the primary for ``REPLICA_STICKY_SECONDS``. The state is a
+    context variable, so it also reaches the async ORM of async views.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        """
+        Initialize the middleware.
+
+        Args:
+            get_response (Callable): The next handler.
+        """
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        """
+        Process a request with its routing state.
+
+        Args:
+            request (HttpRequest): The request.
+
+        Returns:
+            HttpResponse: The response.
+        """
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.DATABASE_REPLICAS:
+            return self.get_response(request)
+
+        state, token = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            request_routing.reset(token)
+        return self.finish(request, response, state)
+
+    async def __acall__(self, request):
+        """
+        Process a request of an async middleware chain with its routing state.
+
+        Args:
+            request (HttpRequest): The request.
+
+        Returns:
+            HttpResponse: The response.
+        """
+        if not settings.DATABASE_REPLICAS:
+            return await self.get_response(request)
+
+        state, token = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            request_routing.reset(token)
+        return await sync_to_async(self.finish)(request, response, state)
+
+    def start(self, request):
+        """
+        Set the routing state of a request.
+
+        Args:
+            request (HttpRequest): The request.
+
+        Returns:
+            tuple: The state and the token to reset the context variable with.
+        """
+        state = RoutingState(
+            request,
+            use_replica=request.method in SAFE_METHODS and STICKY_COOKIE not in request.COOKIES,
+        )
+        return state, request_routing.set(state)
+
+    def finish(self, request, response, state):
+        """
+        Keep a client that wrote on the primary for its next requests.
+
+        Args:
+            request (HttpRequest): The request.
+            response (HttpResponse): The response.
+            state (RoutingState): The routing state of the request.
+
+        Returns:
+            HttpResponse: The response.
+        """
+        if state.wrote:
+            user = resolved_user(request)
+            if user is not None:
+                mark_sticky(user.pk)
+            response.set_cookie(
+                STICKY_COOKIE, '1', max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True, samesite='Lax',
+            )
+        return response
+
+
+class QueryStats:
+    """
+    Database execute wrapper counting the queries of a request.
+
+    Attributes:
+        count (int): Number of executed statements.
+        duration (float): Total time spent in the database, in seconds.
+        slowest (float): Duration of the slowest statement, in seconds.
+        slowest_sql (str): The slowest statement, without parameters.
+    """
+
+    def __init__(self):
+        """Initialize empty stats."""
+        self.count = 0
+        self.duration = 0.0
+        self.slowest = 0.0
+        self.slowest_sql = ''
+
+    def __call__(self, execute, sql, params, many, context):
+        """
+        Execute a statement and record its duration.
+
+        Args:
+            execute (Callable): The next wrapper or the cursor method.
+            sql (str): The statement.
+            params: The parameters.
+            many (bool): Whether this is ``executemany``.
+            context (dict): Execution context.
+
+        Returns:
+            The result of ``execute``.
+        """
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.count += 1
+            self.duration += elapsed
+            if elapsed >= self.slowest:
+                self.slowest = elapsed
+                self.slowest_sql = sql
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Measure the queries of every view and API endpoint.
+
+    With ``DEBUG`` the numbers are returned in ``X-DB-*`` response headers,
+    otherwise they are logged to ``biobaseapp.queries`` with the URL name in
+    the ``extra`` fields: at WARNING for requests over ``QUERY_WARN_COUNT``
+    queries or ``QUERY_WARN_MS`` of database time, at INFO for the others.
+    Queries run while a streaming response is consumed happen after the
+    middleware returns and are not counted.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        """
+        Initialize the middleware.
+
+        Args:
+            get_response (Callable): The next handler.
+        """
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        """
+        Process a request while counting its queries.
+
+        Args:
+            request (HttpRequest): The request.
+
+        Returns:
+            HttpResponse: The response.
+        """
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        stats = QueryStats()
+        with self.instrument(stats):
+            response = self.get_response(request)
+        return self.report(request, response, stats)
+
+    async def __acall__(self, request):
+        """
+        Process a request of an async middleware chain while counting its queries.
+
+        The async ORM runs queries in the thread ``sync_to_async`` keeps for
+        the request, so the wrappers are installed on the connections of
+        that thread.
+
+        Args:
+            request (HttpRequest): The request.
+
+        Returns:
+            HttpResponse: The response.
+        """
+        stats = QueryStats()
+        stack = await sync_to_async(self.instrument)(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self.report(request, response, stats)
+
+    def instrument(self, stats):
+        """
+        Wrap the connections of the current thread.
+
+        Args:
+            stats (QueryStats): The stats to record the queries in.
+
+        Returns:
+            ExitStack: Removes the wrappers when closed.
+        """
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(stats))
+        return stack
+
+    def report(self, request, response, stats):
+        """
+        Return or log the query stats of a request.
+
+        Args:
+            request (HttpRequest): The request.
+            response (HttpResponse): The response.
+            stats (QueryStats): The query stats of the request.
+
+        Returns:
+            HttpResponse: The response.
+        """
+        if settings.DEBUG:
+            self.add_headers(response, stats)
+        else:
+            self.log(request, response, stats)
+        return response
+
+    def add_headers(self, response, stats):
+        """
+        Return the query stats in response headers.
+
+        Args:
+            response (HttpResponse): The response.
+            stats (QueryStats): The query stats of the request.
+        """
+        slowest_sql = ' '.join(stats.slowest_sql.split())[:SQL_HEADER_LENGTH]
+        response['X-DB-Query-Count'] = str(stats.count)
+        response['X-DB-Time-Ms'] = f'{stats.duration * 1000:.1f}'
+        response['X-DB-Slowest-Ms'] = f'{stats.slowest * 1000:.1f}'
+        response['X-DB-Slowest-SQL'] = slowest_sql.encode('ascii', 'replace').decode()
+
+    def log(self, request, response, stats):
+        """
+        Log the query stats with the URL name of the request.
+
+        Args:
+            request (HttpRequest): The request.
+            response (HttpResponse): The response.
+            stats (QueryStats): The query stats of the request.
+        """
+        match = request.resolver_match
+        record = {
+            'view': match.view_name if match else request.path,
+            'method': request.method,
+            'status': response.status_code,
+            'queries': stats.count,
+            'db_ms': round(stats.duration * 1000, 1),
+            'slowest_ms': round(stats.slowest * 1000, 1),
+            'slowest_sql': stats.slowest_sql,
+        }
+        over_budget = (
+            stats.count > settings.QUERY_WARN_COUNT
+            or record['db_ms'] > settings.QUERY_WARN_MS
+        )
+        logger.log(
+            logging.WARNING if over_budget else logging.INFO,
+            'view=%(view)s method=%(method)s status=%(status)s queries=%(queries)d '
+            'db_ms=%(db_ms).1f slowest_ms=%(slowest_ms).1f',
+            record,
+            extra=record,
+        )
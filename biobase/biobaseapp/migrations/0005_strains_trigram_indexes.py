@@ -0,0 +1,27 @@
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+from biobaseapp.postgres import PostgresOnly
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('biobaseapp', '0004_rename_started_by_cultivationplanning_created_by_and_more'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        PostgresOnly(migrations.RunSQL(
+            sql='CREATE INDEX CONCURRENTLY IF NOT EXISTS strains_name_trgm '
+                'ON biobaseapp_strains USING gin ((UPPER("name"::text)) gin_trgm_ops);',
+            reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS strains_name_trgm;',
+        )),
+        PostgresOnly(migrations.RunSQL(
+            sql='CREATE INDEX CONCURRENTLY IF NOT EXISTS strains_uin_trgm '
+                'ON biobaseapp_strains USING gin ((UPPER("UIN"::text)) gin_trgm_ops);',
+            reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS strains_uin_trgm;',
+        )),
+    ]
@@ -0,0 +1,57 @@
+import django.contrib.postgres.search
+from django.db import migrations
+
+from biobaseapp.postgres import PostgresOnly
+
+SEARCH_VECTOR_FUNCTION = """
+CREATE OR REPLACE FUNCTION biobaseapp_strains_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('simple', coalesce(NEW.mutations, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(NEW.transformations, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(NEW.pedigree, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+SEARCH_VECTOR_TRIGGER = """
+CREATE TRIGGER strains_search_vector_update
+BEFORE INSERT OR UPDATE OF pedigree, mutations, transformations
+ON biobaseapp_strains
+FOR EACH ROW EXECUTE FUNCTION biobaseapp_strains_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('biobaseapp', '0005_strains_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='strains',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        PostgresOnly(migrations.RunSQL(
+            sql=SEARCH_VECTOR_FUNCTION,
+            reverse_sql='DROP FUNCTION IF EXISTS biobaseapp_strains_search_vector_update();',
+        )),
+        PostgresOnly(migrations.RunSQL(
+            sql=SEARCH_VECTOR_TRIGGER,
+            reverse_sql='DROP TRIGGER IF EXISTS strains_search_vector_update ON biobaseapp_strains;',
+        )),
+        PostgresOnly(migrations.RunSQL(
+            sql='UPDATE biobaseapp_strains SET mutations = mutations;',
+            reverse_sql=migrations.RunSQL.noop,
+        )),
+        PostgresOnly(migrations.RunSQL(
+            sql='CREATE INDEX CONCURRENTLY IF NOT EXISTS strains_search_vector_gin '
+                'ON biobaseapp_strains USING gin (search_vector);',
+            reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS strains_search_vector_gin;',
+        )),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations
+
+from biobaseapp.postgres import PostgresOnly
+
+# Index name, table, column of the labels searched by the object pickers.
+LABEL_INDEXES = (
+    ('strainprocessing_description_trgm', 'biobaseapp_strainprocessing', 'description'),
+    ('substanceidentification_results_trgm', 'biobaseapp_substanceidentification', 'results'),
+    ('experiments_results_trgm', 'biobaseapp_experiments', 'results'),
+    ('cultivationplanning_status_trgm', 'biobaseapp_cultivationplanning', 'status'),
+    ('projects_project_name_trgm', 'biobaseapp_projects', 'project_name'),
+    ('customuser_username_trgm', 'biobaseapp_customuser', 'username'),
+)
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('biobaseapp', '0006_strains_search_vector'),
+    ]
+
+    operations = [
+        PostgresOnly(migrations.RunSQL(
+            sql=f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} '
+                f'ON {table} USING gin ((UPPER("{column}"::text)) gin_trgm_ops);',
+            reverse_sql=f'DROP INDEX CONCURRENTLY IF EXISTS {name};',
+        ))
+        for name, table, column in LABEL_INDEXES
+    ]
@@ -0,0 +1,49 @@
+from django.db import migrations, models
+
+from biobaseapp.postgres import AddIndexConcurrentlyOnPostgres, PostgresOnly
+
+# Model, index name prefix, date column of the (created_by, date) indexes.
+CREATOR_DATE_INDEXES = (
+    ('strains', 'strains', 'creation_date'),
+    ('strainprocessing', 'strainproc', 'processing_date'),
+    ('substanceidentification', 'substanceid', 'identification_date'),
+    ('experiments', 'experiments', 'start_date'),
+    ('cultivationplanning', 'cultivation', 'planning_date'),
+    ('projects', 'projects', 'start_date'),
+    ('cultures', 'cultures', 'planning_date'),
+)
+
+# Index name, table, column of the date ranges filtered by the list views.
+# Rows are mostly appended in date order, so a BRIN index of a few pages
+# replaces a B-tree of the whole column.
+BRIN_INDEXES = (
+    ('experiments_start_date_brin', 'biobaseapp_experiments', 'start_date'),
+    ('cultivation_planning_date_brin', 'biobaseapp_cultivationplanning', 'planning_date'),
+    ('strainproc_processing_date_brin', 'biobaseapp_strainprocessing', 'processing_date'),
+    ('substanceid_identification_date_brin', 'biobaseapp_substanceidentification',
+     'identification_date'),
+)
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('biobaseapp', '0008_updated_at'),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyOnPostgres(
+            model_name=model_name,
+            index=models.Index(fields=['created_by', column], name=f'{prefix}_creator_date_idx'),
+        )
+        for model_name, prefix, column in CREATOR_DATE_INDEXES
+    ] + [
+        PostgresOnly(migrations.RunSQL(
+            sql=f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} '
+                f'ON {table} USING brin ("{column}") WITH (autosummarize = on);',
+            reverse_sql=f'DROP INDEX CONCURRENTLY IF EXISTS {name};',
+        ))
+        for name, table, column in BRIN_INDEXES
+    ]
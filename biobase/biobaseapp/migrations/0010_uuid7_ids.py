@@ -0,0 +1,47 @@
+import biobaseapp.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('biobaseapp', '0009_creator_date_and_brin_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='cultivationplanning',
+            name='id',
+            field=models.UUIDField(default=biobaseapp.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='cultures',
+            name='id',
+            field=models.UUIDField(default=biobaseapp.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='experiments',
+            name='id',
+            field=models.UUIDField(default=biobaseapp.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='projects',
+            name='id',
+            field=models.UUIDField(default=biobaseapp.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='strainprocessing',
+            name='id',
+            field=models.UUIDField(default=biobaseapp.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='strains',
+            name='id',
+            field=models.UUIDField(default=biobaseapp.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='substanceidentification',
+            name='id',
+            field=models.UUIDField(default=biobaseapp.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
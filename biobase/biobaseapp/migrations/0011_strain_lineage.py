@@ -0,0 +1,36 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('biobaseapp', '0010_uuid7_ids'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='strains',
+            name='parent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='children', to='biobaseapp.strains'),
+        ),
+        migrations.CreateModel(
+            name='StrainLineage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveIntegerField()),
+                ('ancestor', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='descendant_links', to='biobaseapp.strains')),
+                ('descendant', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='ancestor_links', to='biobaseapp.strains')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['descendant', 'depth'], name='strainlineage_descendant_idx')],
+                'constraints': [models.UniqueConstraint(fields=('ancestor', 'descendant'), name='strainlineage_unique_pair')],
+            },
+        ),
+        # Every strain is its own ancestor at depth 0.
+        migrations.RunSQL(
+            'INSERT INTO "biobaseapp_strainlineage" ("ancestor_id", "descendant_id", "depth") '
+            'SELECT "id", "id", 0 FROM "biobaseapp_strains"',
+            migrations.RunSQL.noop,
+        ),
+    ]
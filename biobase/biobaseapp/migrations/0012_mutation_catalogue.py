@@ -0,0 +1,31 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('biobaseapp', '0011_strain_lineage'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Mutation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='StrainMutation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mutation', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='strain_links', to='biobaseapp.mutation')),
+                ('strain', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='mutation_links', to='biobaseapp.strains')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['mutation', 'strain'], name='strainmutation_mutation_idx')],
+                'constraints': [models.UniqueConstraint(fields=('strain', 'mutation'), name='strainmutation_unique_pair')],
+            },
+        ),
+    ]
@@ -0,0 +1,268 @@
+"""Mixins for the biobaseapp views and REST API viewsets."""
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from .bulk import BulkCreateMixin
+from .conditional import (collection_validators, instance_validators,
+                          not_modified, set_validators)
+from .export import export_response
+from .pagination import EstimatedCountPaginator, set_count_headers
+from .serializers import FIELDS, expanded, requested
+
+ID = 'id'
+UPDATED = 'updated_at'
+
+
+class ExportMixin:
+    """
+    Add ``GET <collection>/export/csv/`` and ``GET <collection>/export/ndjson/`` actions.
+
+    The whole (filtered) collection is streamed without pagination.
+    """
+
+    @action(detail=False, url_path='export/(?P<export_format>csv|ndjson)')
+    def export(self, request, export_format):
+        """
+        Stream every object of the collection.
+
+        Args:
+            request: request object
+            export_format: ``csv`` or ``ndjson``
+
+        Returns:
+            StreamingHttpResponse: The exported rows.
+        """
+        return export_response(self.filter_queryset(self.get_queryset()), export_format)
+
+
+class ConditionalGetMixin:
+    """
+    Answer ``list`` and ``retrieve`` with 304 when the client's copy is current.
+
+    The validators come from ``updated_at``: a record is checked before it is
+    serialized, a collection with one aggregate query, see ``conditional.py``.
+    Expanded related records count as part of the collection.
+
+    Attributes:
+        collection_size (tuple): The size of the listed collection and
+            whether it is an estimate, for the paginator to report.
+    """
+
+    def list(self, request, *args, **kwargs):
+        """
+        List the records unless the client has the current version.
+
+        Args:
+            request (Request): The request.
+            args: positional arguments.
+            kwargs: keyword arguments.
+
+        Returns:
+            Response: The page of records, or 304.
+        """
+        etag, last_modified, self.collection_size = collection_validators(
+            self.filter_queryset(self.get_queryset()), request, self.versioned_relations(),
+        )
+        response = not_modified(request, etag, last_modified)
+        if response is None:
+            response = set_validators(
+                super().list(request, *args, **kwargs), etag, last_modified,
+            )
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Return a record unless the client has the current version.
+
+        Args:
+            request (Request): The request.
+            args: positional arguments.
+            kwargs: keyword arguments.
+
+        Returns:
+            Response: The record, or 304.
+        """
+        instance = self.get_object()
+        etag, last_modified = instance_validators(instance, self.versioned_relations())
+        response = not_modified(request, etag, last_modified)
+        if response is None:
+            response = set_validators(
+                Response(self.get_serializer(instance).data), etag, last_modified,
+            )
+        return response
+
+    def versioned_relations(self):
+        """
+        Get the expanded foreign keys whose records have an ``updated_at``.
+
+        Returns:
+            list: The foreign key names.
+        """
+        meta = self.get_queryset().query.get_meta()
+        related_models = {
+            name: meta.get_field(name).related_model
+            for name in expanded(self.request, self.get_serializer_class())
+        }
+        return [
+            name
+            for name, related_model in related_models.items()
+            if getattr(related_model, UPDATED, None) is not None
+        ]
+
+
+class ConditionalListMixin:
+    """
+    Answer GET on a ``ListView`` with 304 when the client's page is current.
+
+    Attributes:
+        conditional_related (tuple): Foreign keys shown on the page, see
+            ``conditional.collection_validators``.
+        collection_size (tuple): The size of the listed collection and
+            whether it is an estimate, for the paginator to reuse.
+    """
+
+    conditional_related = ()
+
+    def get(self, request, *args, **kwargs):
+        """
+        Render the list unless the client has the current version.
+
+        Args:
+            request (HttpRequest): The request.
+            args: positional arguments.
+            kwargs: keyword arguments.
+
+        Returns:
+            HttpResponse: The rendered page, or 304.
+        """
+        etag, last_modified, self.collection_size = collection_validators(
+            self.get_queryset(), request, self.conditional_related,
+        )
+        response = not_modified(request, etag, last_modified)
+        if response is None:
+            response = set_validators(
+                super().get(request, *args, **kwargs), etag, last_modified,
+            )
+        return response
+
+
+class EstimatedCountMixin:
+    """
+    Paginate a ``ListView`` with ``EstimatedCountPaginator``.
+
+    The page shows the number of pages as approximate when the count is an
+    estimate, and the response reports it in ``X-Total-Count`` and
+    ``X-Total-Count-Estimated``.
+    """
+
+    paginator_class = EstimatedCountPaginator
+
+    def get_paginator(self, queryset, per_page, **kwargs):
+        """
+        Create the paginator with the size the validators already found.
+
+        Args:
+            queryset (QuerySet): The records.
+            per_page (int): The number of records per page.
+            kwargs: keyword arguments of the paginator, such as ``orphans``.
+
+        Returns:
+            EstimatedCountPaginator: The paginator.
+        """
+        return super().get_paginator(
+            queryset, per_page, size=getattr(self, 'collection_size', None), **kwargs,
+        )
+
+    def render_to_response(self, context, **response_kwargs):
+        """
+        Render the page with the count headers.
+
+        Args:
+            context (dict): The template context.
+            response_kwargs: keyword arguments of the response.
+
+        Returns:
+            HttpResponse: The response.
+        """
+        response = super().render_to_response(context, **response_kwargs)
+        paginator = context.get('paginator')
+        if paginator is not None:
+            set_count_headers(response, paginator.count, paginator.estimated)
+        return response
+
+
+class RelatedLoadingMixin:
+    """
+    Load the relations a view declares together with its records.
+
+    Views list the foreign keys they render in ``list_select_related`` and
+    the reverse or many-to-many relations in ``list_prefetch_related``, so
+    a page costs the same number of queries whatever its size.
+
+    Attributes:
+        list_select_related (tuple): Relations joined into the query.
+        list_prefetch_related (tuple): Relations loaded by one extra query each.
+    """
+
+    list_select_related = ()
+    list_prefetch_related = ()
+
+    def get_queryset(self):
+        """
+        Add the declared relations to the queryset.
+
+        Returns:
+            QuerySet: The queryset.
+        """
+        queryset = super().get_queryset()
+        if self.list_select_related:
+            queryset = queryset.select_related(*self.list_select_related)
+        if self.list_prefetch_related:
+            queryset = queryset.prefetch_related(*self.list_prefetch_related)
+        return queryset
+
+
+class SparseFieldsMixin:
+    """
+    Load only what ``?fields=`` and ``?expand=`` ask the serializer for.
+
+    Requested columns are selected with ``only()`` and expanded foreign keys
+    are joined with ``select_related()``; ``id`` and ``updated_at`` are always
+    loaded for pagination and the conditional GET validators, and relations
+    declared for ``RelatedLoadingMixin`` stay loadable.
+    """
+
+    def get_queryset(self):
+        """
+        Restrict the queryset to the requested columns and relations.
+
+        Returns:
+            QuerySet: The queryset.
+        """
+        queryset = super().get_queryset()
+        fields = requested(self.request, FIELDS)
+        expand = expanded(self.request, self.get_serializer_class())
+        if expand:
+            queryset = queryset.select_related(*expand)
+        if fields:
+            columns = {field.name for field in queryset.query.get_meta().concrete_fields}
+            queryset = queryset.only(
+                ID,
+                UPDATED,
+                *expand,
+                *getattr(self, 'list_select_related', ()),
+                *(name for name in fields if name in columns),
+            )
+        return queryset
+
+
+class ListPageMixin(ConditionalListMixin, EstimatedCountMixin, RelatedLoadingMixin):
+    """The conditional GET, estimated count and related loading of a list page."""
+
+
+class APIReadMixin(ConditionalGetMixin, SparseFieldsMixin, RelatedLoadingMixin):
+    """The conditional GET, sparse fields and related loading of an API viewset."""
+
+
+class APIActionsMixin(BulkCreateMixin, ExportMixin):
+    """The bulk create and export actions of an API viewset."""
@@ -1,58 +1,33 @@
 """Models for biobaseapp."""
-import datetime
-import uuid
-
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.search import SearchVectorField
 from django.core.exceptions import ValidationError
 from django.db import models
-from django.utils import timezone
+
+from .ids import uuid7
+from .validators import (validate_date, validate_date_future,
+                         validate_end_date_not_before_start_date)
 
 MAX_255 = 255
 MAX_100 = 100
 MAX_50 = 50
 
 
-def validate_date_future(current):
-    """
-    Validate if the given date is in the future.
-
-    Args:
-        current: A date to be validated.
-
-    Raises:
-        ValidationError: If the date is in the future.
-    """
-    if current > timezone.now().date():
-        raise ValidationError('Date cannot be in the future.')
-
-
-def validate_end_date_not_before_start_date(current, start_date):
+def creator_date_index(prefix, date_field):
     """
-    Validate that the end date is not before the start date.
-
-    Args:
-        current (datetime.date): The current date.
-        start_date (datetime.date): The start date.
-
-    Raises:
-        ValidationError: If the end date is before the start date.
-    """
-    if current < start_date:
-        raise ValidationError('End date cannot be before start date.')
+    Build the index of a user's records ordered by date.
 
-
-def validate_date(current):
-    """
-    Validate if the given date is of type datetime.date.
+    Serves the ``created_by`` filters with date ordering or ranges, such as
+    the recent items of the main menu.
 
     Args:
-        current: The date to be validated.
+        prefix (str): Short name of the model for the index name.
+        date_field (str): The date field.
 
-    Raises:
-        ValidationError: If the date is not of type datetime.date.
+    Returns:
+        Index: The ``(created_by, <date>)`` B-tree index.
     """
-    if not isinstance(current, datetime.date):
-        raise ValidationError('Invalid date.')
+    return models.Index(fields=['created_by', date_field], name=f'{prefix}_creator_date_idx')
 
 
 class CustomUser(AbstractUser):
@@ -81,7 +56,7 @@ class Strains(models.Model):
     Model for storing strains information.
 
     Attributes:
-        id (UUIDField): The unique identifier for the strain.
+        id (UUIDField): The time-ordered unique identifier for the strain.
         UIN (CharField): The unique identifier number for the strain.
         name (CharField): The name of the strain.
         pedigree (TextField): The information about the strain's pedigree.
@@ -89,9 +64,12 @@ class Strains(models.Model):
         transformations (TextField): The information about the strain's transformations.
         creation_date (DateField): The date when the strain was created.
         created_by (ForeignKey): The user who created the strain.
+        search_vector (SearchVectorField): Genotype full-text index, kept by a PostgreSQL trigger.
+        updated_at (DateTimeField): When the strain was last changed.
+        parent (ForeignKey): The strain this strain was derived from, see ``StrainLineage``.
     """
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     UIN = models.CharField(max_length=MAX_255)
     name = models.CharField(max_length=MAX_255)
     pedigree = models.TextField()
@@ -99,6 +77,14 @@ class Strains(models.Model):
     transformations = models.TextField()
     creation_date = models.DateField(validators=[validate_date, validate_date_future])
     created_by = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
+    search_vector = SearchVectorField(null=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    parent = models.ForeignKey(
+        'self', null=True, blank=True, on_delete=models.SET_NULL, related_name='children',
+    )
+
+    class Meta:
+        indexes = [creator_date_index('strains', 'creation_date')]
 
     def __str__(self) -> str:
         """
@@ -109,24 +95,42 @@ class Strains(models.Model):
         """
         return f'{self.UIN}'
 
+    def clean(self):
+        """
+        Validate the parent of the strain.
+
+        Raises:
+            ValidationError: If the parent is the strain itself or one of its descendants.
+        """
+        if self.parent_id is None or self._state.adding:
+            return
+        descendants = self.descendant_links.filter(descendant_id=self.parent_id)
+        if self.parent_id == self.pk or descendants.exists():
+            raise ValidationError({'parent': 'A strain cannot descend from itself.'})
+
 
 class StrainProcessing(models.Model):
     """
     Model for storing strain processing information.
 
     Attributes:
-        id (UUIDField): The unique identifier for the strain processing.
+        id (UUIDField): The time-ordered unique identifier for the strain processing.
         strain_id (ForeignKey): The related strain.
         processing_date (DateField): The date of the processing.
         description (TextField): The description of the processing.
         created_by (ForeignKey): The user who created the processing.
+        updated_at (DateTimeField): When the processing was last changed.
     """
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     strain_id = models.ForeignKey(Strains, on_delete=models.CASCADE)
     processing_date = models.DateField(validators=[validate_date, validate_date_future])
     description = models.TextField()
     created_by = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [creator_date_index('strainproc', 'processing_date')]
 
 
 class SubstanceIdentification(models.Model):
@@ -134,18 +138,23 @@ class SubstanceIdentification(models.Model):
     Model for storing substance identification information.
 
     Attributes:
-        id (UUIDField): The unique identifier for the substance identification.
+        id (UUIDField): The time-ordered unique identifier for the substance identification.
         strain_id (ForeignKey): The related strain.
         identification_date (DateField): The date of the identification.
         results (TextField): The results of the identification.
         created_by (ForeignKey): The user who created the identification.
+        updated_at (DateTimeField): When the identification was last changed.
     """
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     strain_id = models.ForeignKey(Strains, on_delete=models.CASCADE)
     identification_date = models.DateField(validators=[validate_date, validate_date_future])
     results = models.TextField()
     created_by = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [creator_date_index('substanceid', 'identification_date')]
 
 
 class Experiments(models.Model):
@@ -153,22 +162,27 @@ class Experiments(models.Model):
     Model for storing experiments information.
 
     Attributes:
-        id (UUIDField): The unique identifier for the experiment.
+        id (UUIDField): The time-ordered unique identifier for the experiment.
         strain_UIN (ForeignKey): The related strain.
         start_date (DateField): The start date of the experiment.
         end_date (DateField): The end date of the experiment.
         growth_medium (TextField): The growth medium used in the experiment.
         results (TextField): The results of the experiment.
         created_by (ForeignKey): The user who created the experiment.
+        updated_at (DateTimeField): When the experiment was last changed.
     """
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     strain_UIN = models.ForeignKey(Strains, on_delete=models.CASCADE)
     start_date = models.DateField(validators=[validate_date, validate_date_future])
     end_date = models.DateField(validators=[validate_date])
     growth_medium = models.TextField()
     results = models.TextField()
     created_by = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [creator_date_index('experiments', 'start_date')]
 
     def clean(self):
         """
@@ -186,22 +200,27 @@ class CultivationPlanning(models.Model):
     Model for storing cultivation planning information.
 
     Attributes:
-        id (UUIDField): The unique identifier for the planning.
+        id (UUIDField): The time-ordered unique identifier for the planning.
         strain_ID (ForeignKey): The related strain.
         planning_date (DateField): The date of the planning.
         completion_date (DateField): The date of the completion.
         growth_medium (TextField): The growth medium used in the planning.
         status (TextField): The status of the planning.
         created_by (ForeignKey): The user who created the planning.
+        updated_at (DateTimeField): When the planning was last changed.
     """
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     strain_ID = models.ForeignKey(Strains, on_delete=models.CASCADE)
     planning_date = models.DateField(validators=[validate_date, validate_date_future])
     completion_date = models.DateField(validators=[validate_date])
     growth_medium = models.TextField()
     status = models.TextField()
     created_by = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [creator_date_index('cultivation', 'planning_date')]
 
     def clean(self):
         """
@@ -219,20 +238,25 @@ class Projects(models.Model):
     Model for storing projects information.
 
     Attributes:
-        id (UUIDField): The unique identifier for the project.
+        id (UUIDField): The time-ordered unique identifier for the project.
         project_name (CharField): The name of the project.
         start_date (DateField): The start date of the project.
         end_date (DateField): The end date of the project.
         results (TextField): The results of the project.
         created_by (ForeignKey): The user who created the project.
+        updated_at (DateTimeField): When the project was last changed.
     """
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     project_name = models.CharField(max_length=MAX_50)
     start_date = models.DateField(validators=[validate_date_future, validate_date])
     end_date = models.DateField(validators=[validate_date], null=True)
     results = models.TextField()
     created_by = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [creator_date_index('projects', 'start_date')]
 
     def __str__(self) -> str:
         """
@@ -259,15 +283,126 @@ class Cultures(models.Model):
     Model for storing cultures information.
 
     Attributes:
-        id (UUIDField): The unique identifier for the culture.
+        id (UUIDField): The time-ordered unique identifier for the culture.
         project_id (ForeignKey): The related project.
         planning_date (DateField): The date of the planning.
         results (TextField): The results of the cultivation.
         created_by (ForeignKey): The user who created the culture.
+        updated_at (DateTimeField): When the culture was last changed.
     """
 
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     project_id = models.ForeignKey(Projects, on_delete=models.CASCADE)
     planning_date = models.DateField(validators=[validate_date_future, validate_date])
     results = models.TextField()
     created_by = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [creator_date_index('cultures', 'planning_date')]
+
+
+class StrainLineage(models.Model):
+    """
+    Closure table of the strain pedigree.
+
+    Holds one row for every pair of a strain and one of its ancestors,
+    including the strain itself at depth 0, so ancestors, descendants and
+    common ancestors are each read with one indexed query whatever the
+    depth of the tree. The rows are maintained by ``lineage.py`` from
+    ``Strains.parent``.
+
+    Attributes:
+        ancestor (ForeignKey): The ancestor strain.
+        descendant (ForeignKey): The descendant strain.
+        depth (PositiveIntegerField): Number of generations between them.
+    """
+
+    # The foreign keys are covered by the composite indexes below.
+    ancestor = models.ForeignKey(
+        Strains, on_delete=models.CASCADE, related_name='descendant_links', db_index=False,
+    )
+    descendant = models.ForeignKey(
+        Strains, on_delete=models.CASCADE, related_name='ancestor_links', db_index=False,
+    )
+    depth = models.PositiveIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['ancestor', 'descendant'], name='strainlineage_unique_pair',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['descendant', 'depth'], name='strainlineage_descendant_idx'),
+        ]
+
+    def __str__(self) -> str:
+        """
+        Return a string representation of the link.
+
+        Returns:
+            str: The string representation of the link.
+        """
+        return f'{self.ancestor_id} -> {self.descendant_id} ({self.depth})'
+
+
+class Mutation(models.Model):
+    """
+    Catalogue of the mutations named in ``Strains.mutations``.
+
+    Attributes:
+        name (CharField): The normalized mutation, e.g. ``ΔlacZ`` or ``recA1``.
+    """
+
+    name = models.CharField(max_length=MAX_255, unique=True)
+
+    def __str__(self) -> str:
+        """
+        Return a string representation of the mutation.
+
+        Returns:
+            str: The string representation of the mutation.
+        """
+        return self.name
+
+
+class StrainMutation(models.Model):
+    """
+    Link between a strain and a mutation it carries.
+
+    Parsed from ``Strains.mutations`` by ``mutations.py``. The two composite
+    indexes let strains carrying a set of mutations be found by index
+    lookups per mutation instead of a scan of the genotype text.
+
+    Attributes:
+        strain (ForeignKey): The strain.
+        mutation (ForeignKey): The mutation.
+    """
+
+    # The foreign keys are covered by the composite indexes below.
+    strain = models.ForeignKey(
+        Strains, on_delete=models.CASCADE, related_name='mutation_links', db_index=False,
+    )
+    mutation = models.ForeignKey(
+        Mutation, on_delete=models.CASCADE, related_name='strain_links', db_index=False,
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['strain', 'mutation'], name='strainmutation_unique_pair',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['mutation', 'strain'], name='strainmutation_mutation_idx'),
+        ]
+
+    def __str__(self) -> str:
+        """
+        Return a string representation of the link.
+
+        Returns:
+            str: The string representation of the link.
+        """
+        return f'{self.strain_id} carries {self.mutation_id}'
@@ -0,0 +1,179 @@
+"""Mutation catalogue parsed from the genotype text of strains."""
+import re
+import unicodedata
+
+from .models import MAX_255, Mutation, StrainMutation
+from .pedigree import WILD_TYPE
+
+BATCH_SIZE = 1000
+SEPARATORS = re.compile(r'[\s,;]+')
+# Words standing for "no mutation" rather than naming one.
+PLACEHOLDERS = frozenset(('none', '-', '—', 'n/a', 'na'))
+
+
+def normalize(name):
+    """
+    Normalize the spelling of one mutation.
+
+    Args:
+        name (str): The mutation as written.
+
+    Returns:
+        str: The name in Unicode NFC form, without surrounding punctuation.
+    """
+    return unicodedata.normalize('NFC', name).strip().strip('.')
+
+
+def mutation_names(text):
+    """
+    Split the genotype text of a strain into mutations.
+
+    Mutations are separated by commas, semicolons or spaces, as in
+    ``ΔlacZ, recA1`` or ``ΔlacZ recA1``. Wild type markers, placeholders
+    such as ``none`` and words too long to be a mutation are left out.
+
+    Args:
+        text (str): The ``mutations`` field.
+
+    Returns:
+        list: The normalized mutations, without duplicates, in text order.
+    """
+    names = (normalize(token) for token in SEPARATORS.split(WILD_TYPE.sub(' ', text or '')))
+    return list(dict.fromkeys(
+        name for name in names
+        if name and name.lower() not in PLACEHOLDERS and len(name) <= MAX_255
+    ))
+
+
+def mutation_ids(names, using='default'):
+    """
+    Get the catalogue ids of mutations, adding the missing ones.
+
+    Args:
+        names (set): Normalized mutations.
+        using (str): The database alias.
+
+    Returns:
+        dict: Ids by name.
+    """
+    catalogue = Mutation.objects.using(using)
+    ids = dict(catalogue.filter(name__in=names).values_list('name', 'pk'))
+    missing = set(names) - ids.keys()
+    if missing:
+        # Concurrent writers may add the same names; keep theirs.
+        catalogue.bulk_create([Mutation(name=name) for name in missing], ignore_conflicts=True)
+        ids.update(catalogue.filter(name__in=missing).values_list('name', 'pk'))
+    return ids
+
+
+def sync_mutations(strains, using='default', replace=True):
+    """
+    Make the mutation links of strains match their genotype text.
+
+    Each batch of ``BATCH_SIZE`` strains takes one query to look up the
+    catalogue, one to read the current links and one to insert the new
+    ones, plus one to delete stale links and two to add unknown mutations
+    when needed.
+
+    Args:
+        strains (Iterable): The strains, with ``mutations`` loaded.
+        using (str): The database alias.
+        replace (bool): Whether the strains may already have links to replace.
+
+    Returns:
+        int: Number of inserted links.
+    """
+    inserted = 0
+    batch = []
+    for strain in strains:
+        batch.append(strain)
+        if len(batch) == BATCH_SIZE:
+            inserted += sync_batch(batch, using, replace)
+            batch = []
+    if batch:
+        inserted += sync_batch(batch, using, replace)
+    return inserted
+
+
+def sync_batch(strains, using, replace):
+    """
+    Sync the mutation links of one batch, see ``sync_mutations``.
+
+    Args:
+        strains (list): The strains.
+        using (str): The database alias.
+        replace (bool): Whether the strains may already have links.
+
+    Returns:
+        int: Number of inserted links.
+    """
+    wanted = {strain.pk: mutation_names(strain.mutations) for strain in strains}
+    names = {name for strain_names in wanted.values() for name in strain_names}
+    ids = mutation_ids(names, using) if names else {}
+    pairs = {(pk, ids[name]) for pk, strain_names in wanted.items() for name in strain_names}
+    if replace:
+        pairs -= delete_stale(wanted, pairs, using)
+    StrainMutation.objects.using(using).bulk_create(
+        [StrainMutation(strain_id=strain, mutation_id=mutation) for strain, mutation in pairs],
+        batch_size=BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+    return len(pairs)
+
+
+def delete_stale(strains, pairs, using):
+    """
+    Delete the links of strains to mutations their text no longer names.
+
+    Args:
+        strains (Collection): Ids of the strains.
+        pairs (set): The wanted links, as strain and mutation ids.
+        using (str): The database alias.
+
+    Returns:
+        set: The wanted links that already exist.
+    """
+    links = StrainMutation.objects.using(using)
+    current = {
+        (strain, mutation): pk
+        for pk, strain, mutation in links.filter(strain__in=strains).values_list(
+            'pk', 'strain', 'mutation',
+        )
+    }
+    stale = [pk for pair, pk in current.items() if pair not in pairs]
+    if stale:
+        links.filter(pk__in=stale).delete()
+    return set(current)
+
+
+def carrying(queryset, every=(), either=()):
+    """
+    Filter strains by the mutations they carry.
+
+    The names are resolved to catalogue ids with one query. Each mutation
+    of ``every`` adds a join on the ``(mutation, strain)`` index, so the
+    database intersects the strains of each mutation rather than reading
+    genotype text; ``either`` is one semi-join on the same index.
+
+    Args:
+        queryset (QuerySet): Strains to filter.
+        every (Iterable): Mutations all of which a strain must carry.
+        either (Iterable): Mutations at least one of which a strain must carry.
+
+    Returns:
+        QuerySet: The matching strains, empty if a mutation of ``every`` or
+        all of ``either`` are unknown.
+    """
+    every = {normalize(name) for name in every}
+    either = {normalize(name) for name in either}
+    catalogue = Mutation.objects.using(queryset.db).filter(name__in=every | either)
+    ids = dict(catalogue.values_list('name', 'pk'))
+    if every - ids.keys() or (either and not either & ids.keys()):
+        return queryset.none()
+    for mutation in every:
+        queryset = queryset.filter(mutation_links__mutation_id=ids[mutation])
+    if either:
+        queryset = queryset.filter(pk__in=StrainMutation.objects.using(queryset.db).filter(
+            mutation_id__in=[ids[name] for name in either if name in ids],
+        ).values('strain'))
+    return queryset
@@ -0,0 +1,393 @@
+"""Pagination classes for the biobaseapp list views and REST API."""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.paginator import EmptyPage, Page, Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+
+from .ids import ORDER, id_ordering
+from .postgres import estimate_count, is_postgres
+
+ID = 'id'
+TOTAL_COUNT = 'X-Total-Count'
+TOTAL_COUNT_ESTIMATED = 'X-Total-Count-Estimated'
+COUNT = 'count'
+TRUE = 'true'
+
+
+def planner_estimate(queryset):
+    """
+    Estimate the size of a queryset where the database can.
+
+    Args:
+        queryset (QuerySet): The records to count.
+
+    Returns:
+        int | None: The estimate, or ``None`` on databases other than
+        PostgreSQL and for tables never analyzed.
+    """
+    connection = connections[queryset.db]
+    return estimate_count(connection, queryset) if is_postgres(connection) else None
+
+
+def large_estimate(queryset):
+    """
+    Estimate the size of a queryset too large to count.
+
+    Args:
+        queryset (QuerySet): The records to count.
+
+    Returns:
+        int | None: The planner estimate if it reaches
+        ``COUNT_ESTIMATE_THRESHOLD``, otherwise ``None``.
+    """
+    estimate = planner_estimate(queryset)
+    if estimate is not None and estimate >= settings.COUNT_ESTIMATE_THRESHOLD:
+        return estimate
+    return None
+
+
+def estimated_count(queryset):
+    """
+    Count a queryset, exactly if it is small and from the planner otherwise.
+
+    A ``COUNT(*)`` reads every matching row, which on a large table costs
+    more than the page itself. Collections the planner expects to hold at
+    least ``COUNT_ESTIMATE_THRESHOLD`` rows get the planner estimate
+    instead; smaller ones, and every collection on other databases, are
+    counted.
+
+    Args:
+        queryset (QuerySet): The records to count.
+
+    Returns:
+        tuple: The count and whether it is an estimate.
+    """
+    estimate = large_estimate(queryset)
+    if estimate is not None:
+        return estimate, True
+    return queryset.count(), False
+
+
+async def aestimated_count(queryset):
+    """
+    Count a queryset like ``estimated_count`` on the async ORM.
+
+    Args:
+        queryset (QuerySet): The records to count.
+
+    Returns:
+        tuple: The count and whether it is an estimate.
+    """
+    estimate = await sync_to_async(large_estimate)(queryset)
+    if estimate is not None:
+        return estimate, True
+    return await queryset.acount(), False
+
+
+def count_requested(params):
+    """
+    Check whether a client asked for the size of a keyset-paginated collection.
+
+    Keyset pages do not need a count, so it is only run on ``?count=true``.
+
+    Args:
+        params (QueryDict): The query parameters.
+
+    Returns:
+        bool: Whether to count.
+    """
+    return params.get(COUNT) == TRUE
+
+
+def set_count_headers(response, count, estimated):
+    """
+    Report the size of a collection in the response headers.
+
+    Args:
+        response (HttpResponse): The response.
+        count (int): The number of records.
+        estimated (bool): Whether the number is a planner estimate.
+
+    Returns:
+        HttpResponse: The response.
+    """
+    response[TOTAL_COUNT] = str(count)
+    response[TOTAL_COUNT_ESTIMATED] = TRUE if estimated else 'false'
+    return response
+
+
+class EstimatedPage(Page):
+    """
+    A page of a collection whose size is a planner estimate.
+
+    Whether another page follows is known from the rows read, not from the
+    estimated number of pages.
+    """
+
+    def __init__(self, object_list, number, paginator, more):
+        """
+        Create the page.
+
+        Args:
+            object_list (list): The records of the page.
+            number (int): The page number.
+            paginator (EstimatedCountPaginator): The paginator.
+            more (bool): Whether records follow the page.
+        """
+        super().__init__(object_list, number, paginator)
+        self.more = more
+
+    def has_next(self):
+        """
+        Check whether records follow the page.
+
+        Returns:
+            bool: Whether there is a next page.
+        """
+        return self.more
+
+    def end_index(self):
+        """
+        Get the 1-based index of the last record of the page.
+
+        Returns:
+            int: The index, from the records read rather than the estimate.
+        """
+        return (self.number - 1) * self.paginator.per_page + len(self.object_list)
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator of the list views that estimates the size of large collections.
+
+    With an estimated count the number of pages is approximate, so pages
+    after the estimated last one are not an error: they are served, empty
+    if the collection really ends before them. Each page of an estimated
+    collection reads one record more than it shows to know whether another
+    page follows, so records past an underestimate stay reachable.
+
+    Attributes:
+        estimated (bool): Whether ``count`` is a planner estimate.
+    """
+
+    estimated = False
+
+    def __init__(self, *args, size=None, **kwargs):
+        """
+        Create the paginator, with the size of the collection if it is known.
+
+        Args:
+            args: positional arguments of ``Paginator``.
+            size (tuple): The count and whether it is an estimate, as
+                returned by ``estimated_count``, to skip counting again.
+            kwargs: keyword arguments of ``Paginator``.
+        """
+        super().__init__(*args, **kwargs)
+        if size is not None:
+            self.count, self.estimated = size
+
+    @cached_property
+    def count(self):
+        """
+        Count the records, see ``estimated_count``.
+
+        Returns:
+            int: The number of records.
+        """
+        if not isinstance(self.object_list, QuerySet):
+            return super().count
+        count, self.estimated = estimated_count(self.object_list)
+        return count
+
+    def page(self, number):
+        """
+        Get a page, reading one record ahead for estimated collections.
+
+        Args:
+            number: The requested page number.
+
+        Returns:
+            Page: The page.
+        """
+        number = self.validate_number(number)
+        if not self.estimated:
+            return super().page(number)
+        return self.estimated_page(list(self.lookahead(number)), number)
+
+    async def apage(self, number):
+        """
+        Get a page like ``page`` on the async ORM.
+
+        Args:
+            number: The requested page number.
+
+        Returns:
+            Page: The page, with its records loaded.
+        """
+        number = self.validate_number(number)
+        if not self.estimated:
+            page = super().page(number)
+            page.object_list = [record async for record in page.object_list.aiterator()]
+            return page
+        records = [record async for record in self.lookahead(number).aiterator()]
+        return self.estimated_page(records, number)
+
+    def lookahead(self, number):
+        """
+        Select the records of a page and the first record after it.
+
+        Args:
+            number (int): The validated page number.
+
+        Returns:
+            QuerySet: The records.
+        """
+        bottom = (number - 1) * self.per_page
+        return self.object_list[bottom:bottom + self.per_page + 1]
+
+    def estimated_page(self, records, number):
+        """
+        Build a page from the records read by ``lookahead``.
+
+        Args:
+            records (list): The records of the page and the one after it.
+            number (int): The page number.
+
+        Returns:
+            EstimatedPage: The page.
+        """
+        return EstimatedPage(
+            records[:self.per_page], number, self, more=len(records) > self.per_page,
+        )
+
+    def validate_number(self, number):
+        """
+        Validate a page number, without an upper bound for estimated counts.
+
+        Args:
+            number: The requested page number.
+
+        Returns:
+            int: The page number.
+
+        Raises:
+            PageNotAnInteger: If the number is not an integer.
+            EmptyPage: If the page is out of range.
+        """
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            if not self.estimated or int(number) < 1:
+                raise
+            return int(number)
+
+
+class IdCursorPagination(CursorPagination):
+    """
+    Keyset pagination over the primary key.
+
+    Every page is fetched with ``WHERE id > <cursor> ORDER BY id LIMIT n``,
+    so the cost of a page does not depend on how deep into the table it is.
+    The default page size is ``API_PAGE_SIZE``; clients can change it with
+    ``?page_size=`` up to ``API_MAX_PAGE_SIZE``. Ids are time-ordered, so
+    pages run from the oldest record; ``?order=newest`` starts from the
+    newest one instead. With ``?count=true`` the size of the collection is
+    reported in ``X-Total-Count``, see ``estimated_count``; views that
+    already sized the collection pass it as ``collection_size``.
+    """
+
+    ordering = ID
+    page_size = settings.API_PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = settings.API_MAX_PAGE_SIZE
+    total = None
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Order by id in the direction of the ``order`` query parameter.
+
+        Args:
+            request (Request): The request.
+            queryset (QuerySet): The records to page.
+            view (APIView): The view.
+
+        Returns:
+            tuple: The ordering.
+        """
+        return (id_ordering(request.query_params.get(ORDER)),)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Load a page and count the collection if the client asked for it.
+
+        Args:
+            queryset (QuerySet): The records to page.
+            request (Request): The request.
+            view (APIView): The view.
+
+        Returns:
+            list: The records of the page.
+        """
+        if count_requested(request.query_params):
+            self.total = getattr(view, 'collection_size', None) or estimated_count(queryset)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        """
+        Return the page with the count headers if the collection was counted.
+
+        Args:
+            data (list): The serialized records.
+
+        Returns:
+            Response: The response.
+        """
+        response = super().get_paginated_response(data)
+        if self.total is not None:
+            set_count_headers(response, *self.total)
+        return response
+
+
+class RankedPagination(LimitOffsetPagination):
+    """
+    Limit/offset pagination for relevance-ordered results.
+
+    Search results are ordered by rank rather than by a unique key, so they
+    cannot be paged with a cursor; clients are expected to read the first
+    few pages only. ``count`` is estimated for large results, see
+    ``estimated_count``.
+    """
+
+    default_limit = settings.API_PAGE_SIZE
+    max_limit = settings.API_MAX_PAGE_SIZE
+    estimated = False
+
+    def get_count(self, queryset):
+        """
+        Count the results, see ``estimated_count``.
+
+        Args:
+            queryset (QuerySet): The results.
+
+        Returns:
+            int: The number of results.
+        """
+        count, self.estimated = estimated_count(queryset)
+        return count
+
+    def get_paginated_response(self, data):
+        """
+        Return the page with the count headers.
+
+        Args:
+            data (list): The serialized results.
+
+        Returns:
+            Response: The response.
+        """
+        return set_count_headers(
+            super().get_paginated_response(data), self.count, self.estimated,
+        )
@@ -0,0 +1,137 @@
+"""Strain parents read from the free-text pedigree, for backfilling ``Strains.parent``."""
+import re
+
+from django.db import transaction
+
+from .lineage import BATCH_SIZE, rebuild
+from .models import Strains
+
+WILD_TYPE = re.compile(r'\bwild[\s-]*type\b|\bwt\b', re.IGNORECASE)
+PEDIGREE_TOKEN = re.compile(r'[^\s,;:()\[\]]+')
+LINKED = 'linked'
+AMBIGUOUS = 'ambiguous'
+UNRESOLVED = 'unresolved'
+
+
+def pedigree_parent(text, own_uin, parents):
+    """
+    Find the parent strain named in a pedigree.
+
+    The pedigree is free text such as ``BB0000123``, ``derived from
+    BB0000123`` or ``BB0000123 x pUC19``; the first word that is the UIN of
+    exactly one other strain is the parent, so crosses are linked to the
+    first strain named.
+
+    Args:
+        text (str): The pedigree.
+        own_uin (str): UIN of the strain, which cannot be its own parent.
+        parents (dict): Strain ids by UIN, ``None`` for UINs of several strains.
+
+    Returns:
+        tuple: The parent id, or None, and ``LINKED``, ``AMBIGUOUS`` or
+        ``UNRESOLVED``.
+    """
+    ambiguous = False
+    for token in pedigree_tokens(text):
+        if token == own_uin or token not in parents:
+            continue
+        if parents[token] is None:
+            ambiguous = True
+            continue
+        return parents[token], LINKED
+    return None, AMBIGUOUS if ambiguous else UNRESOLVED
+
+
+def pedigree_tokens(text):
+    """
+    Split a pedigree into the words that may be UINs.
+
+    Args:
+        text (str): The pedigree.
+
+    Returns:
+        list: The words, without wild type markers.
+    """
+    if not text or WILD_TYPE.fullmatch(text.strip()):
+        return []
+    return PEDIGREE_TOKEN.findall(WILD_TYPE.sub(' ', text))
+
+
+def uin_parents(words, using):
+    """
+    Look up the strains whose UIN is one of the words of some pedigrees.
+
+    Args:
+        words (set): The pedigree words.
+        using (str): The database alias.
+
+    Returns:
+        dict: Strain ids by UIN, ``None`` for UINs of several strains.
+    """
+    parents = {}
+    strains = Strains.objects.using(using).filter(UIN__in=words).values_list('UIN', 'pk')
+    for uin, strain_id in strains:
+        parents[uin] = None if uin in parents else strain_id
+    return parents
+
+
+def backfill(using='default', batch_size=BATCH_SIZE, dry_run=False):
+    """
+    Set the parents of strains from their pedigree text and rebuild the closure.
+
+    Only strains without a parent are parsed, so links made by hand are
+    kept and the backfill can be run again after fixing pedigrees. Each
+    batch resolves the words of its pedigrees with one query. Pedigrees
+    forming a cycle raise the ``ValidationError`` of ``lineage.rebuild``.
+
+    Args:
+        using (str): The database alias.
+        batch_size (int): Number of strains parsed at once.
+        dry_run (bool): Only count, without changing anything.
+
+    Returns:
+        dict: Number of strains linked, with an ambiguous UIN and without a
+        known UIN, not counting wild type strains.
+    """
+    counts = {LINKED: 0, AMBIGUOUS: 0, UNRESOLVED: 0}
+    manager = Strains.objects.using(using)
+    with transaction.atomic(using=using):
+        orphans = manager.filter(parent__isnull=True).values_list('pk', 'UIN', 'pedigree')
+        batch = []
+        for row in orphans.iterator(chunk_size=batch_size):
+            batch.append(row)
+            if len(batch) == batch_size:
+                link_batch(batch, counts, using, dry_run)
+                batch = []
+        link_batch(batch, counts, using, dry_run)
+        if not dry_run:
+            rebuild(using)
+        transaction.set_rollback(dry_run, using=using)
+    return counts
+
+
+def link_batch(batch, counts, using, dry_run):
+    """
+    Resolve and save the parents of one batch of the backfill.
+
+    Args:
+        batch (list): Tuples of the strain id, UIN and pedigree.
+        counts (dict): Counters of ``backfill``, updated in place.
+        using (str): The database alias.
+        dry_run (bool): Only count.
+    """
+    words = {token for _, _, pedigree in batch for token in pedigree_tokens(pedigree)}
+    if not words:
+        return
+    parents = uin_parents(words, using)
+    linked = {}
+    for pk, uin, pedigree in batch:
+        if not pedigree_tokens(pedigree):
+            continue
+        parent, outcome = pedigree_parent(pedigree, uin, parents)
+        counts[outcome] += 1
+        if parent is not None:
+            linked[pk] = parent
+    if linked and not dry_run:
+        strains = [Strains(pk=child, parent_id=parent) for child, parent in linked.items()]
+        Strains.objects.using(using).bulk_update(strains, ['parent'], batch_size=BATCH_SIZE)
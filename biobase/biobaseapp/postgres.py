@@ -0,0 +1,368 @@
+"""PostgreSQL-specific helpers for biobaseapp."""
+import csv
+import io
+import json
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db.backends.postgresql.psycopg_any import sql
+from django.db.migrations.operations import AddIndex
+from django.db.migrations.operations.base import Operation
+
+POSTGRESQL = 'postgresql'
+COPY_CHUNK_SIZE = 65536
+NULL = r'\N'
+INDEX_USAGE = """
+    SELECT s.relname, s.indexrelname, s.idx_scan, s.idx_tup_read,
+           s.idx_tup_fetch, pg_relation_size(s.indexrelid), i.indisunique
+    FROM pg_stat_user_indexes s
+    JOIN pg_index i ON i.indexrelid = s.indexrelid
+    WHERE starts_with(s.relname, {prefix})
+    ORDER BY s.idx_scan, pg_relation_size(s.indexrelid) DESC
+"""
+TABLE_ESTIMATE = """
+    SELECT CASE WHEN relpages > 0
+        THEN reltuples / relpages
+             * (pg_relation_size(oid) / current_setting('block_size')::int)
+        ELSE reltuples END
+    FROM pg_class WHERE oid = {table}::regclass
+"""
+INDEXES_SIZE = 'SELECT pg_indexes_size({table}::regclass)'
+CREATE_STAGING = (
+    'CREATE TEMPORARY TABLE {staging} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP'
+)
+COPY_STAGING = 'COPY {staging} ({columns}) FROM STDIN WITH (FORMAT csv, NULL {null})'
+INSERT_STAGED = (
+    'INSERT INTO {table} ({columns}) SELECT {columns} FROM {staging} ON CONFLICT DO NOTHING'
+)
+DROP_STAGING = 'DROP TABLE {staging}'
+
+
+def is_postgres(connection) -> bool:
+    """
+    Check whether the given connection is a PostgreSQL connection.
+
+    Args:
+        connection: A database connection wrapper.
+
+    Returns:
+        bool: True for PostgreSQL, False for any other backend (e.g. SQLite in tests).
+    """
+    return connection.vendor == POSTGRESQL
+
+
+def compose(cursor, statement, **parts):
+    """
+    Fill quoted identifiers, literals and placeholders into a statement.
+
+    Args:
+        cursor: A Django cursor whose connection quotes the parts.
+        statement (str): The statement with ``{name}`` slots.
+        parts: ``sql.Composable`` objects by slot name.
+
+    Returns:
+        str: The statement.
+    """
+    return sql.SQL(statement).format(**parts).as_string(cursor.cursor)
+
+
+def connection_stats(connection) -> dict:
+    """
+    Describe how a database alias reuses connections.
+
+    Args:
+        connection: A database connection wrapper.
+
+    Returns:
+        dict: The persistence settings and, if a psycopg connection pool is
+        configured, its counters from ``ConnectionPool.get_stats()``.
+    """
+    pool = getattr(connection, 'pool', None) if is_postgres(connection) else None
+    return {
+        'vendor': connection.vendor,
+        'conn_max_age': connection.settings_dict['CONN_MAX_AGE'],
+        'conn_health_checks': connection.settings_dict['CONN_HEALTH_CHECKS'],
+        'pool': pool.get_stats() if pool is not None else None,
+    }
+
+
+class PostgresOnly(Operation):
+    """
+    Migration operation that runs the wrapped operation on PostgreSQL only.
+
+    Used for indexes, extensions and triggers that have no SQLite equivalent,
+    so that the same migrations can be applied to the SQLite test database.
+    The wrapped operation must not change the model state.
+    """
+
+    reversible = True
+
+    def __init__(self, operation):
+        """
+        Wrap a migration operation.
+
+        Args:
+            operation (Operation): The operation to run on PostgreSQL.
+        """
+        self.operation = operation
+
+    def state_forwards(self, app_label, state):
+        """
+        Apply the state changes of the wrapped operation.
+
+        Args:
+            app_label (str): The label of the migrated app.
+            state (ProjectState): The project state to change.
+        """
+        self.operation.state_forwards(app_label, state)
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        """
+        Apply the wrapped operation if the database is PostgreSQL.
+
+        Args:
+            app_label (str): The label of the migrated app.
+            schema_editor (BaseDatabaseSchemaEditor): The schema editor.
+            from_state (ProjectState): The state before the operation.
+            to_state (ProjectState): The state after the operation.
+        """
+        if is_postgres(schema_editor.connection):
+            self.operation.database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        """
+        Revert the wrapped operation if the database is PostgreSQL.
+
+        Args:
+            app_label (str): The label of the migrated app.
+            schema_editor (BaseDatabaseSchemaEditor): The schema editor.
+            from_state (ProjectState): The state before the operation.
+            to_state (ProjectState): The state after the operation.
+        """
+        if is_postgres(schema_editor.connection):
+            self.operation.database_backwards(app_label, schema_editor, from_state, to_state)
+
+    def describe(self):
+        """
+        Describe the operation for ``sqlmigrate`` and ``migrate``.
+
+        Returns:
+            str: The description of the wrapped operation.
+        """
+        description = self.operation.describe()
+        return f'{description} (PostgreSQL only)'
+
+
+class AddIndexConcurrentlyOnPostgres(AddIndexConcurrently):
+    """
+    Add a model index without blocking writes on PostgreSQL.
+
+    The index is built with ``CREATE INDEX CONCURRENTLY`` on PostgreSQL and
+    with a plain ``CREATE INDEX`` on other databases, so that indexes
+    declared in ``Meta.indexes`` exist in the SQLite test database too. The
+    migration must be non-atomic.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        """
+        Create the index, concurrently on PostgreSQL.
+
+        Args:
+            app_label (str): The label of the migrated app.
+            schema_editor (BaseDatabaseSchemaEditor): The schema editor.
+            from_state (ProjectState): The state before the operation.
+            to_state (ProjectState): The state after the operation.
+        """
+        if is_postgres(schema_editor.connection):
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+        else:
+            AddIndex.database_forwards(self, app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        """
+        Drop the index, concurrently on PostgreSQL.
+
+        Args:
+            app_label (str): The label of the migrated app.
+            schema_editor (BaseDatabaseSchemaEditor): The schema editor.
+            from_state (ProjectState): The state before the operation.
+            to_state (ProjectState): The state after the operation.
+        """
+        if is_postgres(schema_editor.connection):
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+        else:
+            AddIndex.database_backwards(self, app_label, schema_editor, from_state, to_state)
+
+
+def index_usage(connection, table_prefix=''):
+    """
+    Read the usage statistics of the indexes from ``pg_stat_user_indexes``.
+
+    The counters are cumulative since the last statistics reset, see
+    ``pg_stat_reset()``, and are kept per server: replicas count their own
+    scans.
+
+    Args:
+        connection: A Django connection to PostgreSQL.
+        table_prefix (str): Only report tables whose name starts with it.
+
+    Returns:
+        list: One dict per index with the ``table``, ``index``, ``scans``,
+        ``tuples_read``, ``tuples_fetched``, ``size`` in bytes and whether it
+        is ``unique``, least used first.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(compose(cursor, INDEX_USAGE, prefix=sql.Placeholder()), [table_prefix])
+        columns = ('table', 'index', 'scans', 'tuples_read', 'tuples_fetched', 'size', 'unique')
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def indexes_size(connection, table):
+    """
+    Measure the size of the indexes of a table.
+
+    Args:
+        connection: A Django connection to PostgreSQL.
+        table (str): The table name.
+
+    Returns:
+        int: The size in bytes.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(compose(cursor, INDEXES_SIZE, table=sql.Placeholder()), [table])
+        return cursor.fetchone()[0]
+
+
+def estimate_count(connection, queryset):
+    """
+    Estimate the number of rows of a queryset from the planner statistics.
+
+    An unfiltered table is estimated like the planner does, from
+    ``pg_class.reltuples`` scaled to the current size of the table; a
+    filtered queryset from the row estimate of its ``EXPLAIN`` plan. Both
+    are only as good as the last ``ANALYZE``, which autovacuum runs.
+
+    Args:
+        connection: A Django connection to PostgreSQL.
+        queryset (QuerySet): The records to count.
+
+    Returns:
+        int | None: The estimate, or ``None`` if the table has never been
+        analyzed.
+    """
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute(
+                compose(cursor, TABLE_ESTIMATE, table=sql.Placeholder()),
+                [queryset.query.get_meta().db_table],
+            )
+            estimate = cursor.fetchone()[0]
+            return None if estimate < 0 else int(estimate)
+        query, arguments = queryset.order_by().query.sql_with_params()
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {query}', arguments)
+        plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+
+def copy_from(cursor, statement, stream):
+    """
+    Load CSV data into a table with ``COPY ... FROM STDIN``.
+
+    Works with both psycopg2 (``copy_expert``) and psycopg 3 (``cursor.copy``).
+
+    Args:
+        cursor: A Django cursor on a PostgreSQL connection.
+        statement (str): The ``COPY`` statement.
+        stream (io.StringIO): The CSV data, positioned at the start.
+    """
+    raw_cursor = cursor.cursor
+    copy_expert = getattr(raw_cursor, 'copy_expert', None)
+    if copy_expert is not None:
+        copy_expert(statement, stream)
+        return
+    with raw_cursor.copy(statement) as copy:
+        chunk = stream.read(COPY_CHUNK_SIZE)
+        while chunk:
+            copy.write(chunk)
+            chunk = stream.read(COPY_CHUNK_SIZE)
+
+
+class StagingTable:
+    """
+    Temporary table that rows are copied into before they reach a model table.
+
+    The statements are composed from quoted identifiers with the ``sql``
+    module of the psycopg driver. ``COPY`` loads empty unquoted values as
+    empty strings and None as NULL.
+    """
+
+    def __init__(self, connection, name, table, columns):
+        """
+        Describe a staging table of a model table.
+
+        Args:
+            connection: A Django connection to PostgreSQL.
+            name (str): The name of the staging table.
+            table (str): The name of the model table.
+            columns (list): The names of the loaded columns.
+        """
+        self.connection = connection
+        self.parts = {
+            'staging': sql.Identifier(name),
+            'table': sql.Identifier(table),
+            'columns': sql.SQL(', ').join(sql.Identifier(column) for column in columns),
+            'null': sql.Literal(NULL),
+        }
+
+    def create(self):
+        """Create the table with the layout of the model table, dropped on commit."""
+        self.execute(CREATE_STAGING)
+
+    def copy(self, rows):
+        """
+        Load rows into the table with ``COPY``.
+
+        Args:
+            rows (list): Tuples of column values, None for NULL.
+        """
+        stream = io.StringIO()
+        writer = csv.writer(stream)
+        for row in rows:
+            writer.writerow([NULL if column is None else column for column in row])
+        stream.seek(0)
+        with self.connection.cursor() as cursor:
+            copy_from(cursor, compose(cursor, COPY_STAGING, **self.parts), stream)
+
+    def insert(self):
+        """
+        Move the staged rows into the model table, skipping ids that exist.
+
+        Returns:
+            int: Number of inserted rows.
+        """
+        return self.execute(INSERT_STAGED)
+
+    def drop(self):
+        """
+        Drop the table.
+
+        ``ON COMMIT DROP`` only fires when the outermost transaction commits,
+        so a load nested in a larger transaction drops the table itself to
+        let the next load create it again.
+        """
+        self.execute(DROP_STAGING)
+
+    def execute(self, statement):
+        """
+        Run a statement on the table.
+
+        Args:
+            statement (str): The statement with ``{name}`` slots for the table parts.
+
+        Returns:
+            int: Number of rows the statement changed.
+        """
+        with self.connection.cursor() as cursor:
+            cursor.execute(compose(cursor, statement, **self.parts))
+            return cursor.rowcount
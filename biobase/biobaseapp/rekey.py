@@ -0,0 +1,118 @@
+"""Give records created with random ids time-ordered ids in date order."""
+import datetime
+
+from django.db import models, transaction
+from django.db.models.functions import Now
+
+from .ids import VERSION, build_uuid7
+from .models import (CultivationPlanning, Cultures, Experiments, Projects,
+                     StrainProcessing, Strains, SubstanceIdentification)
+
+UPDATED = 'updated_at'
+BATCH_SIZE = 500
+MILLIS_PER_DAY = 24 * 60 * 60 * 1000
+
+# Model: the date that places its records in creation order.
+REKEY_DATES = {
+    Strains: 'creation_date',
+    Projects: 'start_date',
+    StrainProcessing: 'processing_date',
+    SubstanceIdentification: 'identification_date',
+    Experiments: 'start_date',
+    CultivationPlanning: 'planning_date',
+    Cultures: 'planning_date',
+}
+
+
+def legacy_ids(model, date_field, using='default'):
+    """
+    Map the ids that are not version 7 to new ids in date order.
+
+    Records of the same date get consecutive milliseconds of that day in
+    the order of their old ids, so the new ids sort like the dates.
+
+    Args:
+        model (type[Model]): The model.
+        date_field (str): The date of the records.
+        using (str): The database alias.
+
+    Returns:
+        dict: New ids by old id.
+    """
+    rows = sorted(
+        (date, pk)
+        for pk, date in model._base_manager.using(using).values_list('pk', date_field).iterator()
+        if pk.version != VERSION
+    )
+    mapping = {}
+    previous, offset = None, 0
+    for date, pk in rows:
+        offset = offset + 1 if date == previous else 0
+        previous = date
+        midnight = datetime.datetime.combine(date, datetime.time(), datetime.timezone.utc)
+        millis = int(midnight.timestamp() * 1000) + (offset % MILLIS_PER_DAY)
+        # The other bits are taken from the old id, so the new ids are
+        # reproducible.
+        mapping[pk] = build_uuid7(millis, pk.int >> 64, pk.int)
+    return mapping
+
+
+def replace(queryset, field, mapping):
+    """
+    Replace the values of a UUID field in one ``UPDATE``.
+
+    Args:
+        queryset (QuerySet): The records to change.
+        field (str): The field holding the old ids.
+        mapping (dict): New ids by old id.
+
+    Returns:
+        int: Number of changed records.
+    """
+    values = {field: models.Case(
+        *(models.When(**{field: old}, then=models.Value(new)) for old, new in mapping.items()),
+        output_field=models.UUIDField(),
+    )}
+    if any(model_field.name == UPDATED for model_field in queryset.model._meta.fields):
+        # Moves the conditional GET validators, which would otherwise match
+        # pages showing the old ids.
+        values[UPDATED] = Now()
+    return queryset.filter(**{f'{field}__in': list(mapping)}).update(**values)
+
+
+def rekey(using='default', batch_size=BATCH_SIZE, dry_run=False):
+    """
+    Replace the random ids of older records with time-ordered ones.
+
+    Every foreign key to a changed record is updated in the same
+    transaction; the foreign key constraints are deferred to the commit, so
+    the order of the updates does not matter. Links to the records by
+    their old ids, such as bookmarked edit pages or ids stored by API
+    clients, stop working.
+
+    Args:
+        using (str): The database alias.
+        batch_size (int): Number of ids replaced per ``UPDATE``.
+        dry_run (bool): Only count the records to change.
+
+    Returns:
+        dict: Number of changed records per model name.
+    """
+    counts = {}
+    with transaction.atomic(using=using):
+        for model, date_field in REKEY_DATES.items():
+            mapping = legacy_ids(model, date_field, using)
+            counts[model._meta.model_name] = len(mapping)
+            if dry_run:
+                continue
+            pairs = list(mapping.items())
+            for start in range(0, len(pairs), batch_size):
+                batch = dict(pairs[start:start + batch_size])
+                for relation in model._meta.related_objects:
+                    if relation.one_to_many or relation.one_to_one:
+                        replace(
+                            relation.related_model._base_manager.using(using),
+                            relation.field.name, batch,
+                        )
+                replace(model._base_manager.using(using), model._meta.pk.name, batch)
+    return counts
@@ -0,0 +1,224 @@
+"""Strain search helpers used by the list views."""
+from types import MappingProxyType
+
+from django.contrib.postgres.search import (SearchQuery, SearchRank,
+                                            TrigramSimilarity)
+from django.db import connections
+from django.db.models import F, Q
+from django.db.models.functions import Greatest, Upper
+
+from .postgres import is_postgres
+
+ID = 'id'
+NAME = 'name'
+UIN = 'UIN'
+SIMILARITY = 'similarity'
+RANK = 'rank'
+SEARCH_VECTOR = 'search_vector'
+SEARCH_CONFIG = 'simple'
+GENOTYPE_FIELDS = ('pedigree', 'mutations', 'transformations')
+SEARCH_TYPE = 'search_type'
+QUERY = 'q'
+SIMILAR = 'similar'
+GENOTYPE = 'genotype'
+DATE = 'date'
+DATE_FROM = 'date_from'
+DATE_TO = 'date_to'
+CREATED = 'created_by'
+
+
+def name_search(queryset, query, prefix=''):
+    """
+    Filter a queryset by a substring of the strain name.
+
+    On PostgreSQL the ``UPPER(name) LIKE`` generated by ``icontains`` is served
+    by the ``gin_trgm_ops`` index from migration 0005.
+
+    Args:
+        queryset (QuerySet): The queryset to filter.
+        query (str): The substring to look for.
+        prefix (str): Lookup path to the strain, e.g. ``'strain_UIN__'``.
+
+    Returns:
+        QuerySet: The filtered queryset.
+    """
+    return queryset.filter(**{f'{prefix}{NAME}__icontains': query})
+
+
+def similarity_search(queryset, query, prefix=''):
+    """
+    Filter a queryset by trigram similarity to the strain name or UIN.
+
+    Results are ranked by the best similarity of the two columns. SQLite has
+    no pg_trgm, so there the search falls back to an unranked substring match.
+
+    Args:
+        queryset (QuerySet): The queryset to filter.
+        query (str): The text to compare with.
+        prefix (str): Lookup path to the strain, e.g. ``'strain_UIN__'``.
+
+    Returns:
+        QuerySet: The filtered and ranked queryset.
+    """
+    name = f'{prefix}{NAME}'
+    uin = f'{prefix}{UIN}'
+    if not is_postgres(connections[queryset.db]):
+        return queryset.filter(
+            Q(**{f'{name}__icontains': query}) | Q(**{f'{uin}__icontains': query}),
+        )
+
+    return queryset.annotate(
+        name_upper=Upper(name),
+        uin_upper=Upper(uin),
+    ).annotate(
+        similarity=Greatest(
+            TrigramSimilarity('name_upper', query),
+            TrigramSimilarity('uin_upper', query),
+        ),
+    ).filter(
+        Q(name_upper__trigram_similar=query) | Q(uin_upper__trigram_similar=query),
+    ).order_by(f'-{SIMILARITY}', ID)
+
+
+def genotype_search(queryset, query):
+    """
+    Full-text search over the pedigree, mutations and transformations of strains.
+
+    On PostgreSQL the query is parsed with ``websearch_to_tsquery`` and matched
+    against the GIN-indexed ``search_vector`` column; results are ordered by
+    rank, with mutations weighted highest. SQLite falls back to a substring
+    match on the three text fields.
+
+    Args:
+        queryset (QuerySet): A queryset of strains.
+        query (str): The search query, e.g. ``'ΔlacZ -recA'``.
+
+    Returns:
+        QuerySet: The filtered and ranked queryset.
+    """
+    if not is_postgres(connections[queryset.db]):
+        condition = Q()
+        for field in GENOTYPE_FIELDS:
+            condition |= Q(**{f'{field}__icontains': query})
+        return queryset.filter(condition).order_by(ID)
+
+    search_query = SearchQuery(query, config=SEARCH_CONFIG, search_type='websearch')
+    return queryset.filter(
+        **{SEARCH_VECTOR: search_query},
+    ).annotate(
+        rank=SearchRank(F(SEARCH_VECTOR), search_query),
+    ).order_by(f'-{RANK}', ID)
+
+
+def search_name(queryset, params, prefix, date_field):
+    """
+    Apply the ``name`` search of a list page, see ``name_search``.
+
+    Args:
+        queryset (QuerySet): The records of the page.
+        params (QueryDict): The query parameters, with ``q``.
+        prefix (str): Lookup path to the strain.
+        date_field (str): Unused.
+
+    Returns:
+        QuerySet: The filtered queryset.
+    """
+    return name_search(queryset, params[QUERY], prefix)
+
+
+def search_similar(queryset, params, prefix, date_field):
+    """
+    Apply the ``similar`` search of a list page, see ``similarity_search``.
+
+    Args:
+        queryset (QuerySet): The records of the page.
+        params (QueryDict): The query parameters, with ``q``.
+        prefix (str): Lookup path to the strain.
+        date_field (str): Unused.
+
+    Returns:
+        QuerySet: The filtered and ranked queryset.
+    """
+    return similarity_search(queryset, params[QUERY], prefix)
+
+
+def search_genotype(queryset, params, prefix, date_field):
+    """
+    Apply the ``genotype`` search of the strain list, see ``genotype_search``.
+
+    Args:
+        queryset (QuerySet): The strains.
+        params (QueryDict): The query parameters, with ``q``.
+        prefix (str): Unused, the records are strains.
+        date_field (str): Unused.
+
+    Returns:
+        QuerySet: The filtered and ranked queryset.
+    """
+    return genotype_search(queryset, params[QUERY])
+
+
+def search_dates(queryset, params, prefix, date_field):
+    """
+    Apply the ``date`` search of a list page.
+
+    Args:
+        queryset (QuerySet): The records of the page.
+        params (QueryDict): The query parameters, with ``date_from`` and ``date_to``.
+        prefix (str): Unused.
+        date_field (str): The date to filter.
+
+    Returns:
+        QuerySet: The records dated within the range.
+    """
+    return queryset.filter(**{f'{date_field}__range': [params[DATE_FROM], params[DATE_TO]]})
+
+
+def search_creator(queryset, params, prefix, date_field):
+    """
+    Apply the ``created_by`` search of a list page.
+
+    Args:
+        queryset (QuerySet): The records of the page.
+        params (QueryDict): The query parameters, with ``created_by``.
+        prefix (str): Unused.
+        date_field (str): Unused.
+
+    Returns:
+        QuerySet: The records of users whose name contains the text.
+    """
+    return queryset.filter(created_by__username__icontains=params[CREATED])
+
+
+# Search type of the list pages: the filter and the parameters it needs.
+LIST_SEARCHES = MappingProxyType({
+    NAME: (search_name, (QUERY,)),
+    SIMILAR: (search_similar, (QUERY,)),
+    GENOTYPE: (search_genotype, (QUERY,)),
+    DATE: (search_dates, (DATE_FROM, DATE_TO)),
+    CREATED: (search_creator, (CREATED,)),
+})
+
+
+def list_search(queryset, params, search_types, prefix='', date_field=None):
+    """
+    Apply the search a list page was asked for with ``?search_type=``.
+
+    Args:
+        queryset (QuerySet): The records of the page.
+        params (QueryDict): The query parameters.
+        search_types (Iterable): The search types the page offers.
+        prefix (str): Lookup path to the strain, e.g. ``'strain_UIN__'``.
+        date_field (str): The date the ``date`` search filters.
+
+    Returns:
+        QuerySet: The filtered queryset, or the queryset itself if the page
+        does not offer the search type or a parameter it needs is missing.
+    """
+    search_type = params.get(SEARCH_TYPE)
+    if search_type not in search_types:
+        return queryset
+    search, required = LIST_SEARCHES[search_type]
+    if not all(params.get(name) for name in required):
+        return queryset
+    return search(queryset, params, prefix, date_field)
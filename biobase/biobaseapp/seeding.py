@@ -0,0 +1,360 @@
+"""Generate realistic linked biobase data for local load and benchmark runs."""
+import datetime
+import random
+from types import MappingProxyType
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from .lineage import link_new
+from .models import (CultivationPlanning, Cultures, CustomUser, Experiments,
+                     Projects, StrainProcessing, Strains,
+                     SubstanceIdentification)
+from .mutations import sync_mutations
+
+USERNAME_PREFIX = 'seed'
+UIN_PREFIX = 'BB'
+STRAINS_PER_USER = 100
+STRAINS_PER_PROJECT = 10
+HISTORY_DAYS = 1825
+ROOT_SHARE = 0.1
+DELETION_SHARE = 0.3
+AUTHOR_SHARE = 0.7
+FINISHED_SHARE = 0.6
+MAX_ALLELE = 99
+WILD_TYPE = 'wild type'
+NO_PLASMIDS = 'none'
+
+# Average number of dependent records per strain, and of cultures per project.
+PER_STRAIN = (
+    (StrainProcessing, 2),
+    (SubstanceIdentification, 1),
+    (Experiments, 3),
+    (CultivationPlanning, 2),
+)
+CULTURES_PER_PROJECT = 3
+
+GENES = (
+    'lacZ', 'recA', 'endA', 'hsdR', 'gyrA', 'relA', 'tonA', 'leuB', 'proA', 'thi',
+    'araD', 'galK', 'rpsL', 'mcrA', 'deoR', 'supE', 'fhuA', 'ompT', 'lon', 'trp',
+)
+PLASMIDS = ('pUC19', 'pET28a', 'pBR322', 'pACYC184', 'pGEX-4T', 'pBAD33', 'pKD46')
+GROWTH_MEDIA = ('LB', 'M9', 'TB', '2xYT', 'SOC', 'YPD', 'M9 + glucose')
+STATUSES = ('Planned', 'In progress', 'Done', 'Cancelled')
+PROCESSING = ('Freezing at -80°C', 'Passage', 'Plasmid purification', 'Sequencing')
+OUTCOMES = ('Growth as expected', 'No growth', 'Slow growth', 'Contamination',
+            'Product detected', 'Product not detected')
+
+# Query strings of the strain list search modes that match the generated data,
+# see StrainsListView.
+SEARCH_MODES = MappingProxyType({
+    'all': {},
+    'name': {'search_type': 'name', 'q': 'lacz'},
+    'similar': {'search_type': 'similar', 'q': 'Lacz strain 1'},
+    'genotype': {'search_type': 'genotype', 'q': 'recA'},
+    'date': {'search_type': 'date', 'date_from': '2000-01-01', 'date_to': '2100-01-01'},
+    'created_by': {'search_type': 'created_by', 'created_by': 'seed00'},
+})
+
+
+class RecordFactory:
+    """
+    Build unsaved records with generated values.
+
+    Attributes:
+        rng (random.Random): Source of the values, seeded for reproducible runs.
+        today (datetime.date): The last day of the covered history.
+    """
+
+    def __init__(self, rng, today):
+        """
+        Initialize the factory.
+
+        Args:
+            rng (random.Random): Source of the values.
+            today (datetime.date): The last day of the covered history.
+        """
+        self.rng = rng
+        self.today = today
+
+    def date(self, after=None):
+        """
+        Pick a date of the covered history.
+
+        Args:
+            after (datetime.date): The earliest date, if any.
+
+        Returns:
+            datetime.date: A date not in the future.
+        """
+        first = self.today - datetime.timedelta(days=HISTORY_DAYS)
+        if after is not None:
+            first = max(first, after)
+        return first + datetime.timedelta(days=self.rng.randint(0, (self.today - first).days))
+
+    def genotype(self):
+        """
+        Build a list of mutations.
+
+        Returns:
+            str: Comma-separated mutated genes with allele numbers.
+        """
+        alleles = []
+        for gene in self.rng.sample(GENES, self.rng.randint(1, 4)):
+            if self.rng.random() < DELETION_SHARE:
+                alleles.append(f'Δ{gene}')
+            else:
+                number = self.rng.randint(1, MAX_ALLELE)
+                alleles.append(f'{gene}{number}')
+        return ', '.join(alleles)
+
+    def strain(self, number, owners, created):
+        """
+        Build one unsaved strain, a root or derived from an earlier strain.
+
+        Args:
+            number (int): Number of the strain, continuing the existing ones.
+            owners (list): Users to pick the author from.
+            created (list): Id and UIN of the strains created so far.
+
+        Returns:
+            Strains: The strain.
+        """
+        root = not created or self.rng.random() < ROOT_SHARE
+        gene = self.rng.choice(GENES).capitalize()
+        parent, parent_uin = (None, None) if root else self.rng.choice(created)
+        mutations = self.genotype()
+        plasmids = ', '.join(self.rng.sample(PLASMIDS, self.rng.randint(0, 2)))
+        return Strains(
+            UIN=f'{UIN_PREFIX}{number:07d}',
+            name=f'{gene} strain {number}',
+            pedigree=WILD_TYPE if root else parent_uin,
+            parent_id=parent,
+            mutations=mutations,
+            transformations=plasmids or NO_PLASMIDS,
+            creation_date=self.date(),
+            created_by=self.rng.choice(owners),
+        )
+
+    def dependent(self, model, strain, owners):
+        """
+        Build one unsaved record linked to a strain.
+
+        Args:
+            model (type): A model of ``PER_STRAIN``.
+            strain (Strains): The strain.
+            owners (list): Users to pick a colleague from.
+
+        Returns:
+            Model: The record, by the strain's author or a colleague.
+        """
+        owner = strain.created_by if self.rng.random() < AUTHOR_SHARE else self.rng.choice(owners)
+        started = self.date(after=strain.creation_date)
+        finished = self.date(after=started)
+        if model is StrainProcessing:
+            return StrainProcessing(
+                strain_id=strain, processing_date=started,
+                description=self.rng.choice(PROCESSING), created_by=owner,
+            )
+        if model is SubstanceIdentification:
+            return SubstanceIdentification(
+                strain_id=strain, identification_date=started,
+                results=self.rng.choice(OUTCOMES), created_by=owner,
+            )
+        if model is Experiments:
+            return Experiments(
+                strain_UIN=strain, start_date=started, end_date=finished,
+                growth_medium=self.rng.choice(GROWTH_MEDIA),
+                results=self.rng.choice(OUTCOMES), created_by=owner,
+            )
+        return CultivationPlanning(
+            strain_ID=strain, planning_date=started, completion_date=finished,
+            growth_medium=self.rng.choice(GROWTH_MEDIA),
+            status=self.rng.choice(STATUSES), created_by=owner,
+        )
+
+    def project(self, number, owners):
+        """
+        Build one unsaved project.
+
+        Args:
+            number (int): Number of the project.
+            owners (list): Users to pick the author from.
+
+        Returns:
+            Projects: The project, finished or still running.
+        """
+        started = self.date()
+        gene = self.rng.choice(GENES)
+        finished = self.date(after=started) if self.rng.random() < FINISHED_SHARE else None
+        return Projects(
+            project_name=f'Project {number} ({gene})',
+            start_date=started,
+            end_date=finished,
+            results=self.rng.choice(OUTCOMES),
+            created_by=self.rng.choice(owners),
+        )
+
+    def culture(self, project):
+        """
+        Build one unsaved culture of a project.
+
+        Args:
+            project (Projects): The project.
+
+        Returns:
+            Cultures: The culture.
+        """
+        return Cultures(
+            project_id=project,
+            planning_date=self.date(after=project.start_date),
+            results=self.rng.choice(OUTCOMES),
+            created_by=project.created_by,
+        )
+
+
+class Seeder:
+    """
+    Insert a consistent data set in batches.
+
+    Strains get a UIN continuing the existing numbering and most of them a
+    parent strain in ``pedigree``, so the data looks like a real collection
+    that grew over several years of work by a few dozen people. Every
+    dependent model is filled in the proportions of ``PER_STRAIN``.
+
+    Attributes:
+        rng (random.Random): Source of the generated values and their counts.
+        factory (RecordFactory): Builder of the records.
+        using (str): The database alias to fill.
+        batch_size (int): Number of strains generated and inserted at once.
+        counts (dict): Number of inserted records per model name.
+    """
+
+    def __init__(self, seed_value=0, using='default', batch_size=1000):
+        """
+        Initialize the seeder.
+
+        Args:
+            seed_value (int): Seed of the random generator.
+            using (str): The database alias to fill.
+            batch_size (int): Number of strains generated and inserted at once.
+        """
+        self.rng = random.Random(seed_value)
+        self.factory = RecordFactory(self.rng, timezone.now().date())
+        self.using = using
+        self.batch_size = batch_size
+        self.counts = {}
+
+    def run(self, strains, users=None):
+        """
+        Insert users, strains, projects and their dependent records.
+
+        Args:
+            strains (int): Number of strains to create.
+            users (int): Number of users; one per ``STRAINS_PER_USER`` strains by default.
+
+        Returns:
+            dict: Number of inserted records per model name.
+        """
+        with transaction.atomic(using=self.using):
+            owners = self.users(users or max(1, strains // STRAINS_PER_USER))
+            created = []
+            start = Strains.objects.using(self.using).count()
+            for offset in range(0, strains, self.batch_size):
+                size = min(self.batch_size, strains - offset)
+                batch = self.strains(start + offset, size, owners, created)
+                for model, average in PER_STRAIN:
+                    self.insert(model, [
+                        self.factory.dependent(model, strain, owners)
+                        for strain in batch
+                        for _ in range(self.rng.randint(0, 2 * average))
+                    ])
+            projects = self.insert(Projects, [
+                self.factory.project(number, owners)
+                for number in range(max(1, strains // STRAINS_PER_PROJECT))
+            ])
+            self.insert(Cultures, [
+                self.factory.culture(project)
+                for project in projects
+                for _ in range(self.rng.randint(0, 2 * CULTURES_PER_PROJECT))
+            ])
+        return self.counts
+
+    def insert(self, model, records):
+        """
+        Bulk insert records and count them.
+
+        Args:
+            model (type): The model class.
+            records (list): Unsaved records.
+
+        Returns:
+            list: The inserted records.
+        """
+        model.objects.using(self.using).bulk_create(records, batch_size=self.batch_size)
+        self.counts[model.__name__] = self.counts.get(model.__name__, 0) + len(records)
+        return records
+
+    def users(self, total):
+        """
+        Get or create the seed users.
+
+        Args:
+            total (int): Number of users.
+
+        Returns:
+            list: The users.
+        """
+        names = [f'{USERNAME_PREFIX}{number:04d}' for number in range(total)]
+        existing = CustomUser.objects.using(self.using).filter(username__in=names)
+        found = {user.username: user for user in existing}
+        password = make_password(None)
+        self.insert(CustomUser, [
+            CustomUser(
+                username=name, password=password,
+                first_name=name.capitalize(), last_name='Seed',
+            )
+            for name in names if name not in found
+        ])
+        return list(CustomUser.objects.using(self.using).filter(username__in=names))
+
+    def strains(self, start, size, owners, created):
+        """
+        Insert a batch of strains with their pedigree closure rows and mutation links.
+
+        Args:
+            start (int): Number of the first strain, continuing the existing ones.
+            size (int): Number of strains.
+            owners (list): Users to spread the strains over.
+            created (list): Id and UIN of the strains created so far, extended in place.
+
+        Returns:
+            list: The inserted strains.
+        """
+        batch = []
+        for number in range(start, start + size):
+            strain = self.factory.strain(number, owners, created)
+            batch.append(strain)
+            created.append((strain.pk, strain.UIN))
+        self.insert(Strains, batch)
+        link_new(batch, self.using)
+        sync_mutations(batch, self.using, replace=False)
+        return batch
+
+
+def seed(strains, users=None, seed_value=0, using='default', batch_size=1000):
+    """
+    Fill the database with generated data.
+
+    Args:
+        strains (int): Number of strains to create.
+        users (int): Number of users; one per ``STRAINS_PER_USER`` strains by default.
+        seed_value (int): Seed of the random generator.
+        using (str): The database alias to fill.
+        batch_size (int): Number of strains generated and inserted at once.
+
+    Returns:
+        dict: Number of inserted records per model name.
+    """
+    return Seeder(seed_value=seed_value, using=using, batch_size=batch_size).run(strains, users)
@@ -1,11 +1,86 @@
 """Serializers for biobaseapp."""
 from rest_framework import serializers
 
+from .lineage import creates_cycle
 from .models import (CultivationPlanning, Cultures, CustomUser, Experiments,
                      Projects, StrainProcessing, Strains,
                      SubstanceIdentification)
 
 ALL = '__all__'
+SEARCH_VECTOR = 'search_vector'
+FIELDS = 'fields'
+CREATED = 'created_by'
+EXPAND = 'expand'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def requested(request, key):
+    """
+    Read a comma-separated list from the query string of a read request.
+
+    Args:
+        request (Request): The request, or None outside of views.
+        key (str): ``fields`` or ``expand``.
+
+    Returns:
+        list: The requested names; empty for writes, which use all fields.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return []
+    names = request.query_params.get(key, '').split(',')
+    return [name.strip() for name in names if name.strip()]
+
+
+def expanded(request, serializer_class):
+    """
+    Get the foreign keys of a read request that the serializer will expand.
+
+    Args:
+        request (Request): The request.
+        serializer_class (type): The serializer class of the view.
+
+    Returns:
+        list: Names of the expanded foreign keys.
+    """
+    fields = requested(request, FIELDS)
+    expandable = getattr(serializer_class, 'expandable_fields', {})
+    return [
+        name for name in requested(request, EXPAND)
+        if name in expandable and (not fields or name in fields)
+    ]
+
+
+class DynamicFieldsModelSerializer(serializers.ModelSerializer):
+    """
+    Model serializer supporting ``?fields=`` and ``?expand=`` on reads.
+
+    ``fields`` keeps only the listed fields. ``expand`` replaces the listed
+    foreign keys of ``expandable_fields`` with the serialized related object;
+    the viewset loads it with a join, see ``mixins.SparseFieldsMixin``.
+
+    Attributes:
+        expandable_fields (dict): Serializer classes of the expandable foreign keys.
+    """
+
+    expandable_fields = {}
+
+    def __init__(self, *args, **kwargs):
+        """
+        Initialize the serializer and apply the query parameters of the request.
+
+        Args:
+            args: positional arguments.
+            kwargs: keyword arguments.
+        """
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        fields = requested(request, FIELDS)
+        if fields:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+        for relation in requested(request, EXPAND):
+            if relation in self.expandable_fields and relation in self.fields:
+                self.fields[relation] = self.expandable_fields[relation](read_only=True)
 
 
 class CustomUserSerializer(serializers.ModelSerializer):
@@ -16,57 +91,104 @@ class CustomUserSerializer(serializers.ModelSerializer):
         fields = ALL
 
 
-class StrainsSerializer(serializers.ModelSerializer):
+class PublicUserSerializer(serializers.ModelSerializer):
+    """Serializer for the public details of a CustomUser, used in expansions."""
+
+    class Meta:
+        model = CustomUser
+        fields = ('id', 'username', 'first_name', 'last_name')
+
+
+class StrainsSerializer(DynamicFieldsModelSerializer):
     """Serializer for Strains model."""
 
+    expandable_fields = {CREATED: PublicUserSerializer}
+
     class Meta:
         model = Strains
-        fields = ALL
+        exclude = (SEARCH_VECTOR,)
+
+    def validate_parent(self, parent):
+        """
+        Refuse a parent that would make the strain its own ancestor.
+
+        Args:
+            parent (Strains): The parent, or None.
+
+        Returns:
+            Strains: The parent.
 
+        Raises:
+            ValidationError: If the parent is the strain or one of its descendants.
+        """
+        if parent is None or self.instance is None:
+            return parent
+        if creates_cycle(self.instance.pk, parent.pk):
+            raise serializers.ValidationError('A strain cannot descend from itself.')
+        return parent
 
-class StrainProcessingSerializer(serializers.ModelSerializer):
+
+class StrainLineageSerializer(StrainsSerializer):
+    """Serializer for strains of a pedigree query, with their ``depth``."""
+
+    depth = serializers.IntegerField(read_only=True)
+
+
+class StrainProcessingSerializer(DynamicFieldsModelSerializer):
     """Serializer for StrainProcessing model."""
 
+    expandable_fields = {'strain_id': StrainsSerializer, CREATED: PublicUserSerializer}
+
     class Meta:
         model = StrainProcessing
         fields = ALL
 
 
-class SubstanceIdentificationSerializer(serializers.ModelSerializer):
+class SubstanceIdentificationSerializer(DynamicFieldsModelSerializer):
     """Serializer for SubstanceIdentification model."""
 
+    expandable_fields = {'strain_id': StrainsSerializer, CREATED: PublicUserSerializer}
+
     class Meta:
         model = SubstanceIdentification
         fields = ALL
 
 
-class ExperimentsSerializer(serializers.ModelSerializer):
+class ExperimentsSerializer(DynamicFieldsModelSerializer):
     """Serializer for Experiments model."""
 
+    expandable_fields = {'strain_UIN': StrainsSerializer, CREATED: PublicUserSerializer}
+
     class Meta:
         model = Experiments
         fields = ALL
 
 
-class CultivationPlanningSerializer(serializers.ModelSerializer):
+class CultivationPlanningSerializer(DynamicFieldsModelSerializer):
     """Serializer for CultivationPlanning model."""
 
+    expandable_fields = {'strain_ID': StrainsSerializer, CREATED: PublicUserSerializer}
+
     class Meta:
         model = CultivationPlanning
         fields = '__all__'
 
 
-class ProjectsSerializer(serializers.ModelSerializer):
+class ProjectsSerializer(DynamicFieldsModelSerializer):
     """Serializer for Projects model."""
 
+    expandable_fields = {CREATED: PublicUserSerializer}
+
     class Meta:
         model = Projects
         fields = ALL
 
 
-class CulturesSerializer(serializers.ModelSerializer):
+class CulturesSerializer(DynamicFieldsModelSerializer):
     """Serializer for Cultures model."""
 
+    expandable_fields = {'project_id': ProjectsSerializer, CREATED: PublicUserSerializer}
+
     class Meta:
         model = Cultures
         fields = ALL
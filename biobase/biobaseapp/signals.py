@@ -0,0 +1,141 @@
+"""Signal handlers of the biobaseapp app."""
+from django.core.exceptions import ValidationError
+from django.db.models.signals import (post_delete, post_save, pre_delete,
+                                      pre_save)
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from .authentication import token_cache
+from .conditional import stamp_deletion
+from .dashboard import DASHBOARD_MODELS, invalidate_dashboard
+from .lineage import creates_cycle, detach, sync_lineage
+from .models import CustomUser, Strains
+from .mutations import sync_mutations
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_user_dashboard(sender, instance, **kwargs):
+    """
+    Invalidate the cached dashboard of the user who created a changed record.
+
+    Args:
+        sender (type): The model class.
+        instance (Model): The saved or deleted instance.
+        kwargs: Other signal arguments.
+    """
+    if sender in DASHBOARD_MODELS:
+        invalidate_dashboard(instance.created_by_id)
+
+
+@receiver(post_delete)
+def stamp_collection_deletion(sender, instance, **kwargs):
+    """
+    Change the ETags of the collections a record was deleted from.
+
+    Args:
+        sender (type): The model class.
+        instance (Model): The deleted instance.
+        kwargs: Other signal arguments.
+    """
+    stamp_deletion(sender)
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def invalidate_cached_token(sender, instance, **kwargs):
+    """
+    Drop a saved or deleted token from the authentication cache.
+
+    Args:
+        sender (type): The Token model.
+        instance (Token): The token.
+        kwargs: Other signal arguments.
+    """
+    token_cache.delete(instance.key)
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def invalidate_cached_user_tokens(sender, instance, **kwargs):
+    """
+    Drop the cached tokens of a changed user, e.g. one that was deactivated.
+
+    Args:
+        sender (type): The CustomUser model.
+        instance (CustomUser): The user.
+        kwargs: Other signal arguments.
+    """
+    token_cache.delete_user(instance.pk)
+
+
+@receiver(pre_save, sender=Strains)
+def check_strain_parent(sender, instance, using, raw=False, **kwargs):
+    """
+    Refuse to save a strain that would be its own ancestor.
+
+    Args:
+        sender (type): The Strains model.
+        instance (Strains): The strain.
+        using (str): The database alias.
+        raw (bool): Whether the strain is loaded from a fixture.
+        kwargs: Other signal arguments.
+
+    Raises:
+        ValidationError: If the parent is the strain or one of its descendants.
+    """
+    if raw or instance._state.adding or instance.parent_id is None:
+        return
+    if creates_cycle(instance.pk, instance.parent_id, using):
+        raise ValidationError({'parent': 'A strain cannot descend from itself.'})
+
+
+@receiver(post_save, sender=Strains)
+def update_strain_lineage(sender, instance, created, using, raw=False, **kwargs):
+    """
+    Keep the closure table of the strain pedigree in step with ``parent``.
+
+    Args:
+        sender (type): The Strains model.
+        instance (Strains): The saved strain.
+        created (bool): Whether the strain was inserted.
+        using (str): The database alias.
+        raw (bool): Whether the strain is loaded from a fixture.
+        kwargs: Other signal arguments.
+    """
+    if not raw:
+        sync_lineage(instance, created, using)
+
+
+@receiver(post_save, sender=Strains)
+def update_strain_mutations(sender, instance, created, using, raw=False, **kwargs):
+    """
+    Keep the mutation links of a strain in step with its genotype text.
+
+    Args:
+        sender (type): The Strains model.
+        instance (Strains): The saved strain.
+        created (bool): Whether the strain was inserted.
+        using (str): The database alias.
+        raw (bool): Whether the strain is loaded from a fixture.
+        kwargs: Other signal arguments.
+    """
+    if not raw:
+        sync_mutations([instance], using, replace=not created)
+
+
+@receiver(pre_delete, sender=Strains)
+def detach_strain_lineage(sender, instance, using, **kwargs):
+    """
+    Cut the descendants of a deleted strain from its ancestors.
+
+    The children lose their parent through ``SET_NULL`` and the rows of the
+    strain itself are deleted by ``CASCADE``.
+
+    Args:
+        sender (type): The Strains model.
+        instance (Strains): The strain.
+        using (str): The database alias.
+        kwargs: Other signal arguments.
+    """
+    detach(instance.pk, using)
@@ -0,0 +1,237 @@
+"""REST API viewset of the strains, with their search, mutation and pedigree queries."""
+import uuid
+
+from django.http import Http404
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .lineage import ancestors, common_ancestor, descendants, link_new
+from .models import Strains
+from .mutations import carrying, sync_mutations
+from .pagination import RankedPagination
+from .search import QUERY, genotype_search
+from .serializers import StrainLineageSerializer, StrainsSerializer
+from .viewsets import create_viewset
+
+MAX_DEPTH = 'max_depth'
+STRAINS = 'strains'
+LINEAGE_ACTIONS = ('ancestors', 'descendants', 'common_ancestor')
+ALL = 'all'
+ANY = 'any'
+
+
+def positive_int(query_params, name):
+    """
+    Read an optional positive integer query parameter.
+
+    Args:
+        query_params (QueryDict): The query parameters.
+        name (str): The parameter.
+
+    Returns:
+        int | None: The number, or None if the parameter is missing.
+
+    Raises:
+        ValidationError: If the parameter is not a positive integer.
+    """
+    text = query_params.get(name)
+    if text is None:
+        return None
+    if not text.isdigit() or int(text) < 1:
+        raise ValidationError({name: 'A positive integer is required.'})
+    return int(text)
+
+
+def name_list(query_params, name):
+    """
+    Read a comma-separated list of names from a query parameter.
+
+    Args:
+        query_params (QueryDict): The query parameters.
+        name (str): The parameter.
+
+    Returns:
+        list: The names, empty if the parameter is missing.
+    """
+    names = (part.strip() for part in query_params.get(name, '').split(','))
+    return [part for part in names if part]
+
+
+def strain_ids(query_params):
+    """
+    Read the ``strains`` query parameter: two or more comma-separated ids.
+
+    Args:
+        query_params (QueryDict): The query parameters.
+
+    Returns:
+        set: The strain ids.
+
+    Raises:
+        ValidationError: If an id is malformed or fewer than two are given.
+    """
+    try:
+        pks = {uuid.UUID(pk) for pk in name_list(query_params, STRAINS)}
+    except ValueError:
+        raise ValidationError({STRAINS: 'Malformed strain id.'})
+    if len(pks) < 2:
+        raise ValidationError({STRAINS: 'At least two strain ids are required.'})
+    return pks
+
+
+def strain_pk(pk):
+    """
+    Parse the id of the strain in the URL.
+
+    Args:
+        pk (str): The id from the URL.
+
+    Returns:
+        uuid.UUID: The id.
+
+    Raises:
+        Http404: If the id is malformed.
+    """
+    try:
+        return uuid.UUID(pk)
+    except ValueError:
+        raise Http404('No strain matches the given query.')
+
+
+StrainsModelViewSet = create_viewset(Strains, StrainsSerializer)
+
+
+class StrainViewSet(StrainsModelViewSet):
+    """
+    Strains viewset with full-text search, mutation and pedigree queries.
+
+    The pedigree actions read the ``StrainLineage`` closure table, so each
+    answers with one indexed query however deep the pedigree is.
+    """
+
+    def get_serializer_class(self):
+        """
+        Add the ``depth`` of the strains to the answers of pedigree queries.
+
+        Returns:
+            type: The serializer class.
+        """
+        if self.action in LINEAGE_ACTIONS:
+            return StrainLineageSerializer
+        return super().get_serializer_class()
+
+    def after_bulk_create(self, instances):
+        """
+        Add the closure rows and mutation links of the created strains.
+
+        Args:
+            instances (list): The created strains.
+        """
+        link_new(instances)
+        sync_mutations(instances, replace=False)
+
+    @action(detail=False)
+    def carrying(self, request):
+        """
+        Find strains by mutation: ``?all=ΔlacZ,recA1`` and/or ``?any=gyrA96,recA1``.
+
+        Args:
+            request: request object
+
+        Returns:
+            Response: A page of strains carrying every mutation of ``all``
+            and at least one of ``any``.
+
+        Raises:
+            ValidationError: If neither parameter names a mutation.
+        """
+        every = name_list(request.query_params, ALL)
+        either = name_list(request.query_params, ANY)
+        if not every and not either:
+            raise ValidationError({ALL: 'Give the mutations in all= or any=.'})
+        page = self.paginate_queryset(carrying(self.get_queryset(), every, either))
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+    @action(detail=True)
+    def ancestors(self, request, pk=None):
+        """
+        List the ancestors of a strain, nearest first.
+
+        Args:
+            request: request object
+            pk: id of the strain
+
+        Returns:
+            Response: The ancestors with their ``depth`` in generations.
+        """
+        strains = list(ancestors(self.get_queryset(), strain_pk(pk)))
+        if not strains:
+            # An unknown strain is a 404 rather than a strain without ancestors.
+            self.get_object()
+        return Response(self.get_serializer(strains, many=True).data)
+
+    @action(detail=True)
+    def descendants(self, request, pk=None):
+        """
+        List the descendants of a strain, up to ``?max_depth=`` generations.
+
+        A ``max_depth`` that is not a positive integer is answered with 400.
+
+        Args:
+            request: request object
+            pk: id of the strain
+
+        Returns:
+            Response: A page of descendants with their ``depth``.
+        """
+        max_depth = positive_int(request.query_params, MAX_DEPTH)
+        page = self.paginate_queryset(
+            descendants(self.get_queryset(), strain_pk(pk), max_depth),
+        )
+        if not page and not request.query_params.get(self.paginator.cursor_query_param):
+            self.get_object()
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)
+
+    @action(detail=False, url_path='common-ancestor')
+    def common_ancestor(self, request):
+        """
+        Find the nearest ancestor shared by ``?strains=<id>,<id>[,...]``.
+
+        Fewer than two valid ids are answered with 400.
+
+        Args:
+            request: request object
+
+        Returns:
+            Response: The common ancestor with its ``depth``: the most
+            generations between it and one of the strains.
+
+        Raises:
+            Http404: If the strains have no common ancestor.
+        """
+        strain = common_ancestor(self.get_queryset(), strain_ids(request.query_params)).first()
+        if strain is None:
+            raise Http404('The strains have no common ancestor.')
+        return Response(self.get_serializer(strain).data)
+
+    @action(detail=False, pagination_class=RankedPagination)
+    def search(self, request):
+        """
+        Search strains by pedigree, mutations and transformations.
+
+        Args:
+            request: request object with the ``q`` query parameter
+
+        Returns:
+            Response: A page of strains ordered by relevance.
+
+        Raises:
+            ValidationError: If the ``q`` parameter is missing.
+        """
+        query = request.query_params.get(QUERY)
+        if not query:
+            raise ValidationError({QUERY: 'This query parameter is required.'})
+        page = self.paginate_queryset(genotype_search(self.get_queryset(), query))
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
@@ -0,0 +1,163 @@
+"""Test helpers for the biobaseapp app."""
+from contextlib import contextmanager
+from types import MappingProxyType
+
+from django.db import connections
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import get_resolver
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APITestCase
+
+from .models import CustomUser
+
+# Credentials of the fixture users.
+LOGIN_CREDENTIALS = MappingProxyType({'username': 'testuser', 'password': 'password'})
+API_USER_CREDENTIALS = MappingProxyType({'username': 'user', 'password': 'user'})
+API_ADMIN_CREDENTIALS = MappingProxyType({'username': 'admin', 'password': 'admin'})
+
+# Most queries a request of each URL name may run, whatever the number of rows.
+# API budgets include the token lookup of a cold authentication cache. On
+# PostgreSQL list pages first ask the planner for an estimate, and the size
+# found for the validators saves the COUNT of the paginator.
+QUERY_BUDGETS = MappingProxyType({
+    'login': 10,
+    'logout': 4,
+    'index': 8,
+    'create_all': 2,
+    'choose_model': 0,
+    'choose_object': 1,
+    'autocomplete': 3,
+    'edit_model': 2,
+    'db_status': 2,
+    'strains_list': 5,
+    'planning_list': 5,
+    'experiments_list': 5,
+    'async_strains_list': 5,
+    'async_planning_list': 5,
+    'async_experiments_list': 5,
+    'api-root': 1,
+    'strains-list': 3,
+    'strains-detail': 2,
+    'strains-bulk': 7,
+    'strains-export': 2,
+    'async-strains-list': 3,
+    'async-strains-detail': 2,
+    'strains-search': 2,
+    'strains-ancestors': 3,
+    'strains-descendants': 3,
+    'strains-common-ancestor': 2,
+    'strains-carrying': 3,
+    'strainprocessing-list': 3,
+    'strainprocessing-detail': 2,
+    'strainprocessing-bulk': 6,
+    'strainprocessing-export': 2,
+    'async-strainprocessing-list': 3,
+    'async-strainprocessing-detail': 2,
+    'substanceidentification-list': 3,
+    'substanceidentification-detail': 2,
+    'substanceidentification-bulk': 6,
+    'substanceidentification-export': 2,
+    'async-substanceidentification-list': 3,
+    'async-substanceidentification-detail': 2,
+    'experiments-list': 3,
+    'experiments-detail': 2,
+    'experiments-bulk': 6,
+    'experiments-export': 2,
+    'async-experiments-list': 3,
+    'async-experiments-detail': 2,
+    'cultivationplanning-list': 3,
+    'cultivationplanning-detail': 2,
+    'cultivationplanning-bulk': 6,
+    'cultivationplanning-export': 2,
+    'async-cultivationplanning-list': 3,
+    'async-cultivationplanning-detail': 2,
+    'projects-list': 3,
+    'projects-detail': 2,
+    'projects-bulk': 5,
+    'projects-export': 2,
+    'async-projects-list': 3,
+    'async-projects-detail': 2,
+    'cultures-list': 3,
+    'cultures-detail': 2,
+    'cultures-bulk': 6,
+    'cultures-export': 2,
+    'async-cultures-list': 3,
+    'async-cultures-detail': 2,
+})
+
+
+def url_names():
+    """
+    Get the names of the project URLs, without namespaced ones such as the admin.
+
+    Returns:
+        set: The URL names.
+    """
+    return {name for name in get_resolver().reverse_dict if isinstance(name, str)}
+
+
+@contextmanager
+def query_budget(url_name, using='default'):
+    """
+    Fail if the code in the block runs more queries than a URL name may.
+
+    Args:
+        url_name (str): A key of ``QUERY_BUDGETS``.
+        using (str): The database alias to watch.
+
+    Yields:
+        CaptureQueriesContext: The captured queries.
+
+    Raises:
+        AssertionError: If the URL name has no budget or the budget is exceeded.
+    """
+    if url_name not in QUERY_BUDGETS:
+        raise AssertionError(f'No query budget declared for {url_name!r}.')
+    budget = QUERY_BUDGETS[url_name]
+    captured = CaptureQueriesContext(connections[using])
+    with captured:
+        yield captured
+    count = len(captured)
+    if count > budget:
+        statements = '\n'.join(
+            f'{number}. {query["sql"]}' for number, query in enumerate(captured, start=1)
+        )
+        raise AssertionError(
+            f'{url_name} ran {count} queries, its budget is {budget}:\n{statements}',
+        )
+
+
+class LoggedInTestCase(TestCase):
+    """
+    Test case whose client is logged in as a regular user.
+
+    Attributes:
+        user (CustomUser): The user of ``LOGIN_CREDENTIALS``.
+    """
+
+    def setUp(self):
+        """Create the user and log the client in."""
+        self.user = CustomUser.objects.create_user(**LOGIN_CREDENTIALS)
+        self.client.login(**LOGIN_CREDENTIALS)
+
+
+class APIUsersTestCase(APITestCase):
+    """
+    API test case with a regular user, a superuser and their tokens.
+
+    The client is not authenticated; tests pick the user they act as.
+
+    Attributes:
+        user (CustomUser): The user of ``API_USER_CREDENTIALS``.
+        superuser (CustomUser): The superuser of ``API_ADMIN_CREDENTIALS``.
+        user_token (Token): The token of the user.
+        superuser_token (Token): The token of the superuser.
+    """
+
+    def setUp(self):
+        """Create the users and their tokens."""
+        self.user = CustomUser.objects.create_user(**API_USER_CREDENTIALS)
+        self.superuser = CustomUser.objects.create_superuser(**API_ADMIN_CREDENTIALS)
+        self.user_token = Token.objects.create(user=self.user)
+        self.superuser_token = Token.objects.create(user=self.superuser)
@@ -1,22 +1,17 @@
 """Test for REST API."""
 from biobaseapp.models import CustomUser, Projects, Strains
+from biobaseapp.testing import APIUsersTestCase
 from django.utils.timezone import now
 from rest_framework import status
 from rest_framework.authtoken.models import Token
-from rest_framework.test import APIClient, APITestCase
 
 
-class StrainsAPITest(APITestCase):
+class StrainsAPITest(APIUsersTestCase):
     """Test for REST API for strains."""
 
     def setUp(self):
         """Set up test fixtures, if any."""
-        self.client = APIClient()
-        self.user = CustomUser.objects.create_user(username='user', password='user')
-        self.superuser = CustomUser.objects.create_superuser(username='admin', password='admin')
-
-        self.user_token = Token.objects.create(user=self.user)
-        self.superuser_token = Token.objects.create(user=self.superuser)
+        super().setUp()
 
         self.url = '/api/strains/'
 
@@ -94,17 +89,12 @@ class StrainsAPITest(APITestCase):
         )
 
 
-class StrainProcessingAPITest(APITestCase):
+class StrainProcessingAPITest(APIUsersTestCase):
     """Test suite for Strain Processing API methods."""
 
     def setUp(self):
         """Set up test environment."""
-        self.client = APIClient()
-        self.user = CustomUser.objects.create_user(username='user', password='user')
-        self.superuser = CustomUser.objects.create_superuser(username='admin', password='admin')
-
-        self.user_token = Token.objects.create(user=self.user)
-        self.superuser_token = Token.objects.create(user=self.superuser)
+        super().setUp()
 
         self.url = '/api/strain_processing/'
 
@@ -190,17 +180,12 @@ class StrainProcessingAPITest(APITestCase):
         )
 
 
-class SubstanceIdentificationAPITest(APITestCase):
+class SubstanceIdentificationAPITest(APIUsersTestCase):
     """Test suite for Substance Identification API methods."""
 
     def setUp(self):
         """Set up test environment."""
-        self.client = APIClient()
-        self.user = CustomUser.objects.create_user(username='user', password='user')
-        self.superuser = CustomUser.objects.create_superuser(username='admin', password='admin')
-
-        self.user_token = Token.objects.create(user=self.user)
-        self.superuser_token = Token.objects.create(user=self.superuser)
+        super().setUp()
 
         self.url = '/api/substance_identification/'
 
@@ -286,17 +271,12 @@ class SubstanceIdentificationAPITest(APITestCase):
         )
 
 
-class ExperimentsAPITest(APITestCase):
+class ExperimentsAPITest(APIUsersTestCase):
     """Test Experiments API methods for superuser and user."""
 
     def setUp(self):
         """Set up the test environment for the Experiments API test case."""
-        self.client = APIClient()
-        self.user = CustomUser.objects.create_user(username='user', password='user')
-        self.superuser = CustomUser.objects.create_superuser(username='admin', password='admin')
-
-        self.user_token = Token.objects.create(user=self.user)
-        self.superuser_token = Token.objects.create(user=self.superuser)
+        super().setUp()
 
         self.url = '/api/experiments/'
 
@@ -385,17 +365,12 @@ class ExperimentsAPITest(APITestCase):
         )
 
 
-class CultivationPlanningAPITest(APITestCase):
+class CultivationPlanningAPITest(APIUsersTestCase):
     """Test the Cultivation Planning API methods."""
 
     def setUp(self):
         """Set up the test environment for the Cultivation Planning API test case."""
-        self.client = APIClient()
-        self.user = CustomUser.objects.create_user(username='user', password='user')
-        self.superuser = CustomUser.objects.create_superuser(username='admin', password='admin')
-
-        self.user_token = Token.objects.create(user=self.user)
-        self.superuser_token = Token.objects.create(user=self.superuser)
+        super().setUp()
 
         self.url = '/api/cultivation_planning/'
 
@@ -484,17 +459,12 @@ class CultivationPlanningAPITest(APITestCase):
         )
 
 
-class ProjectsAPITest(APITestCase):
+class ProjectsAPITest(APIUsersTestCase):
     """Test case for Project API methods for superuser and user."""
 
     def setUp(self):
         """Set up the test environment for the Projects API test case."""
-        self.client = APIClient()
-        self.user = CustomUser.objects.create_user(username='user', password='user')
-        self.superuser = CustomUser.objects.create_superuser(username='admin', password='admin')
-
-        self.user_token = Token.objects.create(user=self.user)
-        self.superuser_token = Token.objects.create(user=self.superuser)
+        super().setUp()
 
         self.url = '/api/projects/'
 
@@ -571,17 +541,12 @@ class ProjectsAPITest(APITestCase):
         )
 
 
-class CulturesAPITest(APITestCase):
+class CulturesAPITest(APIUsersTestCase):
     """Test API methods for Cultures model."""
 
     def setUp(self):
         """Set up test environment."""
-        self.client = APIClient()
-        self.user = CustomUser.objects.create_user(username='user', password='user')
-        self.superuser = CustomUser.objects.create_superuser(username='admin', password='admin')
-
-        self.user_token = Token.objects.create(user=self.user)
-        self.superuser_token = Token.objects.create(user=self.superuser)
+        super().setUp()
 
         self.url = '/api/cultures/'
 
@@ -0,0 +1,302 @@
+"""Test for the collection features of the REST API."""
+import csv
+import io
+import json
+from unittest import mock
+
+from biobaseapp.models import Experiments, StrainProcessing, Strains
+from biobaseapp.testing import APIUsersTestCase
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.timezone import now
+from rest_framework import status
+
+# Collections are sized from the planner statistics first on PostgreSQL.
+ESTIMATE_QUERIES = int(connection.vendor == 'postgresql')
+BATCH_SIZE = 20
+ESTIMATE = 50000
+
+
+class PaginationAPITest(APIUsersTestCase):
+    """Test cursor pagination of the list endpoints."""
+
+    def setUp(self):
+        """Set up test environment."""
+        super().setUp()
+        self.client.force_authenticate(user=self.user)
+        self.url = '/api/strains/'
+        for index in range(5):
+            Strains.objects.create(
+                UIN=f'N{index}',
+                name=f'Strain {index}',
+                pedigree='xyz',
+                mutations='abc',
+                transformations='none',
+                creation_date=now().date(),
+                created_by=self.user,
+            )
+
+    def test_pages_cover_table_once(self):
+        """Test that following next links returns every row exactly once."""
+        seen = []
+        url = f'{self.url}?page_size=2'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data['results']), 2)
+            seen.extend(row['id'] for row in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(len(seen), 5)
+        self.assertEqual(seen, sorted(seen))
+
+    def test_newest_first(self):
+        """Test that ?order=newest pages from the last created record."""
+        seen = []
+        url = f'{self.url}?page_size=2&order=newest'
+        while url:
+            response = self.client.get(url)
+            seen.extend(row['UIN'] for row in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(seen, ['N4', 'N3', 'N2', 'N1', 'N0'])
+
+    def test_count_on_request(self):
+        """Test that the collection is only counted with ?count=true."""
+        response = self.client.get(self.url)
+        self.assertNotIn('X-Total-Count', response)
+        response = self.client.get(self.url, {'count': 'true', 'page_size': 2})
+        self.assertEqual(response['X-Total-Count'], '5')
+        self.assertEqual(response['X-Total-Count-Estimated'], 'false')
+
+    def test_estimated_count(self):
+        """Test that large collections report the planner estimate."""
+        with mock.patch('biobaseapp.pagination.planner_estimate', return_value=ESTIMATE):
+            response = self.client.get(self.url, {'count': 'true'})
+            search = self.client.get('/api/strains/search/', {'q': 'abc'})
+        self.assertEqual(response['X-Total-Count'], str(ESTIMATE))
+        self.assertEqual(response['X-Total-Count-Estimated'], 'true')
+        self.assertEqual(search.data['count'], ESTIMATE)
+        self.assertEqual(search['X-Total-Count-Estimated'], 'true')
+
+
+class BulkCreateAPITest(APIUsersTestCase):
+    """Test the bulk create action."""
+
+    def setUp(self):
+        """Set up test environment."""
+        super().setUp()
+        self.url = '/api/strain_processing/bulk/'
+        self.strain = Strains.objects.create(
+            UIN='N876',
+            name='Strain CD',
+            pedigree='sdfg',
+            mutations='dfg',
+            transformations='none',
+            creation_date=now().date(),
+            created_by=self.user,
+        )
+
+    def make_items(self, count: int) -> list:
+        """Build a batch of strain processing items.
+
+        Args:
+            count: number of items
+
+        Returns:
+            list: request items
+        """
+        return [
+            {
+                'strain_id': str(self.strain.id),
+                'processing_date': str(now().date()),
+                'description': f'Run {index}',
+                'created_by': self.superuser.id,
+            }
+            for index in range(count)
+        ]
+
+    def test_bulk_create(self):
+        """Test that a valid batch is inserted with a fixed number of queries."""
+        self.client.force_authenticate(user=self.superuser)
+        with self.assertNumQueries(5):
+            response = self.client.post(self.url, self.make_items(BATCH_SIZE), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], BATCH_SIZE)
+        self.assertEqual(StrainProcessing.objects.count(), BATCH_SIZE)
+
+    def test_bulk_create_reports_item_errors(self):
+        """Test that an invalid item rejects the batch and is reported by index."""
+        self.client.force_authenticate(user=self.superuser)
+        batch = self.make_items(3)
+        batch[1]['strain_id'] = '00000000-0000-0000-0000-000000000000'
+        batch[2]['strain_id'] = 'not-a-uuid'
+        response = self.client.post(self.url, batch, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1, 2])
+        self.assertFalse(StrainProcessing.objects.exists())
+
+    def test_bulk_create_forbidden_for_user(self):
+        """Test that only superusers can bulk create."""
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(self.url, self.make_items(1), format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ExportAPITest(APIUsersTestCase):
+    """Test the streaming export actions."""
+
+    def setUp(self):
+        """Set up test environment."""
+        super().setUp()
+        self.client.force_authenticate(user=self.user)
+        self.strain = Strains.objects.create(
+            UIN='N876',
+            name='Strain, CD',
+            pedigree='sdfg',
+            mutations='dfg',
+            transformations='none',
+            creation_date=now().date(),
+            created_by=self.user,
+        )
+
+    def test_export_csv(self):
+        """Test that strains are streamed as CSV with a header row."""
+        response = self.client.get('/api/strains/export/csv/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        rows = list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(rows[0][:3], ['id', 'UIN', 'name'])
+        self.assertEqual(rows[1][:3], [str(self.strain.id), 'N876', 'Strain, CD'])
+
+    def test_export_ndjson(self):
+        """Test that strains are streamed as one JSON document per line."""
+        response = self.client.get('/api/strains/export/ndjson/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])['created_by'], self.user.id)
+
+    def test_export_unknown_format(self):
+        """Test that unknown formats are not routed."""
+        response = self.client.get('/api/strains/export/xml/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class ConditionalGetAPITest(APIUsersTestCase):
+    """Test ETag and Last-Modified validators of the API."""
+
+    def setUp(self):
+        """Set up test environment."""
+        super().setUp()
+        self.client.force_authenticate(user=self.user)
+        self.url = '/api/strains/'
+        self.strain = Strains.objects.create(
+            UIN='N1',
+            name='Strain 1',
+            pedigree='xyz',
+            mutations='abc',
+            transformations='none',
+            creation_date=now().date(),
+            created_by=self.user,
+        )
+
+    def test_list_not_modified(self):
+        """Test that a current ETag gets 304 without loading the records."""
+        etag = self.client.get(self.url)['ETag']
+        with self.assertNumQueries(1 + ESTIMATE_QUERIES):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_list_modified_after_change(self):
+        """Test that changing a record changes the collection ETag."""
+        etag = self.client.get(self.url)['ETag']
+        self.strain.name = 'Renamed'
+        self.strain.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_list_modified_after_delete(self):
+        """Test that deleting a record changes the collection ETag."""
+        etag = self.client.get(self.url)['ETag']
+        self.strain.delete()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_retrieve_not_modified_since(self):
+        """Test that If-Modified-Since is honoured for a record."""
+        strain_id = self.strain.id
+        last_modified = self.client.get(f'{self.url}{strain_id}/')['Last-Modified']
+        response = self.client.get(
+            f'{self.url}{strain_id}/', HTTP_IF_MODIFIED_SINCE=last_modified,
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+
+class SparseFieldsAPITest(APIUsersTestCase):
+    """Test the fields and expand query parameters."""
+
+    def setUp(self):
+        """Set up test environment."""
+        super().setUp()
+        self.client.force_authenticate(user=self.user)
+        self.url = '/api/strains/'
+        for index in range(3):
+            Strains.objects.create(
+                UIN=f'N{index}',
+                name=f'Strain {index}',
+                pedigree='xyz',
+                mutations='abc',
+                transformations='none',
+                creation_date=now().date(),
+                created_by=self.user,
+            )
+
+    def test_fields_select_only_requested_columns(self):
+        """Test that only the requested fields are loaded and returned."""
+        queries = CaptureQueriesContext(connection)
+        with queries:
+            response = self.client.get(self.url, {'fields': 'id,UIN,name'})
+        self.assertEqual(set(response.data['results'][0]), {'id', 'UIN', 'name'})
+        self.assertNotIn('pedigree', queries[-1]['sql'])
+
+    def test_expand_inlines_public_user(self):
+        """Test that expanded users are joined and expose no credentials."""
+        with self.assertNumQueries(2 + ESTIMATE_QUERIES):
+            response = self.client.get(self.url, {'expand': 'created_by'})
+        created_by = response.data['results'][0]['created_by']
+        self.assertEqual(created_by['username'], 'user')
+        self.assertNotIn('password', created_by)
+
+    def test_expand_with_fields(self):
+        """Test that expanded relations can be combined with a field list."""
+        strain = Strains.objects.first()
+        Experiments.objects.create(
+            strain_UIN=strain,
+            start_date=now().date(),
+            end_date=now().date(),
+            growth_medium='LB',
+            results='ok',
+            created_by=self.user,
+        )
+        response = self.client.get('/api/experiments/', {
+            'fields': 'id,strain_UIN', 'expand': 'strain_UIN',
+        })
+        experiment = response.data['results'][0]
+        self.assertEqual(experiment['strain_UIN']['UIN'], strain.UIN)
+        self.assertEqual(set(experiment), {'id', 'strain_UIN'})
+
+    def test_writes_ignore_fields(self):
+        """Test that a field list does not restrict validation of writes."""
+        self.client.force_authenticate(user=self.superuser)
+        response = self.client.post(f'{self.url}?fields=id', {
+            'UIN': 'N9',
+            'name': 'New Strain',
+            'pedigree': 'xyz',
+            'mutations': 'abc',
+            'transformations': 'none',
+            'creation_date': now().date(),
+            'created_by': self.user.id,
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIn('UIN', response.data)
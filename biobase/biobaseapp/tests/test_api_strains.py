@@ -0,0 +1,211 @@
+"""Test for the strain queries of the REST API: search, mutations and lineage."""
+from biobaseapp.models import StrainLineage, StrainMutation, Strains
+from biobaseapp.testing import APIUsersTestCase
+from django.utils.timezone import now
+from rest_framework import status
+
+
+def join_ids(*strains):
+    """Join the ids of strains for the ``strains`` query parameter.
+
+    Args:
+        strains: the strains
+
+    Returns:
+        str: comma-separated ids
+    """
+    return ','.join(str(strain.id) for strain in strains)
+
+
+class StrainsSearchAPITest(APIUsersTestCase):
+    """Test full-text search over the strain genotype."""
+
+    def setUp(self):
+        """Set up test environment."""
+        super().setUp()
+        self.client.force_authenticate(user=self.user)
+        self.url = '/api/strains/search/'
+        for uin, mutations in (('N1', 'ΔlacZ recA1'), ('N2', 'gyrA96')):
+            Strains.objects.create(
+                UIN=uin,
+                name='Strain',
+                pedigree='xyz',
+                mutations=mutations,
+                transformations='none',
+                creation_date=now().date(),
+                created_by=self.user,
+            )
+
+    def test_search(self):
+        """Test that search returns only matching strains."""
+        response = self.client.get(self.url, {'q': 'ΔlacZ'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['UIN'] for row in response.data['results']], ['N1'])
+        self.assertNotIn('search_vector', response.data['results'][0])
+
+    def test_search_without_query(self):
+        """Test that search requires the q parameter."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class StrainsCarryingAPITest(APIUsersTestCase):
+    """Test finding strains by the mutations they carry."""
+
+    def setUp(self):
+        """Set up test environment."""
+        super().setUp()
+        self.client.force_authenticate(user=self.superuser)
+        self.url = '/api/strains/carrying/'
+        genotypes = (('N1', 'ΔlacZ, recA1'), ('N2', 'ΔlacZ, gyrA96'), ('N3', 'recA1'))
+        for uin, mutations in genotypes:
+            Strains.objects.create(
+                UIN=uin, name='Strain', pedigree='wild type', mutations=mutations,
+                transformations='none', creation_date=now().date(), created_by=self.superuser,
+            )
+
+    def uins(self, query):
+        """Query strains by mutation.
+
+        Args:
+            query: query parameters
+
+        Returns:
+            set: UINs of the strains found
+        """
+        response = self.client.get(self.url, query)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {row['UIN'] for row in response.data['results']}
+
+    def test_all_and_any(self):
+        """Test AND and OR queries."""
+        self.assertEqual(self.uins({'all': 'ΔlacZ,recA1'}), {'N1'})
+        self.assertEqual(self.uins({'any': 'gyrA96, recA1'}), {'N1', 'N2', 'N3'})
+        self.assertEqual(self.uins({'all': 'recA1', 'any': 'gyrA96,ΔlacZ'}), {'N1'})
+        self.assertEqual(self.uins({'all': 'unknown'}), set())
+
+    def test_requires_mutations(self):
+        """Test that a query names at least one mutation."""
+        response = self.client.get(self.url, {'all': ' , '})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_create_links_mutations(self):
+        """Test that bulk created strains are found by mutation."""
+        strains = [
+            {'UIN': f'B{index}', 'name': 'B', 'pedigree': 'wild type',
+             'mutations': 'endA1, recA1', 'transformations': 'T',
+             'creation_date': str(now().date()), 'created_by': self.superuser.id}
+            for index in range(3)
+        ]
+        response = self.client.post('/api/strains/bulk/', strains, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(StrainMutation.objects.filter(strain__UIN__startswith='B').count(), 6)
+        self.assertEqual(self.uins({'all': 'endA1'}), {'B0', 'B1', 'B2'})
+
+
+class StrainTreeTestCase(APIUsersTestCase):
+    """Two branches of strains below a root strain, seen by a superuser."""
+
+    def setUp(self):
+        """Create two branches below a root strain."""
+        super().setUp()
+        self.client.force_authenticate(user=self.superuser)
+        self.root = self.strain('R')
+        self.left = self.strain('L', self.root)
+        self.left_child = self.strain('LC', self.left)
+        self.right = self.strain('RT', self.root)
+
+    def strain(self, uin, parent=None):
+        """Create a strain.
+
+        Args:
+            uin: UIN of the strain
+            parent: parent strain
+
+        Returns:
+            Strains: the strain
+        """
+        return Strains.objects.create(
+            UIN=uin, name=uin, pedigree='wild type', mutations='M', transformations='T',
+            creation_date=now().date(), created_by=self.superuser, parent=parent,
+        )
+
+
+class StrainLineageAPITest(StrainTreeTestCase):
+    """Test the pedigree queries of the strains API."""
+
+    def test_ancestors(self):
+        """Test that ancestors are listed nearest first with their depth."""
+        strain_id = join_ids(self.left_child)
+        response = self.client.get(f'/api/strains/{strain_id}/ancestors/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(row['UIN'], row['depth']) for row in response.data], [('L', 1), ('R', 2)],
+        )
+
+    def test_unknown_strain(self):
+        """Test that unknown and malformed ids are not found."""
+        for pk in ('00000000-0000-0000-0000-000000000000', 'not-a-uuid'):
+            for name in ('ancestors', 'descendants'):
+                response = self.client.get(f'/api/strains/{pk}/{name}/')
+                self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_descendants(self):
+        """Test listing descendants, optionally up to a depth."""
+        root_id = join_ids(self.root)
+        url = f'/api/strains/{root_id}/descendants/'
+        response = self.client.get(url)
+        self.assertEqual(
+            {(row['UIN'], row['depth']) for row in response.data['results']},
+            {('L', 1), ('LC', 2), ('RT', 1)},
+        )
+        response = self.client.get(url, {'max_depth': 1})
+        self.assertEqual({row['UIN'] for row in response.data['results']}, {'L', 'RT'})
+        response = self.client.get(url, {'max_depth': 0})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cycle_rejected(self):
+        """Test that a strain cannot be moved below its own descendant."""
+        strain = {'UIN': 'R', 'name': 'R', 'pedigree': 'LC', 'mutations': 'M',
+                  'transformations': 'T', 'creation_date': str(now().date()),
+                  'created_by': self.superuser.id, 'parent': join_ids(self.left_child)}
+        root_id = join_ids(self.root)
+        response = self.client.put(f'/api/strains/{root_id}/', strain, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('parent', response.data)
+
+    def test_bulk_create_links_strains(self):
+        """Test that bulk created strains get their closure rows."""
+        strains = [
+            {'UIN': f'B{index}', 'name': 'B', 'pedigree': 'L', 'mutations': 'M',
+             'transformations': 'T', 'creation_date': str(now().date()),
+             'created_by': self.superuser.id, 'parent': join_ids(self.left)}
+            for index in range(3)
+        ]
+        response = self.client.post('/api/strains/bulk/', strains, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            StrainLineage.objects.filter(descendant__UIN__startswith='B').count(), 9,
+        )
+
+
+class CommonAncestorAPITest(StrainTreeTestCase):
+    """Test finding the nearest shared ancestor of strains."""
+
+    def test_common_ancestor(self):
+        """Test finding the nearest shared ancestor."""
+        url = '/api/strains/common-ancestor/'
+        response = self.client.get(url, {'strains': join_ids(self.left_child, self.right)})
+        self.assertEqual((response.data['UIN'], response.data['depth']), ('R', 2))
+        response = self.client.get(url, {'strains': join_ids(self.left_child, self.left)})
+        self.assertEqual((response.data['UIN'], response.data['depth']), ('L', 1))
+        other = self.strain('O')
+        response = self.client.get(url, {'strains': join_ids(other, self.left)})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_common_ancestor_needs_two_ids(self):
+        """Test that fewer than two valid ids are rejected."""
+        url = '/api/strains/common-ancestor/'
+        for strains in ('', join_ids(self.left), join_ids(self.left, self.left), 'x,y'):
+            response = self.client.get(url, {'strains': strains})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
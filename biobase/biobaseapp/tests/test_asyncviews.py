@@ -0,0 +1,181 @@
+"""Test the async list views and read-only API."""
+from biobaseapp.authentication import token_cache
+from biobaseapp.models import Experiments, Strains
+from biobaseapp.pagination import EstimatedCountPaginator
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import AsyncClient, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+OK = 200
+NOT_MODIFIED = 304
+UNAUTHORIZED = 401
+NOT_FOUND = 404
+MISSING = '00000000-0000-0000-0000-000000000000'
+
+User = get_user_model()
+
+
+class AsyncViewTestCase(TestCase):
+    """Strains and experiments shared by the async view tests."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        cache.clear()
+        token_cache.clear()
+        self.addCleanup(token_cache.clear)
+        self.user = User.objects.create_user(username='testuser', password='password')
+        self.token = Token.objects.create(user=self.user)
+        self.strains = [
+            Strains.objects.create(
+                UIN=f'UIN{index}', name=f'Strain {index}', pedigree='P', mutations='recA1',
+                transformations='T', creation_date='2024-01-01', created_by=self.user,
+            )
+            for index in range(3)
+        ]
+        Experiments.objects.create(
+            strain_UIN=self.strains[0], start_date='2024-01-01', end_date='2024-01-10',
+            growth_medium='LB', results='ok', created_by=self.user,
+        )
+        self.headers = {'HTTP_AUTHORIZATION': f'Token {self.token.key}'}
+
+
+class AsyncListViewTests(AsyncViewTestCase):
+    """Tests for the async list pages."""
+
+    def test_same_page_as_sync_view(self):
+        """Test that the async list renders the records of the sync list."""
+        self.client.login(username='testuser', password='password')
+        sync = self.client.get(reverse('strains_list'), {'search_type': 'name', 'q': '1'})
+        response = self.client.get(reverse('async_strains_list'),
+                                   {'search_type': 'name', 'q': '1'})
+        self.assertEqual(response.status_code, OK)
+        self.assertEqual(list(response.context['strains']), list(sync.context['strains']))
+        self.assertContains(response, 'UIN1')
+        self.assertNotContains(response, 'UIN2')
+
+    def test_related_records_and_pagination(self):
+        """Test the experiments page with its joined strain and an invalid page."""
+        response = self.client.get(reverse('async_experiments_list'))
+        self.assertContains(response, 'Strain 0')
+        self.assertFalse(response.context['is_paginated'])
+        response = self.client.get(reverse('async_planning_list'), {'page': 5})
+        self.assertEqual(response.status_code, NOT_FOUND)
+
+    def test_conditional_get(self):
+        """Test that the async list answers 304 to a current ETag."""
+        response = self.client.get(reverse('async_strains_list'))
+        response = self.client.get(reverse('async_strains_list'),
+                                   HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, NOT_MODIFIED)
+
+    async def test_async_client(self):
+        """Test the view in an async request handler, as under ASGI."""
+        response = await AsyncClient().get(reverse('async_strains_list'))
+        self.assertEqual(response.status_code, OK)
+        self.assertContains(response, 'UIN2')
+
+    async def test_records_past_underestimate(self):
+        """Test that async pages read one record ahead of an underestimated count."""
+        paginator = EstimatedCountPaginator(Strains.objects.order_by('id'), 2, size=(1, True))
+        first = await paginator.apage(1)
+        self.assertTrue(first.has_next())
+        last = await paginator.apage(2)
+        self.assertEqual([strain.UIN for strain in last], ['UIN2'])
+        self.assertFalse(last.has_next())
+
+
+class AsyncAPITests(AsyncViewTestCase):
+    """Tests for the async read-only API."""
+
+    def test_list_pages_with_cursor(self):
+        """Test that pages are continued with the next and previous links."""
+        url = reverse('async-strains-list')
+        response = self.client.get(url, {'page_size': 2}, **self.headers)
+        self.assertEqual(response.status_code, OK)
+        first = response.json()
+        self.assertEqual(len(first['results']), 2)
+        self.assertIsNone(first['previous'])
+        response = self.client.get(first['next'], **self.headers)
+        second = response.json()
+        self.assertIsNone(second['next'])
+        ids = [item['id'] for item in first['results'] + second['results']]
+        self.assertEqual(ids, sorted(str(strain.id) for strain in self.strains))
+        back = self.client.get(second['previous'], **self.headers).json()
+        self.assertEqual(back['results'], first['results'])
+
+    def test_same_cursors_as_sync_api(self):
+        """Test that the async pages use the cursors of the sync API."""
+        query = {'page_size': 2, 'order': 'newest'}
+        sync = self.client.get(reverse('strains-list'), query, **self.headers).json()
+        first = self.client.get(reverse('async-strains-list'), query, **self.headers).json()
+        self.assertEqual(first['results'], sync['results'])
+        cursor = sync['next'].split('?')[1]
+        self.assertEqual(first['next'].split('?')[1], cursor)
+        second = self.client.get(f"{reverse('async-strains-list')}?{cursor}", **self.headers)
+        self.assertEqual([item['UIN'] for item in second.json()['results']], ['UIN0'])
+
+    def test_newest_first(self):
+        """Test that ?order=newest pages backwards through the ids."""
+        url = reverse('async-strains-list')
+        first = self.client.get(url, {'page_size': 2, 'order': 'newest'}, **self.headers).json()
+        second = self.client.get(first['next'], **self.headers).json()
+        uins = [item['UIN'] for item in first['results'] + second['results']]
+        self.assertEqual(uins, ['UIN2', 'UIN1', 'UIN0'])
+
+    def test_count_on_request(self):
+        """Test the count headers of ?count=true."""
+        response = self.client.get(reverse('async-strains-list'), {'count': 'true'},
+                                   **self.headers)
+        self.assertEqual(response['X-Total-Count'], '3')
+        self.assertEqual(response['X-Total-Count-Estimated'], 'false')
+        response = self.client.get(reverse('async-strains-list'), **self.headers)
+        self.assertNotIn('X-Total-Count', response)
+
+    def test_list_matches_sync_serialization(self):
+        """Test that records are serialized like the sync API, with fields and expand."""
+        params = {'fields': 'id,strain_UIN', 'expand': 'strain_UIN'}
+        sync = self.client.get(reverse('experiments-list'), params, **self.headers).json()
+        response = self.client.get(reverse('async-experiments-list'), params, **self.headers)
+        self.assertEqual(response.json()['results'], sync['results'])
+        self.assertEqual(response.json()['results'][0]['strain_UIN']['UIN'], 'UIN0')
+
+    def test_detail(self):
+        """Test a record, a missing record and the conditional GET."""
+        strain = self.strains[1]
+        response = self.client.get(reverse('async-strains-detail', args=[strain.id]),
+                                   **self.headers)
+        self.assertEqual(response.json()['UIN'], 'UIN1')
+        response = self.client.get(reverse('async-strains-detail', args=[strain.id]),
+                                   HTTP_IF_NONE_MATCH=response['ETag'], **self.headers)
+        self.assertEqual(response.status_code, NOT_MODIFIED)
+        response = self.client.get(reverse('async-strains-detail', args=[MISSING]),
+                                   **self.headers)
+        self.assertEqual(response.status_code, NOT_FOUND)
+
+    def test_requires_token(self):
+        """Test that requests without a valid token are rejected."""
+        response = self.client.get(reverse('async-strains-list'))
+        self.assertEqual(response.status_code, UNAUTHORIZED)
+        self.assertEqual(response['WWW-Authenticate'], 'Token')
+        response = self.client.get(reverse('async-strains-list'),
+                                   HTTP_AUTHORIZATION='Token invalid')
+        self.assertEqual(response.status_code, UNAUTHORIZED)
+
+    def test_invalid_cursor(self):
+        """Test that a malformed cursor is not found, as on the sync API."""
+        response = self.client.get(reverse('async-strains-list'), {'cursor': 'x'},
+                                   **self.headers)
+        self.assertEqual(response.status_code, NOT_FOUND)
+        sync = self.client.get(reverse('strains-list'), {'cursor': 'x'}, **self.headers)
+        self.assertEqual(response.json(), sync.json())
+
+    @override_settings(DEBUG=True)
+    async def test_queries_counted_under_asgi(self):
+        """Test that the instrumentation sees the queries of the async ORM."""
+        response = await AsyncClient().get(
+            reverse('async-strains-list'), headers={'Authorization': f'Token {self.token.key}'},
+        )
+        self.assertEqual(response.status_code, OK)
+        self.assertGreater(int(response['X-DB-Query-Count']), 0)
@@ -0,0 +1,47 @@
+"""Test for the cached token authentication of the REST API."""
+from biobaseapp.authentication import token_cache
+from biobaseapp.testing import APIUsersTestCase
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+
+class CachedTokenAuthenticationTest(APIUsersTestCase):
+    """Test the token authentication cache."""
+
+    def setUp(self):
+        """Set up test environment."""
+        super().setUp()
+        token_cache.clear()
+        self.addCleanup(token_cache.clear)
+        key = self.user_token.key
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {key}')
+        self.url = '/api/strains/'
+
+    def test_repeated_requests_hit_cache(self):
+        """Test that only the first request looks the token up."""
+        first = CaptureQueriesContext(connection)
+        with first:
+            self.client.get(self.url)
+        second = CaptureQueriesContext(connection)
+        with second:
+            response = self.client.get(self.url)
+        self.assertEqual(len(second), len(first) - 1)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(token_cache.stats()['hits'], 1)
+        self.assertEqual(token_cache.stats()['misses'], 1)
+
+    def test_deleted_token_is_rejected(self):
+        """Test that deleting a token invalidates its cache entry."""
+        self.client.get(self.url)
+        self.user_token.delete()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deactivated_user_is_rejected(self):
+        """Test that changing a user invalidates the cached tokens."""
+        self.client.get(self.url)
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
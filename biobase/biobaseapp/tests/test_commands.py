@@ -0,0 +1,428 @@
+"""Test management commands of the biobaseapp app."""
+import datetime
+import json
+import tempfile
+import uuid
+from io import StringIO
+from pathlib import Path
+from unittest import skipIf, skipUnless
+
+from biobaseapp.loadtest import LOGIN, percentile
+from biobaseapp.models import (CultivationPlanning, Cultures, Experiments,
+                               Mutation, Projects, StrainLineage,
+                               StrainMutation, StrainProcessing, Strains,
+                               SubstanceIdentification)
+from biobaseapp.seeding import WILD_TYPE
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import LiveServerTestCase, TestCase
+from django.utils import timezone
+
+User = get_user_model()
+
+STRAINS_CSV = """UIN,name,pedigree,mutations,transformations,creation_date,created_by
+N1,Strain 1,,ΔlacZ,none,2024-01-01,importer
+N2,Strain 2,N1,recA1,none,2024-01-02,importer
+"""
+
+
+class ImportBiobaseCommandTests(TestCase):
+    """Tests for the import_biobase command."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.user = User.objects.create_user(username='importer')
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, name: str, content: str) -> Path:
+        """Write a file into the temporary directory.
+
+        Args:
+            name: file name
+            content: file content
+
+        Returns:
+            Path: path of the file
+        """
+        path = Path(self.directory.name) / name
+        path.write_text(content, encoding='utf-8')
+        return path
+
+    def test_import_csv_resolves_usernames(self):
+        """Test that strains are imported with created_by given as a username."""
+        out = StringIO()
+        call_command('import_biobase', 'Strains', self.write('strains.csv', STRAINS_CSV),
+                     stdout=out)
+        self.assertIn('rows/sec', out.getvalue())
+        self.assertEqual(Strains.objects.filter(created_by=self.user).count(), 2)
+        self.assertEqual(Strains.objects.get(UIN='N1').pedigree, '')
+        self.assertEqual(
+            set(StrainMutation.objects.values_list('strain__UIN', 'mutation__name')),
+            {('N1', 'ΔlacZ'), ('N2', 'recA1')},
+        )
+
+    def test_import_ndjson_resolves_strain_uins(self):
+        """Test that experiments are imported with the strain given as a UIN."""
+        call_command('import_biobase', 'Strains', self.write('strains.csv', STRAINS_CSV),
+                     stdout=StringIO())
+        row = {
+            'strain_UIN': 'N2',
+            'start_date': '2024-01-01',
+            'end_date': '2024-01-10',
+            'growth_medium': 'LB',
+            'results': 'ok',
+            'created_by': self.user.id,
+        }
+        path = self.write('experiments.ndjson', json.dumps(row))
+        call_command('import_biobase', 'Experiments', path, stdout=StringIO())
+        self.assertEqual(Experiments.objects.get().strain_UIN.UIN, 'N2')
+
+    def test_import_skips_existing_ids(self):
+        """Test that importing an export again does not duplicate rows."""
+        call_command('import_biobase', 'Strains', self.write('strains.csv', STRAINS_CSV),
+                     stdout=StringIO())
+        rows = [
+            json.dumps({'id': str(strain.id), 'UIN': strain.UIN, 'name': strain.name,
+                        'pedigree': '', 'mutations': '', 'transformations': '',
+                        'creation_date': '2024-01-01', 'created_by': self.user.id})
+            for strain in Strains.objects.all()
+        ]
+        out = StringIO()
+        call_command('import_biobase', 'Strains', self.write('again.ndjson', '\n'.join(rows)),
+                     stdout=out)
+        self.assertIn('Imported 0 of 2', out.getvalue())
+        self.assertEqual(Strains.objects.count(), 2)
+
+    def test_import_links_parents(self):
+        """Test that imported strains get closure rows for parents given as UINs."""
+        call_command('import_biobase', 'Strains', self.write('strains.csv', STRAINS_CSV),
+                     stdout=StringIO())
+        row = {'UIN': 'N3', 'name': 'Strain 3', 'pedigree': 'N2', 'mutations': '',
+               'transformations': '', 'creation_date': '2024-01-03',
+               'created_by': 'importer', 'parent': 'N2'}
+        call_command('import_biobase', 'Strains', self.write('child.ndjson', json.dumps(row)),
+                     stdout=StringIO())
+        self.assertEqual(StrainLineage.objects.count(), 4)
+        self.assertEqual(
+            StrainLineage.objects.get(descendant__UIN='N3', depth=1).ancestor.UIN, 'N2',
+        )
+
+    def test_import_unknown_username(self):
+        """Test that unknown users abort the whole import."""
+        content = STRAINS_CSV.replace('2024-01-02,importer', '2024-01-02,nobody')
+        with self.assertRaisesMessage(CommandError, "unknown username ['nobody']"):
+            call_command('import_biobase', 'Strains', self.write('strains.csv', content),
+                         stdout=StringIO())
+        self.assertFalse(Strains.objects.exists())
+
+
+class SeedBiobaseCommandTests(TestCase):
+    """Tests for the seed_biobase command."""
+
+    def test_seed_links_all_models(self):
+        """Test that every model is filled with records linked to the strains."""
+        out = StringIO()
+        call_command('seed_biobase', '--strains', '50', '--batch-size', '20', stdout=out)
+        self.assertIn('Created', out.getvalue())
+        self.assertEqual(Strains.objects.count(), 50)
+        self.assertEqual(User.objects.filter(username__startswith='seed').count(), 1)
+        for model in (StrainProcessing, SubstanceIdentification, Experiments,
+                      CultivationPlanning, Projects, Cultures):
+            self.assertTrue(model.objects.exists(), model.__name__)
+        uins = set(Strains.objects.values_list('UIN', flat=True))
+        parents = set(
+            Strains.objects.exclude(pedigree=WILD_TYPE).values_list('pedigree', flat=True),
+        )
+        self.assertTrue(parents)
+        self.assertLessEqual(parents, uins)
+        self.assertEqual(
+            Strains.objects.exclude(pedigree=WILD_TYPE).filter(parent__isnull=True).count(), 0,
+        )
+        self.assertEqual(StrainLineage.objects.filter(depth=0).count(), 50)
+        self.assertEqual(
+            Strains.objects.filter(mutation_links__isnull=True).count(), 0,
+        )
+        self.assertFalse(Strains.objects.filter(creation_date__gt=timezone.now().date()).exists())
+
+    def test_seed_is_reproducible_and_continues_numbering(self):
+        """Test that a second run reuses the users and numbers new strains after the old."""
+        call_command('seed_biobase', '--strains', '10', stdout=StringIO())
+        first = list(Strains.objects.order_by('UIN').values_list('mutations', flat=True))
+        call_command('seed_biobase', '--strains', '10', stdout=StringIO())
+        self.assertEqual(Strains.objects.values('UIN').distinct().count(), 20)
+        self.assertEqual(User.objects.count(), 1)
+        second = Strains.objects.order_by('UIN').values_list('mutations', flat=True)[10:]
+        self.assertEqual(list(second), first)
+
+    def test_seed_rejects_zero_strains(self):
+        """Test that the sizes must be positive."""
+        with self.assertRaises(CommandError):
+            call_command('seed_biobase', '--strains', '0', stdout=StringIO())
+
+
+class BackfillLineageCommandTests(TestCase):
+    """Tests for the backfill_lineage command."""
+
+    def test_links_strains_from_pedigree(self):
+        """Test that parents are read from the pedigree, first with a dry run."""
+        user = User.objects.create_user(username='importer')
+        for uin, pedigree in (('N1', WILD_TYPE), ('N2', 'N1'), ('N3', 'N2 x pUC19'),
+                              ('N4', 'unknown')):
+            Strains.objects.create(
+                UIN=uin, name=uin, pedigree=pedigree, mutations='recA1',
+                transformations='none', creation_date='2024-01-01', created_by=user,
+            )
+        out = StringIO()
+        call_command('backfill_lineage', '--dry-run', stdout=out)
+        self.assertIn('Would link 2 strains.', out.getvalue())
+        self.assertFalse(Strains.objects.filter(parent__isnull=False).exists())
+        call_command('backfill_lineage', stdout=out)
+        self.assertIn('Linked 2 strains.', out.getvalue())
+        self.assertEqual(Strains.objects.get(UIN='N3').parent.UIN, 'N2')
+        self.assertTrue(
+            StrainLineage.objects.filter(ancestor__UIN='N1', descendant__UIN='N3', depth=2)
+            .exists(),
+        )
+
+    def test_rejects_zero_batch_size(self):
+        """Test that the batch size must be positive."""
+        with self.assertRaises(CommandError):
+            call_command('backfill_lineage', '--batch-size', '0', stdout=StringIO())
+
+
+class BackfillMutationsCommandTests(TestCase):
+    """Tests for the backfill_mutations command."""
+
+    def test_links_existing_strains(self):
+        """Test that strains without links are parsed and stale links removed."""
+        user = User.objects.create_user(username='owner')
+        for day, mutations in ((1, 'ΔlacZ, recA1'), (2, 'recA1'), (3, 'none')):
+            Strains.objects.create(
+                UIN=f'N{day}', name=f'Strain {day}', pedigree=WILD_TYPE, mutations=mutations,
+                transformations='none', creation_date=datetime.date(2024, 1, day),
+                created_by=user,
+            )
+        StrainMutation.objects.all().delete()
+        Strains.objects.filter(UIN='N2').update(mutations='gyrA96')
+        out = StringIO()
+        call_command('backfill_mutations', '--batch-size', '2', stdout=out)
+        self.assertIn('Added 3 links; the catalogue has 3 mutations.', out.getvalue())
+        self.assertEqual(
+            list(StrainMutation.objects.filter(strain__UIN='N2')
+                 .values_list('mutation__name', flat=True)),
+            ['gyrA96'],
+        )
+        self.assertEqual(Mutation.objects.count(), 3)
+
+    def test_rejects_zero_batch_size(self):
+        """Test that the batch size must be positive."""
+        with self.assertRaises(CommandError):
+            call_command('backfill_mutations', '--batch-size', '0', stdout=StringIO())
+
+
+class BenchBiobaseCommandTests(TestCase):
+    """Tests for the bench_biobase command."""
+
+    def test_report_covers_cases_and_rolls_back(self):
+        """Test that the report lists every case and the database is left unchanged."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'report.json'
+            call_command('bench_biobase', '--sizes', '10', '--repeat', '1',
+                         '--output', str(path), stdout=StringIO())
+            report = json.loads(path.read_text(encoding='utf-8'))
+            out = StringIO()
+            call_command('bench_biobase', '--sizes', '10', '--repeat', '1',
+                         '--baseline', str(path), stdout=out)
+
+        results = report['sizes']['10']
+        for name in ('strains_list:similar', 'main_menu', 'choose_object',
+                     'strains:list', 'cultures:detail', 'experiments:create'):
+            self.assertIn(name, results)
+        self.assertGreater(results['strains:list']['queries'], 0)
+        self.assertIn('median_ms', results['main_menu'])
+        self.assertIn('strains:create', out.getvalue())
+        self.assertFalse(Strains.objects.exists())
+        self.assertFalse(User.objects.exists())
+
+
+class IndexUsageCommandTests(TestCase):
+    """Tests for the index_usage command and the indexes it reports on."""
+
+    @skipIf(connection.vendor == 'postgresql', 'Tests the rejection of other databases.')
+    def test_requires_postgres(self):
+        """Test that other databases are rejected."""
+        with self.assertRaisesMessage(CommandError, 'only available on PostgreSQL'):
+            call_command('index_usage', stdout=StringIO())
+
+    @skipUnless(connection.vendor == 'postgresql', 'Reads pg_stat_user_indexes.')
+    def test_reports_indexes(self):
+        """Test that the creator/date and BRIN indexes are reported with their usage."""
+        out = StringIO()
+        call_command('index_usage', '--json', stdout=out)
+        rows = {row['index']: row for row in json.loads(out.getvalue())}
+        self.assertTrue(all(row['table'].startswith('biobaseapp_') for row in rows.values()))
+        creator_date = [name for name in rows if name.endswith('_creator_date_idx')]
+        self.assertEqual(len(creator_date), 7)
+        for name in ('experiments_start_date_brin', 'cultivation_planning_date_brin',
+                     'strainproc_processing_date_brin',
+                     'substanceid_identification_date_brin'):
+            with self.subTest(name):
+                self.assertIn(name, rows)
+                self.assertFalse(rows[name]['unique'])
+                self.assertGreater(rows[name]['size'], 0)
+
+        out = StringIO()
+        call_command('index_usage', '--unused', '--json', stdout=out)
+        unused = json.loads(out.getvalue())
+        self.assertFalse([row for row in unused if row['scans'] or row['unique']])
+
+    def test_creator_date_indexes(self):
+        """Test that every model has its (created_by, date) index."""
+        for model, column in ((Strains, 'creation_date'),
+                              (StrainProcessing, 'processing_date'),
+                              (SubstanceIdentification, 'identification_date'),
+                              (Experiments, 'start_date'),
+                              (CultivationPlanning, 'planning_date'),
+                              (Projects, 'start_date'),
+                              (Cultures, 'planning_date')):
+            with self.subTest(model.__name__), connection.cursor() as cursor:
+                constraints = connection.introspection.get_constraints(
+                    cursor, model._meta.db_table,
+                )
+                columns = [
+                    constraint['columns'] for name, constraint in constraints.items()
+                    if name.endswith('_creator_date_idx')
+                ]
+                self.assertEqual(columns, [['created_by_id', column]])
+
+
+class RekeyIdsCommandTests(TestCase):
+    """Tests for the rekey_ids command."""
+
+    def setUp(self):
+        """Create strains with random ids, one of them with processing records."""
+        user = User.objects.create_user(username='owner')
+        self.strains = [
+            Strains.objects.create(
+                id=uuid.uuid4(), UIN=f'N{day}', name=f'Strain {day}', pedigree=WILD_TYPE,
+                mutations='recA1', transformations='none',
+                creation_date=datetime.date(2024, 1, day), created_by=user,
+            )
+            for day in (3, 1, 2, 1)
+        ]
+        self.processing = StrainProcessing.objects.create(
+            id=uuid.uuid4(), strain_id=self.strains[0], processing_date='2024-01-04',
+            description='Freezing', created_by=user,
+        )
+        self.current = Strains.objects.create(
+            UIN='N5', name='Strain 5', pedigree=WILD_TYPE, mutations='recA1',
+            transformations='none', creation_date='2024-01-05', created_by=user,
+        )
+
+    def test_dry_run(self):
+        """Test that a dry run counts the legacy ids and changes nothing."""
+        out = StringIO()
+        call_command('rekey_ids', '--dry-run', stdout=out)
+        self.assertIn('Would change 5 ids.', out.getvalue())
+        self.assertTrue(Strains.objects.filter(pk=self.strains[0].pk).exists())
+
+    def test_ids_follow_dates_and_keep_relations(self):
+        """Test that the new ids sort by date and foreign keys follow them."""
+        out = StringIO()
+        call_command('rekey_ids', '--batch-size', '2', stdout=out)
+        self.assertIn('Changed 5 ids.', out.getvalue())
+        strains = list(Strains.objects.order_by('id'))
+        self.assertTrue(all(strain.id.version == 7 for strain in strains))
+        self.assertEqual(
+            [strain.creation_date for strain in strains],
+            sorted(strain.creation_date for strain in strains),
+        )
+        self.assertEqual(strains[-1].id, self.current.id)
+        processing = StrainProcessing.objects.get()
+        self.assertEqual(processing.id.version, 7)
+        self.assertEqual(processing.strain_id.UIN, 'N3')
+        call_command('rekey_ids', stdout=out)
+        self.assertIn('Changed 0 ids.', out.getvalue())
+
+
+class BenchIdsCommandTests(TestCase):
+    """Tests for the bench_ids command."""
+
+    def test_report(self):
+        """Test that both generators are measured and the scratch tables dropped."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'report.json'
+            call_command('bench_ids', '--rows', '200', '--batch-size', '50',
+                         '--output', str(path), stdout=StringIO())
+            report = json.loads(path.read_text(encoding='utf-8'))
+        self.assertEqual(set(report['generators']), {'uuid4', 'uuid7'})
+        self.assertEqual(report['generators']['uuid7']['rows'], 200)
+        self.assertGreater(report['generators']['uuid4']['rows_per_s'], 0)
+        self.assertFalse([
+            table for table in connection.introspection.table_names()
+            if table.startswith('biobaseapp_bench_ids')
+        ])
+
+
+class LoadtestBiobaseCommandTests(LiveServerTestCase):
+    """Tests for the loadtest_biobase command against a live server."""
+
+    def test_mixed_traffic_report(self):
+        """Test that every kind of traffic succeeds and is reported per URL name."""
+        call_command('seed_biobase', '--strains', '20', stdout=StringIO())
+        out = StringIO()
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'load.json'
+            call_command(
+                'loadtest_biobase', '--url', self.live_server_url, '--password', 'password',
+                '--users', '2', '--concurrency', '2', '--iterations', '8', '--bulk-size', '2',
+                '--output', str(path), stdout=out,
+            )
+            report = json.loads(path.read_text(encoding='utf-8'))
+
+        self.assertIn('p99', out.getvalue())
+        self.assertGreater(report['requests'], 0)
+        self.assertEqual(report['errors'], 0, report['urls'])
+        self.assertIn(LOGIN, report['urls'])
+        self.assertLessEqual(report['urls'][LOGIN]['p50_ms'], report['urls'][LOGIN]['p99_ms'])
+
+    def test_bulk_writes(self):
+        """Test that a fixed number of bulk writes creates their strains."""
+        out = StringIO()
+        call_command(
+            'loadtest_biobase', '--url', self.live_server_url, '--password', 'password',
+            '--users', '1', '--concurrency', '1', '--iterations', '3', '--bulk-size', '2',
+            '--mix', 'bulk=1', stdout=out,
+        )
+        self.assertIn('3 requests, 0 errors', out.getvalue())
+        self.assertEqual(Strains.objects.filter(UIN__startswith='LOAD-').count(), 6)
+
+    def test_async_reads(self):
+        """Test that reads can go through the async views."""
+        out = StringIO()
+        call_command(
+            'loadtest_biobase', '--url', self.live_server_url, '--password', 'password',
+            '--users', '1', '--concurrency', '2', '--duration', '0.5',
+            '--mix', 'search=1,api=1', '--async-reads', stdout=out,
+        )
+        self.assertIn('async', out.getvalue())
+        self.assertIn(' 0 errors', out.getvalue())
+
+    def test_invalid_mix(self):
+        """Test that unknown kinds of traffic are rejected."""
+        with self.assertRaisesMessage(CommandError, 'Invalid mix entry'):
+            call_command('loadtest_biobase', '--password', 'password', '--mix', 'crawl=1',
+                         stdout=StringIO())
+        with self.assertRaisesMessage(CommandError, '--iterations must be positive'):
+            call_command('loadtest_biobase', '--password', 'password', '--iterations', '0',
+                         stdout=StringIO())
+
+    def test_percentile(self):
+        """Test the nearest-rank percentiles."""
+        values = list(range(1, 101))
+        self.assertEqual([percentile(values, rank) for rank in (50, 95, 99)], [50, 95, 99])
+        self.assertEqual(percentile([7], 99), 7)
+        self.assertEqual(percentile([], 50), 0)
@@ -0,0 +1,111 @@
+"""Test the read replica router."""
+from biobaseapp.dbrouters import (PRIMARY, STICKY_COOKIE, ReplicaRouter,
+                                  RoutingState, mark_sticky, request_routing)
+from biobaseapp.models import Strains
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.test import (RequestFactory, TestCase, TransactionTestCase,
+                         override_settings)
+from django.urls import reverse
+
+REPLICA = 'replica1'
+
+User = get_user_model()
+
+
+@override_settings(DATABASE_REPLICAS=[REPLICA])
+class ReplicaRouterTests(TransactionTestCase):
+    """Tests for ReplicaRouter, outside of the transaction TestCase wraps tests in."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        cache.clear()
+        self.router = ReplicaRouter()
+        self.request = RequestFactory().get('/strains/')
+
+    def route(self, use_replica=True):
+        """Run the test inside a request routing state.
+
+        Args:
+            use_replica: whether the request may read from replicas
+
+        Returns:
+            RoutingState: the state
+        """
+        state = RoutingState(self.request, use_replica)
+        token = request_routing.set(state)
+        self.addCleanup(request_routing.reset, token)
+        return state
+
+    def test_reads_outside_requests_use_primary(self):
+        """Test that commands and tests read from the primary."""
+        self.assertIsNone(self.router.db_for_read(Strains))
+
+    def test_safe_request_reads_from_replica(self):
+        """Test that safe requests read from a replica."""
+        self.route()
+        self.assertEqual(self.router.db_for_read(Strains), REPLICA)
+
+    def test_unsafe_request_reads_from_primary(self):
+        """Test that unsafe requests read from the primary."""
+        self.route(use_replica=False)
+        self.assertIsNone(self.router.db_for_read(Strains))
+
+    def test_reads_after_write_use_primary(self):
+        """Test that a request reads its own writes."""
+        state = self.route()
+        self.assertEqual(self.router.db_for_write(Strains), PRIMARY)
+        self.assertTrue(state.wrote)
+        self.assertIsNone(self.router.db_for_read(Strains))
+
+    def test_reads_in_transaction_use_primary(self):
+        """Test that reads inside a transaction see its writes."""
+        self.route()
+        with transaction.atomic():
+            self.assertIsNone(self.router.db_for_read(Strains))
+
+    def test_sticky_user_reads_from_primary(self):
+        """Test that a user who wrote recently reads from the primary."""
+        user = User.objects.create_user(username='testuser', password='password')
+        mark_sticky(user.pk)
+        self.request.user = user
+        self.route()
+        self.assertIsNone(self.router.db_for_read(Strains))
+
+    def test_no_migrations_on_replicas(self):
+        """Test that replicas are never migrated."""
+        self.assertFalse(self.router.allow_migrate(REPLICA, 'biobaseapp'))
+        self.assertIsNone(self.router.allow_migrate(PRIMARY, 'biobaseapp'))
+
+
+class ReplicaRoutingMiddlewareTests(TestCase):
+    """Tests for ReplicaRoutingMiddleware, with the primary standing in as a replica."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        cache.clear()
+        self.user = User.objects.create_user(username='testuser', password='password')
+        self.client.login(username='testuser', password='password')
+
+    @override_settings(DATABASE_REPLICAS=[PRIMARY])
+    def test_write_makes_client_sticky(self):
+        """Test that a write keeps the next requests of the client on the primary."""
+        response = self.client.post(reverse('create_all'), {
+            'model': 'strains',
+            'UIN': 'UIN12345',
+            'name': 'Test Strain',
+            'pedigree': 'Pedigree info',
+            'mutations': 'Mutations info',
+            'transformations': 'Transformations info',
+            'creation_date': '2024-01-01',
+            'created_by': self.user.id,
+        })
+        self.assertTrue(Strains.objects.filter(UIN='UIN12345').exists())
+        self.assertIn(STICKY_COOKIE, response.cookies)
+
+    @override_settings(DATABASE_REPLICAS=[PRIMARY])
+    def test_read_does_not_make_client_sticky(self):
+        """Test that reads leave the client on the replicas."""
+        response = self.client.get(reverse('strains_list'))
+        self.assertNotIn(STICKY_COOKIE, response.cookies)
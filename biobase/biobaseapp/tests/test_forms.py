@@ -0,0 +1,40 @@
+"""Test forms.py module."""
+from unittest import mock
+
+from biobaseapp.models import CustomUser
+from biobaseapp.testing import LOGIN_CREDENTIALS
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+
+
+class LoginFormTests(TestCase):
+    """Tests for the queries of the login form."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        self.user = CustomUser.objects.create_user(**LOGIN_CREDENTIALS)
+
+    def test_login_hashes_password_once(self):
+        """Test that a login checks the password a single time."""
+        with mock.patch.object(CustomUser, 'check_password', autospec=True,
+                               side_effect=CustomUser.check_password) as check_password:
+            self.client.post(reverse('login'), dict(LOGIN_CREDENTIALS))
+            self.assertEqual(check_password.call_count, 1)
+
+    def test_login_writes_token_only_when_changed(self):
+        """Test that repeated logins do not rewrite the stored token."""
+        credentials = dict(LOGIN_CREDENTIALS)
+        self.client.post(reverse('login'), credentials)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.token, Token.objects.get(user=self.user).key)
+        self.client.logout()
+        queries = CaptureQueriesContext(connection)
+        with queries:
+            self.client.post(reverse('login'), credentials)
+        self.assertFalse([
+            query for query in queries
+            if query['sql'].startswith('UPDATE') and '"token"' in query['sql']
+        ])
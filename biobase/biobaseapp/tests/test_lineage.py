@@ -0,0 +1,153 @@
+"""Test the closure table of the strain pedigree and the pedigree backfill."""
+from biobaseapp.lineage import link_new, rebuild
+from biobaseapp.models import StrainLineage, Strains
+from biobaseapp.pedigree import (AMBIGUOUS, LINKED, UNRESOLVED, backfill,
+                                 pedigree_parent)
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.utils import timezone
+
+User = get_user_model()
+
+
+class LineageTestCase(TestCase):
+    """A chain of strains shared by the lineage tests: root, child, grandchild."""
+
+    def setUp(self):
+        """Create a chain of strains: root, child, grandchild."""
+        self.user = User.objects.create_user(username='testuser')
+        self.root = self.strain('R')
+        self.child = self.strain('C', self.root)
+        self.grandchild = self.strain('G', self.child)
+
+    def strain(self, uin, parent=None, pedigree='wild type'):
+        """Create a strain.
+
+        Args:
+            uin: UIN of the strain
+            parent: parent strain
+            pedigree: pedigree text
+
+        Returns:
+            Strains: the strain
+        """
+        return Strains.objects.create(
+            UIN=uin, name=uin, pedigree=pedigree, mutations='M', transformations='T',
+            creation_date=timezone.now().date(), created_by=self.user, parent=parent,
+        )
+
+    def links(self):
+        """Read the closure rows as UIN pairs.
+
+        Returns:
+            set: tuples of the ancestor UIN, descendant UIN and depth
+        """
+        return set(StrainLineage.objects.values_list('ancestor__UIN', 'descendant__UIN', 'depth'))
+
+
+class StrainLineageTests(LineageTestCase):
+    """Tests for keeping the closure table in step with the parents."""
+
+    def test_links_on_create(self):
+        """Test that new strains are linked to all their ancestors."""
+        self.assertEqual(self.links(), {
+            ('R', 'R', 0), ('C', 'C', 0), ('G', 'G', 0),
+            ('R', 'C', 1), ('C', 'G', 1), ('R', 'G', 2),
+        })
+
+    def test_move_subtree(self):
+        """Test that a new parent moves the strain with its descendants."""
+        other = self.strain('O')
+        self.child.parent = other
+        self.child.save()
+        self.assertEqual(self.links(), {
+            ('R', 'R', 0), ('C', 'C', 0), ('G', 'G', 0), ('O', 'O', 0),
+            ('O', 'C', 1), ('C', 'G', 1), ('O', 'G', 2),
+        })
+        self.child.parent = None
+        self.child.save()
+        self.assertNotIn(('O', 'G', 2), self.links())
+        self.assertIn(('C', 'G', 1), self.links())
+
+    def test_delete_detaches_children(self):
+        """Test that deleting a strain leaves its children as roots."""
+        self.child.delete()
+        self.grandchild.refresh_from_db()
+        self.assertIsNone(self.grandchild.parent)
+        self.assertEqual(self.links(), {('R', 'R', 0), ('G', 'G', 0)})
+
+    def test_cycle_rejected(self):
+        """Test that a strain cannot become a descendant of itself."""
+        self.root.parent = self.grandchild
+        with self.assertRaises(ValidationError):
+            self.root.full_clean()
+        with self.assertRaises(ValidationError):
+            self.root.save()
+        self.assertIsNone(Strains.objects.get(pk=self.root.pk).parent)
+
+
+class LineageBatchTests(LineageTestCase):
+    """Tests for linking many strains at once."""
+
+    def test_link_new_with_parents_in_batch(self):
+        """Test bulk inserted strains whose parents are older or in the same batch."""
+        first = Strains(UIN='B1', name='B1', pedigree='C', mutations='M', transformations='T',
+                        creation_date=timezone.now().date(), created_by=self.user,
+                        parent=self.child)
+        second = Strains(UIN='B2', name='B2', pedigree='B1', mutations='M',
+                         transformations='T', creation_date=timezone.now().date(),
+                         created_by=self.user, parent=first)
+        Strains.objects.bulk_create([second, first])
+        with self.assertNumQueries(2):
+            self.assertEqual(link_new([second, first]), 7)
+        self.assertLessEqual({
+            ('R', 'B2', 3), ('C', 'B2', 2), ('B1', 'B2', 1), ('B2', 'B2', 0),
+            ('R', 'B1', 2), ('C', 'B1', 1), ('B1', 'B1', 0),
+        }, self.links())
+
+    def test_rebuild(self):
+        """Test that the closure can be rebuilt from the parents."""
+        before = self.links()
+        StrainLineage.objects.all().delete()
+        self.assertEqual(rebuild(), 6)
+        self.assertEqual(self.links(), before)
+
+    def test_rebuild_branches(self):
+        """Test that rebuilding links every branch of a generation."""
+        self.strain('C2', self.root)
+        self.strain('G2', self.child)
+        before = self.links()
+        StrainLineage.objects.all().delete()
+        self.assertEqual(rebuild(), len(before))
+        self.assertEqual(self.links(), before)
+
+
+class PedigreeBackfillTests(LineageTestCase):
+    """Tests for reading the parents from the pedigree text."""
+
+    def test_pedigree_parent(self):
+        """Test reading the parent UIN from pedigree text."""
+        parents = {'BB1': 1, 'BB2': None, 'BB3': 3}
+        self.assertEqual(pedigree_parent('derived from BB1 x pUC19', 'BB9', parents), (1, LINKED))
+        self.assertEqual(pedigree_parent('BB2', 'BB9', parents), (None, AMBIGUOUS))
+        self.assertEqual(pedigree_parent('BB2; BB3', 'BB9', parents), (3, LINKED))
+        self.assertEqual(pedigree_parent('BB1', 'BB1', parents), (None, UNRESOLVED))
+        self.assertEqual(pedigree_parent('from the lab', 'BB9', parents), (None, UNRESOLVED))
+
+    def test_backfill(self):
+        """Test linking strains from their pedigree and rebuilding the closure."""
+        linked = self.strain('L', pedigree='G (transformed)')
+        pedigrees = (
+            ('D1', 'wild type'), ('D1', 'wild type'), ('A', 'D1'), ('U', 'unknown'), ('W', 'WT'),
+        )
+        for uin, pedigree in pedigrees:
+            self.strain(uin, pedigree=pedigree)
+
+        counts = backfill(dry_run=True)
+        self.assertEqual(counts, {LINKED: 1, AMBIGUOUS: 1, UNRESOLVED: 1})
+        self.assertIsNone(Strains.objects.get(pk=linked.pk).parent)
+
+        self.assertEqual(backfill(batch_size=2), counts)
+        self.assertEqual(Strains.objects.get(pk=linked.pk).parent, self.grandchild)
+        self.assertIn(('R', 'L', 3), self.links())
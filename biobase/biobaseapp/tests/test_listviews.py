@@ -0,0 +1,200 @@
+"""Test listviews.py module."""
+from unittest import mock
+
+from biobaseapp.models import CultivationPlanning, Experiments, Strains
+from biobaseapp.pagination import EstimatedCountPaginator
+from biobaseapp.testing import LoggedInTestCase
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+OK = 200
+NOT_MODIFIED = 304
+ESTIMATE = 20000
+
+User = get_user_model()
+
+
+class EstimatedCountListViewTests(LoggedInTestCase):
+    """Tests for the estimated counts of the list pages."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        super().setUp()
+        for index in range(3):
+            Strains.objects.create(
+                UIN=f'UIN{index}', name=f'Strain {index}', pedigree='P', mutations='M',
+                transformations='T', creation_date='2024-01-01', created_by=self.user,
+            )
+
+    def test_exact_count(self):
+        """Test that collections without an estimate are counted once."""
+        queries = CaptureQueriesContext(connection)
+        with queries:
+            response = self.client.get(reverse('strains_list'))
+        self.assertEqual(len([query for query in queries if 'COUNT(' in query['sql']]), 1)
+        self.assertEqual(response['X-Total-Count'], '3')
+        self.assertEqual(response['X-Total-Count-Estimated'], 'false')
+        self.assertContains(response, 'из 1<')
+
+    @mock.patch('biobaseapp.pagination.planner_estimate', return_value=ESTIMATE)
+    def test_estimated_count(self, estimate):
+        """Test that large collections use the planner estimate without a COUNT.
+
+        Args:
+            estimate: mock of the planner estimate
+        """
+        queries = CaptureQueriesContext(connection)
+        with queries:
+            response = self.client.get(reverse('strains_list'))
+        self.assertEqual(response['X-Total-Count'], str(ESTIMATE))
+        self.assertEqual(response['X-Total-Count-Estimated'], 'true')
+        self.assertContains(response, 'из ~2000<')
+        self.assertFalse([query for query in queries if 'COUNT(' in query['sql'].upper()])
+
+    @mock.patch('biobaseapp.pagination.planner_estimate', return_value=ESTIMATE)
+    def test_pages_after_estimate(self, estimate):
+        """Test that pages past the estimated end are served, not 404.
+
+        Args:
+            estimate: mock of the planner estimate
+        """
+        response = self.client.get(reverse('experiments_list'), {'page': 3})
+        self.assertEqual(response.status_code, OK)
+        self.assertContains(response, 'of ~')
+        response = self.client.get(reverse('async_planning_list'), {'page': 3})
+        self.assertEqual(response.status_code, OK)
+        self.assertEqual(response['X-Total-Count-Estimated'], 'true')
+
+    def test_records_past_underestimate(self):
+        """Test that records past an estimate below the real count stay reachable."""
+        paginator = EstimatedCountPaginator(Strains.objects.order_by('id'), 2, size=(1, True))
+        first = paginator.page(1)
+        self.assertEqual(paginator.num_pages, 1)
+        self.assertTrue(first.has_next())
+        last = paginator.page(first.next_page_number())
+        self.assertEqual([strain.UIN for strain in last], ['UIN2'])
+        self.assertFalse(last.has_next())
+        self.assertEqual(last.end_index(), 3)
+
+
+class ConditionalListViewTests(LoggedInTestCase):
+    """Tests for conditional GET on the list pages."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        super().setUp()
+        self.strain = Strains.objects.create(
+            UIN='UIN12345',
+            name='Test Strain',
+            pedigree='Pedigree info',
+            mutations='Mutations info',
+            transformations='Transformations info',
+            creation_date='2024-01-01',
+            created_by=self.user,
+        )
+        CultivationPlanning.objects.create(
+            strain_ID=self.strain,
+            planning_date='2024-01-01',
+            completion_date='2024-01-10',
+            growth_medium='Medium info',
+            status='Planned',
+            created_by=self.user,
+        )
+
+    def test_list_not_modified(self):
+        """Test that a current ETag gets 304."""
+        etag = self.client.get(reverse('strains_list'))['ETag']
+        response = self.client.get(reverse('strains_list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, NOT_MODIFIED)
+
+    def test_related_change_modifies_list(self):
+        """Test that renaming a strain changes the pages that show it."""
+        etag = self.client.get(reverse('planning_list'))['ETag']
+        self.strain.name = 'Renamed Strain'
+        self.strain.save()
+        response = self.client.get(reverse('planning_list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, OK)
+        self.assertContains(response, 'Renamed Strain')
+
+    @mock.patch('biobaseapp.pagination.planner_estimate', return_value=ESTIMATE)
+    def test_deletion_modifies_estimated_list(self, estimate):
+        """Test that deleting an older record changes the ETag of an estimated collection.
+
+        Args:
+            estimate: mock of the planner estimate
+        """
+        Strains.objects.create(
+            UIN='UIN67890', name='Newer Strain', pedigree='P', mutations='M',
+            transformations='T', creation_date='2024-01-02', created_by=self.user,
+        )
+        etag = self.client.get(reverse('strains_list'))['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.strain.delete()
+        response = self.client.get(reverse('strains_list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, OK)
+        self.assertNotContains(response, 'UIN12345')
+
+
+class ListQueryCountTests(LoggedInTestCase):
+    """Tests that the list pages run a fixed number of queries."""
+
+    def add_rows(self, count: int):
+        """Create strains with a planning and an experiment each.
+
+        Args:
+            count: number of strains
+        """
+        start = Strains.objects.count()
+        for index in range(start, start + count):
+            owner = User.objects.create_user(username=f'owner{index}')
+            strain = Strains.objects.create(
+                UIN=f'UIN{index}',
+                name='Test Strain',
+                pedigree='Pedigree info',
+                mutations='Mutations info',
+                transformations='Transformations info',
+                creation_date='2024-01-01',
+                created_by=owner,
+            )
+            CultivationPlanning.objects.create(
+                strain_ID=strain,
+                planning_date='2024-01-01',
+                completion_date='2024-01-10',
+                growth_medium='Medium info',
+                status='Planned',
+                created_by=owner,
+            )
+            Experiments.objects.create(
+                strain_UIN=strain,
+                start_date='2024-01-01',
+                end_date='2024-01-10',
+                growth_medium='Medium info',
+                results='Results info',
+                created_by=owner,
+            )
+
+    def count_queries(self, url_name: str) -> int:
+        """Count the queries of rendering a list page.
+
+        Args:
+            url_name: name of the list URL
+
+        Returns:
+            int: number of queries
+        """
+        queries = CaptureQueriesContext(connection)
+        with queries:
+            response = self.client.get(reverse(url_name))
+        self.assertEqual(response.status_code, OK)
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        """Test that more rows on a page do not add queries."""
+        url_names = ('strains_list', 'planning_list', 'experiments_list')
+        self.add_rows(1)
+        few = [self.count_queries(url_name) for url_name in url_names]
+        self.add_rows(5)
+        many = [self.count_queries(url_name) for url_name in url_names]
+        self.assertEqual(few, many)
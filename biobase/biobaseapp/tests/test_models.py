@@ -1,13 +1,27 @@
 """Test for models in the biobaseapp app."""
+import datetime
+import uuid
+from types import MappingProxyType
+from unittest import mock
+
+from biobaseapp.ids import COUNTER_MAX, id_ordering, uuid7, uuid7_time
 from biobaseapp.models import (CultivationPlanning, Cultures, Experiments,
-                               Projects, StrainProcessing, Strains,
+                               Mutation, Projects, StrainMutation,
+                               StrainProcessing, Strains,
                                SubstanceIdentification)
+from biobaseapp.mutations import carrying, mutation_names, sync_mutations
 from django.contrib.auth import get_user_model
 from django.test import TestCase
 from django.utils import timezone
 
 User = get_user_model()
 
+TIME_NS = 'biobaseapp.ids.time.time_ns'
+LAST_ID = 'biobaseapp.ids._last'
+NO_LAST_ID = MappingProxyType({'millis': -1, 'counter': 0})
+NOW_NS = 1700000000000000000
+MOMENT = datetime.datetime.fromisoformat('2024-01-02T03:04:05+00:00')
+
 
 class ModelTests(TestCase):
     """Tests for the models in the biobaseapp app."""
@@ -101,3 +115,138 @@ class ModelTests(TestCase):
             created_by=self.user,
         )
         self.assertEqual(culture.results, 'Culture results')
+
+
+class Uuid7Tests(TestCase):
+    """Tests for the time-ordered primary keys."""
+
+    def test_default_primary_key(self):
+        """Test that new records get version 7 ids."""
+        user = User.objects.create_user(username='testuser')
+        project = Projects.objects.create(
+            project_name='Project', start_date=timezone.now().date(),
+            end_date=timezone.now().date(), results='R', created_by=user,
+        )
+        self.assertEqual(project.id.version, 7)
+        self.assertEqual(project.id.variant, uuid.RFC_4122)
+
+    @mock.patch.dict(LAST_ID, NO_LAST_ID)
+    def test_ids_follow_creation_order(self):
+        """Test that ids of the same millisecond and after the counter overflows stay ordered."""
+        with mock.patch(TIME_NS, return_value=NOW_NS):
+            ids = [uuid7() for _ in range(COUNTER_MAX + 10)]
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(len(set(ids)), len(ids))
+
+    def test_clock_going_back(self):
+        """Test that an earlier clock does not produce an earlier id."""
+        first = uuid7()
+        with mock.patch(TIME_NS, return_value=0):
+            self.assertGreater(uuid7(), first)
+
+    @mock.patch.dict(LAST_ID, NO_LAST_ID)
+    def test_uuid7_time(self):
+        """Test reading the creation time back from an id."""
+        nanoseconds = int(MOMENT.timestamp()) * 10 ** 9
+        with mock.patch(TIME_NS, return_value=nanoseconds):
+            generated = uuid7()
+        self.assertEqual(uuid7_time(generated), MOMENT)
+        self.assertIsNone(uuid7_time(uuid.uuid4()))
+
+    def test_id_ordering(self):
+        """Test the order query parameter values."""
+        self.assertEqual(id_ordering('newest'), '-id')
+        self.assertEqual(id_ordering('oldest'), 'id')
+        self.assertEqual(id_ordering('random'), 'id')
+        self.assertEqual(id_ordering(None), 'id')
+
+
+class MutationCatalogueTests(TestCase):
+    """Tests for the mutation catalogue parsed from the genotype text."""
+
+    def setUp(self):
+        """Create strains with overlapping mutations."""
+        self.user = User.objects.create_user(username='testuser', password='password')
+        self.first = self.strain('N1', 'ΔlacZ, recA1')
+        self.second = self.strain('N2', 'ΔlacZ gyrA96')
+        self.third = self.strain('N3', 'recA1; gyrA96')
+
+    def strain(self, uin, mutations):
+        """Create a strain.
+
+        Args:
+            uin: UIN of the strain
+            mutations: genotype text
+
+        Returns:
+            Strains: the strain
+        """
+        return Strains.objects.create(
+            UIN=uin, name=uin, pedigree='wild type', mutations=mutations,
+            transformations='T', creation_date=timezone.now().date(), created_by=self.user,
+        )
+
+    def carried(self, strain):
+        """Read the mutations linked to a strain.
+
+        Args:
+            strain: the strain
+
+        Returns:
+            set: mutation names
+        """
+        return set(strain.mutation_links.values_list('mutation__name', flat=True))
+
+    def uins(self, queryset):
+        """Read the UINs of strains.
+
+        Args:
+            queryset: the strains
+
+        Returns:
+            set: UINs
+        """
+        return set(queryset.values_list('UIN', flat=True))
+
+    def test_mutation_names(self):
+        """Test splitting the genotype text."""
+        self.assertEqual(
+            mutation_names('ΔlacZ, recA1;gyrA96  ΔlacZ'), ['ΔlacZ', 'recA1', 'gyrA96'],
+        )
+        self.assertEqual(mutation_names('wild type'), [])
+        self.assertEqual(mutation_names('none'), [])
+        self.assertEqual(mutation_names(''), [])
+
+    def test_links_follow_saves(self):
+        """Test that links are added on create and replaced when the text changes."""
+        self.assertEqual(self.carried(self.first), {'ΔlacZ', 'recA1'})
+        self.assertEqual(Mutation.objects.count(), 3)
+        self.first.mutations = 'recA1, endA1'
+        self.first.save()
+        self.assertEqual(self.carried(self.first), {'recA1', 'endA1'})
+        self.first.delete()
+        self.assertEqual(StrainMutation.objects.count(), 4)
+
+    def test_sync_unchanged_strains(self):
+        """Test that strains whose links are current take two queries."""
+        strains = list(Strains.objects.all())
+        with self.assertNumQueries(2):
+            self.assertEqual(sync_mutations(strains), 0)
+
+    def test_carrying_all(self):
+        """Test AND queries."""
+        strains = Strains.objects.all()
+        self.assertEqual(self.uins(carrying(strains, every=['ΔlacZ'])), {'N1', 'N2'})
+        self.assertEqual(self.uins(carrying(strains, every=['ΔlacZ', 'recA1'])), {'N1'})
+        self.assertEqual(self.uins(carrying(strains, every=['ΔlacZ', 'endA1'])), set())
+
+    def test_carrying_any(self):
+        """Test OR queries and their combination with AND."""
+        strains = Strains.objects.all()
+        self.assertEqual(
+            self.uins(carrying(strains, either=['recA1', 'gyrA96', 'endA1'])), {'N1', 'N2', 'N3'},
+        )
+        self.assertEqual(
+            self.uins(carrying(strains, every=['gyrA96'], either=['ΔlacZ', 'endA1'])), {'N2'},
+        )
+        self.assertEqual(self.uins(carrying(strains, either=['endA1'])), set())
@@ -0,0 +1,270 @@
+"""Test that every URL stays within its query budget."""
+from biobaseapp.authentication import token_cache
+from biobaseapp.models import (CultivationPlanning, Cultures, Experiments,
+                               Projects, StrainProcessing, Strains,
+                               SubstanceIdentification)
+from biobaseapp.testing import QUERY_BUDGETS, query_budget, url_names
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+ROWS = 12
+TODAY = '2024-01-01'
+LATER = '2024-01-10'
+
+User = get_user_model()
+
+API_MODELS = {
+    'strains': Strains,
+    'strainprocessing': StrainProcessing,
+    'substanceidentification': SubstanceIdentification,
+    'experiments': Experiments,
+    'cultivationplanning': CultivationPlanning,
+    'projects': Projects,
+    'cultures': Cultures,
+}
+
+
+class QueryBudgetTests(TestCase):
+    """Request every URL name with a dozen rows per table inside its budget."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        cache.clear()
+        token_cache.clear()
+        self.addCleanup(token_cache.clear)
+        self.user = User.objects.create_superuser(username='admin', password='password')
+        self.client.login(username='admin', password='password')
+        self.api = APIClient()
+        self.api.credentials(
+            HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}',
+        )
+        for index in range(ROWS):
+            owner = User.objects.create_user(username=f'owner{index}')
+            self.create_records(index, owner)
+        self.objects = {basename: model.objects.first() for basename, model in API_MODELS.items()}
+
+    def create_records(self, index: int, owner):
+        """Create one record of every model.
+
+        Args:
+            index: number of the record
+            owner: user who created the records
+        """
+        values = self.values(index, owner)
+        strain = Strains.objects.create(**values['strains'])
+        project = Projects.objects.create(**values['projects'])
+        for basename, model in API_MODELS.items():
+            if basename not in {'strains', 'projects'}:
+                model.objects.create(**self.bind(values[basename], strain, project))
+
+    def bind(self, values: dict, strain, project) -> dict:
+        """Replace relation ids with objects.
+
+        Args:
+            values: field values
+            strain: related strain
+            project: related project
+
+        Returns:
+            dict: field values for ``objects.create``
+        """
+        related = {'strain_id': strain, 'strain_UIN': strain, 'strain_ID': strain,
+                   'project_id': project}
+        return {name: related.get(name, value) for name, value in values.items()}
+
+    def values(self, index: int, owner) -> dict:
+        """Build valid field values of every model.
+
+        Args:
+            index: number of the record
+            owner: user who created the records
+
+        Returns:
+            dict: field values per API basename
+        """
+        strain = self.objects['strains'].id if hasattr(self, 'objects') else None
+        project = self.objects['projects'].id if hasattr(self, 'objects') else None
+        return {
+            'strains': {'UIN': f'UIN{index}', 'name': f'Strain {index}', 'pedigree': 'P',
+                        'mutations': 'M', 'transformations': 'T', 'creation_date': TODAY,
+                        'created_by': owner},
+            'strainprocessing': {'strain_id': strain, 'processing_date': TODAY,
+                                 'description': 'D', 'created_by': owner},
+            'substanceidentification': {'strain_id': strain, 'identification_date': TODAY,
+                                        'results': 'R', 'created_by': owner},
+            'experiments': {'strain_UIN': strain, 'start_date': TODAY, 'end_date': LATER,
+                            'growth_medium': 'LB', 'results': 'R', 'created_by': owner},
+            'cultivationplanning': {'strain_ID': strain, 'planning_date': TODAY,
+                                    'completion_date': LATER, 'growth_medium': 'LB',
+                                    'status': 'Planned', 'created_by': owner},
+            'projects': {'project_name': f'Project {index}', 'start_date': TODAY,
+                         'end_date': LATER, 'results': 'R', 'created_by': owner},
+            'cultures': {'project_id': project, 'planning_date': TODAY, 'results': 'R',
+                         'created_by': owner},
+        }
+
+    def test_every_url_name_has_a_budget(self):
+        """Test that new URLs cannot be added without a budget."""
+        self.assertEqual(url_names() - set(QUERY_BUDGETS), set())
+
+    def test_pages_within_budget(self):
+        """Test the HTML pages."""
+        experiment = self.objects['experiments']
+        requests = {
+            'index': (reverse('index'), {}),
+            'create_all': (reverse('create_all'), {'model': 'experiments'}),
+            'choose_model': (reverse('choose_model'), {}),
+            'choose_object': (reverse('choose_object', args=['Strains']), {}),
+            'autocomplete': (reverse('autocomplete', args=['Strains']), {'q': 'UIN'}),
+            'edit_model': (reverse('edit_model', args=['Experiments', experiment.id]), {}),
+            'db_status': (reverse('db_status'), {}),
+            'strains_list': (reverse('strains_list'), {}),
+            'planning_list': (reverse('planning_list'), {}),
+            'experiments_list': (reverse('experiments_list'), {}),
+            'async_strains_list': (reverse('async_strains_list'), {}),
+            'async_planning_list': (reverse('async_planning_list'), {}),
+            'async_experiments_list': (reverse('async_experiments_list'), {}),
+        }
+        for url_name, (url, params) in requests.items():
+            with self.subTest(url_name), query_budget(url_name):
+                self.assertEqual(self.client.get(url, params).status_code, 200)
+
+    def test_login_and_logout_within_budget(self):
+        """Test the session views."""
+        with query_budget('logout'):
+            self.client.get(reverse('logout'))
+        with query_budget('login'):
+            response = self.client.post(reverse('login'), {
+                'username': 'admin', 'password': 'password',
+            })
+        self.assertEqual(response.status_code, 302)
+
+    def test_api_within_budget(self):
+        """Test the API endpoints of every model."""
+        with query_budget('api-root'):
+            self.api.get(reverse('api-root'))
+        with query_budget('strains-search'):
+            self.api.get(reverse('strains-search'), {'q': 'Strain'})
+        with query_budget('strains-carrying'):
+            response = self.api.get(reverse('strains-carrying'), {'all': 'M'})
+            self.assertEqual(len(response.data['results']), ROWS)
+        for basename, instance in self.objects.items():
+            with self.subTest(basename):
+                self.check_api(basename, instance)
+
+    def test_lineage_within_budget(self):
+        """Test the pedigree queries, which read the closure table once."""
+        parent, child = Strains.objects.order_by('id')[:2]
+        child.parent = parent
+        child.save()
+        with query_budget('strains-ancestors'):
+            response = self.api.get(reverse('strains-ancestors', args=[child.id]))
+            self.assertEqual(len(response.data), 1)
+        with query_budget('strains-ancestors'):
+            response = self.api.get(reverse('strains-ancestors', args=[parent.id]))
+            self.assertEqual(response.data, [])
+        with query_budget('strains-descendants'):
+            response = self.api.get(reverse('strains-descendants', args=[parent.id]))
+            self.assertEqual(len(response.data['results']), 1)
+        with query_budget('strains-descendants'):
+            response = self.api.get(reverse('strains-descendants', args=[child.id]))
+            self.assertEqual(response.data['results'], [])
+        with query_budget('strains-common-ancestor'):
+            response = self.api.get(
+                reverse('strains-common-ancestor'), {'strains': f'{parent.id},{child.id}'},
+            )
+            self.assertEqual(response.data['id'], str(parent.id))
+
+    def check_api(self, basename: str, instance):
+        """Request the endpoints of one model.
+
+        Args:
+            basename: router basename
+            instance: an existing record
+        """
+        with query_budget(f'{basename}-list'):
+            self.assertEqual(self.api.get(reverse(f'{basename}-list')).status_code, 200)
+        with query_budget(f'{basename}-detail'):
+            response = self.api.get(reverse(f'{basename}-detail', args=[instance.id]))
+            self.assertEqual(response.status_code, 200)
+        with query_budget(f'async-{basename}-list'):
+            response = self.api.get(reverse(f'async-{basename}-list'))
+            self.assertEqual(response.status_code, 200)
+        with query_budget(f'async-{basename}-detail'):
+            response = self.api.get(reverse(f'async-{basename}-detail', args=[instance.id]))
+            self.assertEqual(response.status_code, 200)
+        with query_budget(f'{basename}-export'):
+            response = self.api.get(reverse(f'{basename}-export', args=['ndjson']))
+            b''.join(response.streaming_content)
+        items = [self.payload(basename, index) for index in range(ROWS)]
+        with query_budget(f'{basename}-bulk'):
+            response = self.api.post(reverse(f'{basename}-bulk'), items, format='json')
+            self.assertEqual(response.status_code, 201, response.data)
+
+    def payload(self, basename: str, index: int) -> dict:
+        """Build one API item.
+
+        Args:
+            basename: router basename
+            index: number of the item
+
+        Returns:
+            dict: the item
+        """
+        values = self.values(ROWS + index, self.user)[basename]
+        return {
+            name: str(value.pk if hasattr(value, 'pk') else value)
+            for name, value in values.items()
+        }
+
+
+class QueryBudgetHelperTests(TestCase):
+    """Tests for the query_budget helper."""
+
+    def test_unknown_url_name(self):
+        """Test that a URL name needs a declared budget."""
+        with self.assertRaisesMessage(AssertionError, 'No query budget'):
+            with query_budget('missing'):
+                pass
+
+    def test_budget_exceeded(self):
+        """Test that running more queries than the budget fails with the SQL."""
+        with self.assertRaisesMessage(AssertionError, 'choose_object ran 2 queries'):
+            with query_budget('choose_object'):
+                list(Strains.objects.all())
+                list(Projects.objects.all())
+
+
+class QueryInstrumentationMiddlewareTests(TestCase):
+    """Tests for QueryInstrumentationMiddleware."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        cache.clear()
+        User.objects.create_user(username='testuser', password='password')
+        self.client.login(username='testuser', password='password')
+
+    @override_settings(DEBUG=True)
+    def test_debug_headers(self):
+        """Test that DEBUG responses report the queries of the request."""
+        response = self.client.get(reverse('strains_list'))
+        self.assertGreater(int(response['X-DB-Query-Count']), 0)
+        self.assertIn('X-DB-Time-Ms', response)
+        self.assertIn('X-DB-Slowest-SQL', response)
+
+    def test_no_headers_in_production(self):
+        """Test that queries are logged instead of exposed."""
+        with self.assertLogs('biobaseapp.queries', level='INFO') as logs:
+            response = self.client.get(reverse('strains_list'))
+        self.assertNotIn('X-DB-Query-Count', response)
+        self.assertIn('queries=', logs.output[0])
+
+    @override_settings(QUERY_WARN_COUNT=0)
+    def test_warns_over_threshold(self):
+        """Test that requests over the query threshold log a warning."""
+        with self.assertLogs('biobaseapp.queries', level='WARNING'):
+            self.client.get(reverse('strains_list'))
@@ -0,0 +1,46 @@
+"""Test the search modes of the strains list page."""
+from biobaseapp.models import Strains
+from biobaseapp.testing import LoggedInTestCase
+from django.urls import reverse
+
+OK = 200
+
+
+class StrainsSearchViewTests(LoggedInTestCase):
+    """Tests for the search modes of the strains list view."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        super().setUp()
+        for uin, name in (('UIN-100', 'Escherichia coli'), ('UIN-200', 'Bacillus subtilis')):
+            Strains.objects.create(
+                UIN=uin,
+                name=name,
+                pedigree='Pedigree info',
+                mutations='Mutations info',
+                transformations='Transformations info',
+                creation_date='2024-01-01',
+                created_by=self.user,
+            )
+
+    def test_name_search(self):
+        """Test substring search by name."""
+        response = self.client.get(reverse('strains_list'), {'search_type': 'name', 'q': 'COLI'})
+        self.assertEqual(response.status_code, OK)
+        self.assertEqual([strain.UIN for strain in response.context['strains']], ['UIN-100'])
+
+    def test_similarity_search_matches_uin(self):
+        """Test similarity search matches the strain UIN as well as the name."""
+        response = self.client.get(reverse('strains_list'), {'search_type': 'similar', 'q': '200'})
+        self.assertEqual(response.status_code, OK)
+        self.assertEqual([strain.UIN for strain in response.context['strains']], ['UIN-200'])
+
+    def test_genotype_search(self):
+        """Test search by the genotype text fields."""
+        Strains.objects.filter(UIN='UIN-200').update(mutations='ΔlacZ')
+        response = self.client.get(reverse('strains_list'), {
+            'search_type': 'genotype',
+            'q': 'ΔlacZ',
+        })
+        self.assertEqual(response.status_code, OK)
+        self.assertEqual([strain.UIN for strain in response.context['strains']], ['UIN-200'])
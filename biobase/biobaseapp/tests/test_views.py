@@ -2,7 +2,9 @@
 from biobaseapp.forms import StrainsForm
 from biobaseapp.models import (CultivationPlanning, Experiments, Projects,
                                Strains, SubstanceIdentification)
+from biobaseapp.testing import LoggedInTestCase
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.test import Client, TestCase
 from django.urls import reverse
 from django.utils import timezone
@@ -10,19 +12,19 @@ from django.utils import timezone
 OK = 200
 ERROR = 400
 MOVED = 302
+FORBIDDEN = 403
+NOT_FOUND = 404
 
 User = get_user_model()
 
 
-class MainMenuViewTests(TestCase):
+class MainMenuViewTests(LoggedInTestCase):
     """Test Main Menu View."""
 
     def setUp(self):
         """Set up test environment."""
-        self.client = Client()
-        self.user = User.objects.create_user(
-            username='testuser', password='password')
-        self.client.login(username='testuser', password='password')
+        cache.clear()
+        super().setUp()
         self.strain = Strains.objects.create(
             UIN='UIN12345',
             name='Test Strain',
@@ -73,6 +75,28 @@ class MainMenuViewTests(TestCase):
         self.assertContains(response, 'Identification results')
         self.assertContains(response, 'Experiment results')
         self.assertContains(response, 'Test Project')
+        self.assertEqual(response.context['counts']['strains'], 1)
+
+    def test_main_menu_is_cached(self):
+        """Test that a repeated visit does not query the records again."""
+        self.client.get(reverse('index'))
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('index'))
+        self.assertContains(response, 'Test Strain')
+
+    def test_main_menu_invalidated_on_change(self):
+        """Test that creating a record refreshes the cached data."""
+        self.client.get(reverse('index'))
+        with self.captureOnCommitCallbacks(execute=True):
+            Projects.objects.create(
+                project_name='Second Project',
+                start_date='2024-01-01',
+                results='Project results',
+                created_by=self.user,
+            )
+        response = self.client.get(reverse('index'))
+        self.assertContains(response, 'Second Project')
+        self.assertEqual(response.context['counts']['projects'], 2)
 
 
 class LoginViewTests(TestCase):
@@ -118,15 +142,24 @@ class LoginViewTests(TestCase):
         self.assertTemplateUsed(response, 'login.html')
         self.assertContains(response, 'Форма неверно заполнена.')
 
+    def test_login_view_post_inactive_user(self):
+        """Test that inactive users cannot log in."""
+        self.user.is_active = False
+        self.user.save()
+        response = self.client.post(reverse('login'), {
+            'username': 'testuser',
+            'password': 'password',
+        })
+        self.assertEqual(response.status_code, OK)
+        self.assertContains(response, 'Форма неверно заполнена.')
+
 
-class ViewTests(TestCase):
+class ViewTests(LoggedInTestCase):
     """Tests for the views of the app."""
 
     def setUp(self):
         """Set up the test environment."""
-        self.client = Client()
-        self.user = User.objects.create_user(username='testuser', password='password')
-        self.client.login(username='testuser', password='password')
+        super().setUp()
         self.strain = Strains.objects.create(
             UIN='UIN12345',
             name='Test Strain',
@@ -143,6 +176,17 @@ class ViewTests(TestCase):
         self.assertEqual(response.status_code, OK)
         self.assertTemplateUsed(response, 'strains_list.html')
 
+    def test_strains_list_newest_first(self):
+        """Test that ?order=newest lists the last created strain first."""
+        newer = Strains.objects.create(
+            UIN='UIN67890', name='Newer Strain', pedigree='P', mutations='M',
+            transformations='T', creation_date=timezone.now().date(), created_by=self.user,
+        )
+        response = self.client.get(reverse('strains_list'), {'order': 'newest'})
+        self.assertEqual(list(response.context['strains']), [newer, self.strain])
+        response = self.client.get(reverse('strains_list'))
+        self.assertEqual(list(response.context['strains']), [self.strain, newer])
+
     def test_cultivation_planning_list_view(self):
         """Test the cultivation planning list view."""
         response = self.client.get(reverse('planning_list'))
@@ -168,14 +212,12 @@ class ViewTests(TestCase):
         self.assertTemplateUsed(response, 'login.html')
 
 
-class CreateAllViewTests(TestCase):
+class CreateAllViewTests(LoggedInTestCase):
     """Tests for the CreateAllView."""
 
     def setUp(self):
         """Set up the test case."""
-        self.client = Client()
-        self.user = User.objects.create_user(username='testuser', password='password')
-        self.client.login(username='testuser', password='password')
+        super().setUp()
         self.strains_data = {
             'UIN': 'UIN12345',
             'name': 'Test Strain',
@@ -225,15 +267,9 @@ class CreateAllViewTests(TestCase):
         self.assertEqual(response.status_code, ERROR)
 
 
-class ChooseModelViewTests(TestCase):
+class ChooseModelViewTests(LoggedInTestCase):
     """Tests for the ChooseModelView."""
 
-    def setUp(self):
-        """Set up the test environment."""
-        self.client = Client()
-        self.user = User.objects.create_user(username='testuser', password='password')
-        self.client.login(username='testuser', password='password')
-
     def test_choose_model_get(self):
         """Test the GET request to ChooseModelView."""
         response = self.client.get(reverse('choose_model'))
@@ -249,14 +285,12 @@ class ChooseModelViewTests(TestCase):
         self.assertRedirects(response, reverse('choose_object', kwargs={'model_name': 'Strains'}))
 
 
-class ChooseObjectViewTests(TestCase):
+class ChooseObjectViewTests(LoggedInTestCase):
     """Tests for the ChooseObjectView."""
 
     def setUp(self):
         """Set up the test environment."""
-        self.client = Client()
-        self.user = User.objects.create_user(username='testuser', password='password')
-        self.client.login(username='testuser', password='password')
+        super().setUp()
         self.strain = Strains.objects.create(
             UIN='UIN12345',
             name='Test Strain',
@@ -283,15 +317,66 @@ class ChooseObjectViewTests(TestCase):
         self.assertRedirects(response, reverse('edit_model', kwargs={'model_name': 'Strains',
                                                                      'object_id': self.strain.id}))
 
+    def test_choose_object_post_invalid_id(self):
+        """Test that a malformed object id re-renders the picker."""
+        url = reverse('choose_object', kwargs={'model_name': 'Strains'})
+        response = self.client.post(url, {'object_id': 'not-a-uuid'})
+        self.assertEqual(response.status_code, OK)
+        self.assertContains(response, 'Выберите объект.')
 
-class EditModelViewTests(TestCase):
+
+class AutocompleteViewTests(LoggedInTestCase):
+    """Tests for the autocomplete view."""
+
+    def setUp(self):
+        """Set up the test environment."""
+        super().setUp()
+        for number in range(5):
+            Strains.objects.create(
+                UIN=f'UIN{number}',
+                name=f'Strain {number}',
+                pedigree='',
+                mutations='',
+                transformations='',
+                creation_date='2024-01-01',
+                created_by=self.user,
+            )
+        self.url = reverse('autocomplete', kwargs={'model_name': 'Strains'})
+
+    def test_autocomplete_pages_by_id(self):
+        """Test that pages follow each other without gaps or repeats."""
+        with self.settings(AUTOCOMPLETE_PAGE_SIZE=2):
+            first = self.client.get(self.url).json()
+            second = self.client.get(self.url, {'after': first['next']}).json()
+            third = self.client.get(self.url, {'after': second['next']}).json()
+        ids = [option['id'] for page in (first, second, third) for option in page['results']]
+        self.assertEqual(ids, [str(pk) for pk in Strains.objects.order_by('id').values_list(
+            'id', flat=True,
+        )])
+        self.assertIsNone(third['next'])
+
+    def test_autocomplete_filters_by_label(self):
+        """Test that only objects whose label contains the text are returned."""
+        response = self.client.get(self.url, {'q': 'uin3'})
+        self.assertEqual([option['text'] for option in response.json()['results']], ['UIN3'])
+
+    def test_autocomplete_requires_login(self):
+        """Test that anonymous users get no data."""
+        self.client.logout()
+        self.assertEqual(self.client.get(self.url).status_code, FORBIDDEN)
+
+    def test_autocomplete_unknown_model(self):
+        """Test that unknown models are not found."""
+        response = self.client.get(reverse('autocomplete', kwargs={'model_name': 'Nope'}))
+        self.assertEqual(response.status_code, NOT_FOUND)
+
+
+class EditModelViewTests(LoggedInTestCase):
     """Tests for the EditModelView."""
 
     def setUp(self):
         """Set up the test environment."""
-        self.client = Client()
-        self.user = User.objects.create_user(username='testuser', password='password')
-        self.client.login(username='testuser', password='password')
+        super().setUp()
         self.strain = Strains.objects.create(
             UIN='UIN12345',
             name='Test Strain',
@@ -339,3 +424,51 @@ class EditModelViewTests(TestCase):
             'strains-created_by': self.user.id,
         })
         self.assertEqual(response.status_code, OK)
+
+    def test_edit_model_renders_selected_strain(self):
+        """Test that foreign key selects hold only the current object."""
+        Strains.objects.create(
+            UIN='OTHER999',
+            name='Other Strain',
+            pedigree='',
+            mutations='',
+            transformations='',
+            creation_date='2024-01-01',
+            created_by=self.user,
+        )
+        experiment = Experiments.objects.create(
+            strain_UIN=self.strain,
+            start_date='2024-01-01',
+            end_date='2024-01-10',
+            growth_medium='LB',
+            results='ok',
+            created_by=self.user,
+        )
+        response = self.client.get(reverse('edit_model', kwargs={'model_name': 'Experiments',
+                                                                 'object_id': experiment.id}))
+        strain_id = self.strain.id
+        self.assertContains(response, f'<option value="{strain_id}" selected>UIN12345')
+        self.assertContains(response, reverse('autocomplete', kwargs={'model_name': 'Strains'}))
+        self.assertContains(response, 'autocomplete.js')
+        self.assertNotContains(response, 'OTHER999')
+
+
+class DbStatusViewTests(TestCase):
+    """Tests for the database status view."""
+
+    def test_db_status_for_staff(self):
+        """Test that staff users see the connection settings of each alias."""
+        User.objects.create_superuser(username='admin', password='password')
+        self.client.login(username='admin', password='password')
+        response = self.client.get(reverse('db_status'))
+        self.assertEqual(response.status_code, OK)
+        stats = response.json()
+        self.assertIn('conn_max_age', stats['databases']['default'])
+        self.assertIsNone(stats['databases']['default']['pool'])
+        self.assertIn('hits', stats['token_cache'])
+
+    def test_db_status_forbidden_for_users(self):
+        """Test that other users get no stats."""
+        User.objects.create_user(username='testuser', password='password')
+        self.client.login(username='testuser', password='password')
+        self.assertEqual(self.client.get(reverse('db_status')).status_code, FORBIDDEN)
@@ -0,0 +1,48 @@
+"""Validators of the date fields of the biobaseapp models."""
+import datetime
+
+from django.core.exceptions import ValidationError
+from django.utils import timezone
+
+
+def validate_date_future(current):
+    """
+    Validate if the given date is in the future.
+
+    Args:
+        current: A date to be validated.
+
+    Raises:
+        ValidationError: If the date is in the future.
+    """
+    if current > timezone.now().date():
+        raise ValidationError('Date cannot be in the future.')
+
+
+def validate_end_date_not_before_start_date(current, start_date):
+    """
+    Validate that the end date is not before the start date.
+
+    Args:
+        current (datetime.date): The current date.
+        start_date (datetime.date): The start date.
+
+    Raises:
+        ValidationError: If the end date is before the start date.
+    """
+    if current < start_date:
+        raise ValidationError('End date cannot be before start date.')
+
+
+def validate_date(current):
+    """
+    Validate if the given date is of type datetime.date.
+
+    Args:
+        current: The date to be validated.
+
+    Raises:
+        ValidationError: If the date is not of type datetime.date.
+    """
+    if not isinstance(current, datetime.date):
+        raise ValidationError('Invalid date.')
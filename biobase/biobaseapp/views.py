@@ -1,31 +1,27 @@
 """Views for app."""
+import uuid
 from typing import Callable
 
-from django.contrib.auth import authenticate, login, logout
-from django.http import HttpResponseBadRequest
+from django.contrib.auth import login, logout
+from django.db import connections
+from django.http import Http404, HttpResponseBadRequest, JsonResponse
 from django.shortcuts import get_object_or_404, redirect, render
-from django.views.generic import ListView
-from rest_framework import viewsets
-from rest_framework.authentication import TokenAuthentication
-from rest_framework.permissions import BasePermission
 
+from .authentication import token_cache
+from .autocomplete import AUTOCOMPLETE_MODELS, lookup
+from .dashboard import get_dashboard
 from .forms import (CultivationPlanningForm, CulturesForm, ExperimentsForm,
                     LoginForm, ProjectsForm, StrainProcessingForm, StrainsForm,
                     SubstanceIdentificationForm)
 from .models import (CultivationPlanning, Cultures, Experiments, Projects,
                      StrainProcessing, Strains, SubstanceIdentification)
-from .serializers import (CultivationPlanningSerializer, CulturesSerializer,
-                          ExperimentsSerializer, ProjectsSerializer,
-                          StrainProcessingSerializer, StrainsSerializer,
-                          SubstanceIdentificationSerializer)
+from .postgres import connection_stats
 
-ID = 'id'
 POST = 'POST'
-SEARCH_TYPE = 'search_type'
 QUERY = 'q'
-DATE_FROM = 'date_from'
-DATE_TO = 'date_to'
-CREATED = 'created_by'
+AFTER = 'after'
+FORBIDDEN = 403
+MODEL_BACKEND = 'django.contrib.auth.backends.ModelBackend'
 
 MODEL_FORMS = {
     'Strains': StrainsForm,
@@ -47,9 +43,6 @@ MODEL_CLASSES = {
     'Cultures': Cultures,
 }
 
-safe_methods = 'GET', 'HEAD', 'OPTIONS'
-unsafe_methods = 'POST', 'DELETE', 'PUT'
-
 
 def check_auth(view: Callable) -> Callable:
     """
@@ -70,182 +63,13 @@ def check_auth(view: Callable) -> Callable:
     return new_view
 
 
-class MyPermission(BasePermission):
-    """
-    Custom permission class for checking user permissions.
-
-    Allows only authenticated users to perform safe methods (GET, HEAD, OPTIONS).
-    Allows only superusers to perform unsafe methods (POST, DELETE, PUT).
-    """
-
-    def has_permission(self, request, _):
-        """
-        Check if user has permission to perform the request.
-
-        Args:
-            request: request object
-
-        Returns:
-            bool: True if user is authenticated, False otherwise
-
-        """
-        if request.method in safe_methods:
-            return bool(request.user and request.user.is_authenticated)
-        elif request.method in unsafe_methods:
-            return bool(request.user and request.user.is_superuser)
-        return False
-
-
-def create_viewset(model_class, serializer):
-    """
-    Create a viewset for a given model class and serializer.
-
-    Args:
-        model_class (type): The model class to create the viewset for.
-        serializer (type): The serializer class to use for the viewset.
-
-    Returns:
-        type: The created viewset class.
-
-    """
-    class ViewSet(viewsets.ModelViewSet):
-        queryset = model_class.objects.all()
-        serializer_class = serializer
-        permission_classes = [MyPermission]
-        authentication_classes = [TokenAuthentication]
-
-    return ViewSet
-
-
-StrainViewSet = create_viewset(Strains, StrainsSerializer)
-StrainProcessingViewSet = create_viewset(StrainProcessing, StrainProcessingSerializer)
-SubstanceViewSet = create_viewset(
-    SubstanceIdentification, SubstanceIdentificationSerializer,
-)
-ExperimentsViewSet = create_viewset(Experiments, ExperimentsSerializer)
-CultivationViewSet = create_viewset(CultivationPlanning, CultivationPlanningSerializer)
-ProjectsViewSet = create_viewset(Projects, ProjectsSerializer)
-CulturesViewSet = create_viewset(Cultures, CulturesSerializer)
-
-
-class StrainsListView(ListView):
-    """A view that displays a list of strains with pagination and search functionality."""
-
-    model = Strains
-    template_name = 'strains_list.html'
-    context_object_name = 'strains'
-    paginate_by = 10
-
-    def get_queryset(self):
-        """
-        Get the queryset for the view.
-
-        Returns:
-            QuerySet: The queryset for the view.
-        """
-        queryset = super().get_queryset().order_by(ID)
-        search_type = self.request.GET.get(SEARCH_TYPE)
-        query = self.request.GET.get(QUERY)
-        date_from = self.request.GET.get(DATE_FROM)
-        date_to = self.request.GET.get(DATE_TO)
-        responsible = self.request.GET.get(CREATED)
-
-        if search_type == 'name' and query:
-            queryset = queryset.filter(name__icontains=query)
-        elif search_type == 'date' and date_from and date_to:
-            queryset = queryset.filter(creation_date__range=[date_from, date_to])
-        elif search_type == CREATED and responsible:
-            queryset = queryset.filter(created_by__username__icontains=responsible)
-
-        return queryset
-
-
-class CultivationPlanningListView(ListView):
-    """A view display a list of plannings with pagination and search functionality."""
-
-    model = CultivationPlanning
-    template_name = 'planning_list.html'
-    context_object_name = 'plannings'
-    paginate_by = 10
-
-    def get_queryset(self):
-        """
-        Get the queryset for the view.
-
-        Returns:
-            QuerySet: The queryset for the view.
-        """
-        queryset = super().get_queryset().order_by('id')
-        search_type = self.request.GET.get('search_type')
-        query = self.request.GET.get('q')
-        date_from = self.request.GET.get('date_from')
-        date_to = self.request.GET.get('date_to')
-        responsible = self.request.GET.get(CREATED)
-
-        if search_type == 'name' and query:
-            queryset = queryset.filter(strain_ID__name__icontains=query)
-        elif search_type == 'date' and date_from and date_to:
-            queryset = queryset.filter(planning_date__range=[date_from, date_to])
-        elif search_type == CREATED and responsible:
-            queryset = queryset.filter(created_by__username__icontains=responsible)
-
-        return queryset
-
-
-class ExperimentsListView(ListView):
-    """A view that displays a list of experiments with pagination and search functionality."""
-
-    model = Experiments
-    template_name = 'experiments_list.html'
-    context_object_name = 'experiments'
-    paginate_by = 10
-
-    def get_queryset(self):
-        """
-        Get the queryset for the view.
-
-        Returns:
-            QuerySet: The queryset for the view.
-        """
-        queryset = super().get_queryset().order_by(ID)
-        search_type = self.request.GET.get(SEARCH_TYPE)
-        query = self.request.GET.get(QUERY)
-        date_from = self.request.GET.get(DATE_FROM)
-        date_to = self.request.GET.get(DATE_TO)
-        responsible = self.request.GET.get(CREATED)
-
-        if search_type == 'name' and query:
-            queryset = queryset.filter(strain_UIN__name__icontains=query)
-        elif search_type == 'date' and date_from and date_to:
-            queryset = queryset.filter(start_date__range=[date_from, date_to])
-        elif search_type == CREATED and responsible:
-            queryset = queryset.filter(created_by__username__icontains=responsible)
-
-        return queryset
-
-    def get_context_data(self, **kwargs):
-        """
-        Get the context data for the view.
-
-        Args:
-            kwargs: The keyword arguments.
-
-        Returns:
-            dict: The context data for the view.
-        """
-        context = super().get_context_data(**kwargs)
-        context['search_type'] = self.request.GET.get(SEARCH_TYPE, '')
-        context['q'] = self.request.GET.get(QUERY, '')
-        context['date_from'] = self.request.GET.get(DATE_FROM, '')
-        context['date_to'] = self.request.GET.get(DATE_TO, '')
-        context['responsible'] = self.request.GET.get(CREATED, '')
-        return context
-
-
 def main_menu(request):
     """
     Render the main menu page with the user's data.
 
+    The page shows how many records of each type the user has and the most
+    recent of them; the data is cached per user, see ``dashboard.py``.
+
     Args:
         request (HttpRequest): The HTTP request object.
 
@@ -253,20 +77,13 @@ def main_menu(request):
         HttpResponse: The rendered main menu page with the user's data.
     """
     user = request.user
-    strains = Strains.objects.filter(created_by=user)
-    plans = CultivationPlanning.objects.filter(created_by=user)
-    identifications = SubstanceIdentification.objects.filter(created_by=user)
-    experiments = Experiments.objects.filter(created_by=user)
-    projects = Projects.objects.filter(created_by=user)
+    if not user.is_authenticated:
+        return redirect('login')
     return render(
         request,
         'index.html',
         {
-            'strains': strains,
-            'plans': plans,
-            'identifications': identifications,
-            'experiments': experiments,
-            'projects': projects,
+            **get_dashboard(user),
             'user': user,
         },
     )
@@ -287,15 +104,9 @@ def login_view(request):
     if request.method == POST:
         form = LoginForm(request.POST)
         if form.is_valid():
-            login_data = form.cleaned_data
-            user = authenticate(
-                request,
-                username=login_data['username'],
-                password=login_data['password'],
-            )
-            if user is not None:
-                login(request, user)
-                return redirect('index')
+            # The form has already checked the password; authenticate() would hash it again.
+            login(request, form.get_user(), backend=MODEL_BACKEND)
+            return redirect('index')
         else:
             error_message = 'Форма неверно заполнена.'
     else:
@@ -402,6 +213,9 @@ def choose_object(request, model_name):
     """
     View function that handles the selection of an object from a given model.
 
+    Only the first page of objects is rendered; the picker loads the others
+    from the ``autocomplete`` view as the user types or scrolls.
+
     Args:
         request (HttpRequest): The HTTP request object containing the request data.
         model_name (str): The name of the model.
@@ -413,42 +227,76 @@ def choose_object(request, model_name):
     Raises:
     HttpResponseRedirect: If the model class is not found, it redirects to the 'choose_model' view.
     """
-    model_class = MODEL_CLASSES.get(model_name)
-    if not model_class:
+    if model_name not in MODEL_CLASSES:
         return redirect('choose_model')
 
-    object_str_methods = {
-        'Strains': 'UIN',
-        'StrainProcessing': 'description',
-        'SubstanceIdentification': 'results',
-        'Experiments': 'results',
-        'CultivationPlanning': 'status',
-        'Projects': 'project_name',
-        'Cultures': 'id',
-    }
-
-    object_str_method = object_str_methods.get(model_name)
-
-    if object_str_method:
-        objects_model = model_class.objects.all().values_list('id', object_str_method)
-
+    error_message = None
     if request.method == POST:
         object_id = request.POST.get('object_id')
-        if object_id:
-            get_id = model_class.objects.get(pk=object_id)
-            getattr(get_id, object_str_method)
+        try:
+            uuid.UUID(object_id)
+        except (TypeError, ValueError):
+            error_message = 'Выберите объект.'
+        else:
             return redirect('edit_model', model_name=model_name, object_id=object_id)
 
+    page = lookup(model_name)
     return render(
         request,
         'choose_object.html',
         {
             'model_name': model_name,
-            'objects': objects_model,
+            'objects': page['results'],
+            'next': page['next'],
+            'error_message': error_message,
         },
     )
 
 
+def autocomplete(request, model_name):
+    """
+    Return one page of objects of a model matching the typed text as JSON.
+
+    Args:
+        request (HttpRequest): The request, with the text in ``q`` and the cursor in ``after``.
+        model_name (str): The name of the model.
+
+    Returns:
+        JsonResponse: The objects and the ``next`` value, see ``autocomplete.lookup``.
+
+    Raises:
+        Http404: If the model is unknown.
+    """
+    if not request.user.is_authenticated:
+        return JsonResponse({'detail': 'Authentication required.'}, status=FORBIDDEN)
+    if model_name not in AUTOCOMPLETE_MODELS:
+        raise Http404(model_name)
+    return JsonResponse(lookup(
+        model_name,
+        query=request.GET.get(QUERY, '').strip(),
+        after=request.GET.get(AFTER),
+    ))
+
+
+def db_status(request):
+    """
+    Return connection reuse settings, pool counters and cache counters as JSON.
+
+    Args:
+        request (HttpRequest): The HTTP request object.
+
+    Returns:
+        JsonResponse: Stats of every database alias and of the token cache;
+        403 for users who are not staff.
+    """
+    if not request.user.is_staff:
+        return JsonResponse({'detail': 'Staff only.'}, status=FORBIDDEN)
+    return JsonResponse({
+        'databases': {alias: connection_stats(connections[alias]) for alias in connections},
+        'token_cache': token_cache.stats(),
+    })
+
+
 def edit_model(request, model_name, object_id):
     """
     Edit a model instance.
@@ -0,0 +1,78 @@
+"""REST API viewsets of the biobaseapp models."""
+from rest_framework import viewsets
+from rest_framework.permissions import BasePermission
+
+from .authentication import CachedTokenAuthentication
+from .mixins import APIActionsMixin, APIReadMixin
+from .models import (CultivationPlanning, Cultures, Experiments, Projects,
+                     StrainProcessing, SubstanceIdentification)
+from .pagination import IdCursorPagination
+from .serializers import (CultivationPlanningSerializer, CulturesSerializer,
+                          ExperimentsSerializer, ProjectsSerializer,
+                          StrainProcessingSerializer,
+                          SubstanceIdentificationSerializer)
+
+safe_methods = 'GET', 'HEAD', 'OPTIONS'
+unsafe_methods = 'POST', 'DELETE', 'PUT'
+
+
+class MyPermission(BasePermission):
+    """
+    Custom permission class for checking user permissions.
+
+    Allows only authenticated users to perform safe methods (GET, HEAD, OPTIONS).
+    Allows only superusers to perform unsafe methods (POST, DELETE, PUT).
+    """
+
+    def has_permission(self, request, _):
+        """
+        Check if user has permission to perform the request.
+
+        Args:
+            request: request object
+
+        Returns:
+            bool: True if user is authenticated, False otherwise
+
+        """
+        if request.method in safe_methods:
+            return bool(request.user and request.user.is_authenticated)
+        elif request.method in unsafe_methods:
+            return bool(request.user and request.user.is_superuser)
+        return False
+
+
+def create_viewset(model_class, serializer, select_related=(), prefetch_related=()):
+    """
+    Create a viewset for a given model class and serializer.
+
+    Args:
+        model_class (type): The model class to create the viewset for.
+        serializer (type): The serializer class to use for the viewset.
+        select_related (tuple): Foreign keys the serializer renders as objects.
+        prefetch_related (tuple): Reverse or many-to-many relations the serializer renders.
+
+    Returns:
+        type: The created viewset class.
+
+    """
+    class ViewSet(APIReadMixin, APIActionsMixin, viewsets.ModelViewSet):
+        queryset = model_class.objects.all()
+        serializer_class = serializer
+        permission_classes = [MyPermission]
+        authentication_classes = [CachedTokenAuthentication]
+        pagination_class = IdCursorPagination
+        list_select_related = select_related
+        list_prefetch_related = prefetch_related
+
+    return ViewSet
+
+
+StrainProcessingViewSet = create_viewset(StrainProcessing, StrainProcessingSerializer)
+SubstanceViewSet = create_viewset(
+    SubstanceIdentification, SubstanceIdentificationSerializer,
+)
+ExperimentsViewSet = create_viewset(Experiments, ExperimentsSerializer)
+CultivationViewSet = create_viewset(CultivationPlanning, CultivationPlanningSerializer)
+ProjectsViewSet = create_viewset(Projects, ProjectsSerializer)
+CulturesViewSet = create_viewset(Cultures, CulturesSerializer)
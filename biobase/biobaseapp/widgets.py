@@ -0,0 +1,80 @@
+"""Custom form widgets for the biobaseapp app."""
+from django import forms
+from django.core.exceptions import ValidationError
+from django.urls import reverse
+
+from .autocomplete import AUTOCOMPLETE_MODELS, ID
+
+BLANK_LABEL = '---------'
+CSS_CLASS = 'remote-select'
+
+
+class RemoteSelect(forms.Select):
+    """
+    Select whose options are loaded from the autocomplete endpoint.
+
+    Only the blank option and the selected object are rendered, so the page
+    does not grow with the related table; ``autocomplete.js`` adds a search
+    box and fetches the other options on demand.
+
+    Attributes:
+        model_name (str): A key of ``AUTOCOMPLETE_MODELS``.
+    """
+
+    class Media:
+        js = ('autocomplete.js',)
+
+    def __init__(self, model_name, attrs=None):
+        """
+        Initialize the widget.
+
+        Args:
+            model_name (str): A key of ``AUTOCOMPLETE_MODELS``.
+            attrs (dict): HTML attributes of the select element.
+        """
+        super().__init__(attrs)
+        self.model_name = model_name
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        """
+        Add the endpoint URL and the class looked up by the script.
+
+        Args:
+            base_attrs (dict): Attributes of the widget.
+            extra_attrs (dict): Attributes given at render time.
+
+        Returns:
+            dict: The attributes.
+        """
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs['class'] = f'{attrs.get("class", "")} {CSS_CLASS}'.strip()
+        attrs['data-url'] = reverse('autocomplete', kwargs={'model_name': self.model_name})
+        return attrs
+
+    def optgroups(self, name, value, attrs=None):
+        """
+        Build the blank option and the options of the selected objects.
+
+        Args:
+            name (str): The field name.
+            value (list): The selected values.
+            attrs (dict): HTML attributes of the options.
+
+        Returns:
+            list: Option groups in the format of ``forms.Select``.
+        """
+        selected = [str(item) for item in value if item not in (None, '')]
+        choices = [('', BLANK_LABEL)]
+        if selected:
+            model_class, label_field = AUTOCOMPLETE_MODELS[self.model_name]
+            try:
+                keys = [model_class._meta.pk.to_python(item) for item in selected]
+            except ValidationError:
+                keys = []
+            choices += model_class.objects.filter(pk__in=keys).values_list(ID, label_field)
+        return [
+            (None, [self.create_option(
+                name, pk, label, str(pk) in selected or (not pk and not selected), index,
+            )], index)
+            for index, (pk, label) in enumerate(choices)
+        ]
@@ -0,0 +1,117 @@
+/*
+ * Search-as-you-type pickers backed by the autocomplete endpoint.
+ *
+ * The select element carries the endpoint in data-url and, if the server
+ * rendered the first page, the id after which the next page starts in
+ * data-next; otherwise the first page is loaded when the select gets focus.
+ * Typing replaces the options; the "more" button and scrolling to the
+ * bottom of the list append the next page. Selects rendered by the
+ * RemoteSelect form widget get a search box and a "more" button on load.
+ */
+(function () {
+    'use strict';
+
+    var DELAY = 250;
+
+    function debounce(callback, wait) {
+        var timer = null;
+        return function () {
+            clearTimeout(timer);
+            timer = setTimeout(callback, wait);
+        };
+    }
+
+    function biobaseAutocomplete(input, select, more) {
+        var url = select.dataset.url;
+        var next = select.dataset.next || null;
+        var query = '';
+        var request = 0;
+        var loading = false;
+
+        function update() {
+            if (more) {
+                more.hidden = !next;
+            }
+        }
+
+        function load(append) {
+            var params = new URLSearchParams({q: query});
+            var current = ++request;
+            if (append) {
+                params.set('after', next);
+            }
+            loading = true;
+            fetch(url + '?' + params.toString(), {
+                credentials: 'same-origin',
+                headers: {Accept: 'application/json'}
+            }).then(function (response) {
+                return response.json();
+            }).then(function (page) {
+                if (current !== request) {
+                    return;
+                }
+                if (!append) {
+                    Array.from(select.options).forEach(function (option) {
+                        if (option.value && !option.selected) {
+                            option.remove();
+                        }
+                    });
+                }
+                page.results.forEach(function (item) {
+                    if (!select.querySelector('option[value="' + item.id + '"]')) {
+                        select.add(new Option(item.text, item.id));
+                    }
+                });
+                next = page.next;
+                update();
+            }).finally(function () {
+                if (current === request) {
+                    loading = false;
+                }
+            });
+        }
+
+        input.addEventListener('input', debounce(function () {
+            query = input.value.trim();
+            load(false);
+        }, DELAY));
+        select.addEventListener('scroll', function () {
+            var bottom = select.scrollTop + select.clientHeight >= select.scrollHeight - 10;
+            if (bottom && next && !loading) {
+                load(true);
+            }
+        });
+        if (!('next' in select.dataset)) {
+            select.addEventListener('focus', function () {
+                load(false);
+            }, {once: true});
+        }
+        if (more) {
+            more.addEventListener('click', function (event) {
+                event.preventDefault();
+                if (next && !loading) {
+                    load(true);
+                }
+            });
+        }
+        update();
+    }
+
+    function enhanceRemoteSelects() {
+        document.querySelectorAll('select.remote-select').forEach(function (select) {
+            var input = document.createElement('input');
+            var more = document.createElement('button');
+            input.type = 'search';
+            input.placeholder = 'Поиск';
+            input.autocomplete = 'off';
+            more.type = 'button';
+            more.textContent = 'Показать ещё';
+            select.before(input);
+            select.after(more);
+            biobaseAutocomplete(input, select, more);
+        });
+    }
+
+    window.biobaseAutocomplete = biobaseAutocomplete;
+    document.addEventListener('DOMContentLoaded', enhanceRemoteSelects);
+}());